@@ -0,0 +1,276 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Writers streaming the generated package into a zip archive or a wheel."""
+
+import base64
+import hashlib
+import os
+from pathlib import Path
+import time
+from typing import Union
+import zipfile
+
+from pyconverter.xml2py import __version__
+from pyconverter.xml2py.writer import MemoryWriter
+import regex as re
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10
+    import tomli as tomllib
+
+
+def _get_date_time() -> tuple:
+    # Honor ``SOURCE_DATE_EPOCH`` for reproducible archives
+    epoch = max(int(os.environ.get("SOURCE_DATE_EPOCH", 315532800)), 315532800)
+    return time.gmtime(epoch)[:6]
+
+
+class ArchiveWriter(MemoryWriter):
+    """
+    Provides a writer that streams the package files into a zip archive.
+
+    Files are kept in memory, or as a reference to the file to copy, and the
+    archive is written once by :meth:`close`. No intermediate directory is created.
+
+    Parameters
+    ----------
+    archive_path: Path
+        Path object of the archive to create.
+    root: Path
+        Path object of the directory the archive content is relative to.
+        Files written outside of this directory are ignored.
+    prefix: str, optional
+        Prefix of the names of the files in the archive. The default value is ``""``.
+    """
+
+    def __init__(self, archive_path: Path, root: Path, prefix: str = ""):
+        super().__init__()
+        self.archive_path = Path(archive_path)
+        self.root = Path(os.path.abspath(root))
+        self.prefix = prefix
+
+    def _store(self, path: Path, content: Union[bytes, Path]) -> bool:
+        path = Path(os.path.abspath(path))
+        if self.root not in path.parents:
+            self.paths.add(path)
+            return False
+        return super()._store(path, content)
+
+    def _get_entries(self) -> list:
+        """Return the sorted names and paths of the files in the archive."""
+        entries = [
+            (self.prefix + path.relative_to(self.root).as_posix(), path) for path in self.files
+        ]
+        return sorted(entries)
+
+    def _write_entry(self, archive: zipfile.ZipFile, arcname: str, content: bytes) -> None:
+        info = zipfile.ZipInfo(arcname, date_time=_get_date_time())
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        archive.writestr(info, content)
+
+    def _write_entries(self, archive: zipfile.ZipFile) -> None:
+        for arcname, path in self._get_entries():
+            self._write_entry(archive, arcname, self.read_bytes(path))
+
+    def close(self) -> Path:
+        """
+        Write the archive.
+
+        Returns
+        -------
+        Path
+            Path object of the archive.
+        """
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.archive_path.with_name(f".{self.archive_path.name}.{os.getpid()}.tmp")
+        try:
+            with zipfile.ZipFile(tmp_path, "w") as archive:
+                self._write_entries(archive)
+            os.replace(tmp_path, self.archive_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return self.archive_path
+
+
+def read_project_metadata(pyproject_path: Path) -> dict:
+    """
+    Read the ``[project]`` table of a ``pyproject.toml`` file.
+
+    Parameters
+    ----------
+    pyproject_path: Path
+        Path object of the ``pyproject.toml`` file.
+
+    Returns
+    -------
+    dict
+        Project metadata.
+    """
+    with open(pyproject_path, "rb") as file:
+        project = tomllib.load(file).get("project", {})
+    for key in ("name", "version"):
+        if key not in project:
+            raise ValueError(f"The '{key}' of the project must be defined in {pyproject_path}.")
+    return project
+
+
+def _format_contacts(contacts: list) -> tuple:
+    names, emails = [], []
+    for contact in contacts:
+        if "email" in contact:
+            if "name" in contact:
+                emails.append(f"{contact['name']} <{contact['email']}>")
+            else:
+                emails.append(contact["email"])
+        elif "name" in contact:
+            names.append(contact["name"])
+    return ", ".join(names), ", ".join(emails)
+
+
+def get_core_metadata(project: dict, readme: Union[str, None] = None) -> str:
+    """
+    Get the core metadata of a distribution from its project metadata.
+
+    Parameters
+    ----------
+    project: dict
+        Content of the ``[project]`` table of a ``pyproject.toml`` file.
+    readme: str, optional
+        Content of the readme file, used as the long description. The default value is ``None``.
+
+    Returns
+    -------
+    str
+        Content of the ``METADATA`` file.
+    """
+    lines = [
+        "Metadata-Version: 2.4",
+        f"Name: {project['name']}",
+        f"Version: {project['version']}",
+    ]
+    if "description" in project:
+        lines.append(f"Summary: {project['description']}")
+    for key, field in (("authors", "Author"), ("maintainers", "Maintainer")):
+        names, emails = _format_contacts(project.get(key, []))
+        if names:
+            lines.append(f"{field}: {names}")
+        if emails:
+            lines.append(f"{field}-email: {emails}")
+    license = project.get("license")
+    if isinstance(license, str):
+        lines.append(f"License-Expression: {license}")
+    elif isinstance(license, dict) and "text" in license:
+        lines.append(f"License: {license['text']}")
+    for license_file in project.get("license-files", []):
+        lines.append(f"License-File: {license_file}")
+    lines.extend(f"Classifier: {classifier}" for classifier in project.get("classifiers", []))
+    if "requires-python" in project:
+        lines.append(f"Requires-Python: {project['requires-python']}")
+    lines.extend(f"Requires-Dist: {requirement}" for requirement in project.get("dependencies", []))
+    for extra, requirements in project.get("optional-dependencies", {}).items():
+        lines.append(f"Provides-Extra: {extra}")
+        for requirement in requirements:
+            marker = f'extra == "{extra}"'
+            if ";" in requirement:
+                requirement, requirement_marker = requirement.split(";", 1)
+                marker = f"({requirement_marker.strip()}) and {marker}"
+            lines.append(f"Requires-Dist: {requirement.strip()} ; {marker}")
+    lines.extend(f"Project-URL: {name}, {url}" for name, url in project.get("urls", {}).items())
+
+    metadata = "\n".join(lines) + "\n"
+    if readme is not None:
+        readme_file = project.get("readme", "")
+        content_type = "text/x-rst" if str(readme_file).endswith(".rst") else "text/markdown"
+        metadata += f"Description-Content-Type: {content_type}\n\n{readme}"
+    return metadata
+
+
+def _record_hash(content: bytes) -> str:
+    digest = base64.urlsafe_b64encode(hashlib.sha256(content).digest()).rstrip(b"=")
+    return f"sha256={digest.decode('ascii')}"
+
+
+class WheelWriter(ArchiveWriter):
+    """
+    Provides a writer that streams the package source files into a wheel.
+
+    Only the files written in the ``src`` directory of the package are added to the
+    wheel. The metadata is read from the ``pyproject.toml`` file of the template.
+
+    Parameters
+    ----------
+    target_path: Path
+        Path object of the directory where the wheel is created.
+    package_path: Path
+        Path object of the generated package directory.
+    template_path: Path
+        Path object of the template directory.
+    """
+
+    def __init__(self, target_path: Path, package_path: Path, template_path: Path):
+        self.template_path = Path(template_path)
+        self.project = read_project_metadata(self.template_path / "pyproject.toml")
+        distribution = re.sub(r"[-_.]+", "_", self.project["name"]).lower()
+        self.dist_info = f"{distribution}-{self.project['version']}.dist-info"
+        wheel_name = f"{distribution}-{self.project['version']}-py3-none-any.whl"
+        super().__init__(Path(target_path) / wheel_name, Path(package_path) / "src")
+
+    def _write_entries(self, archive: zipfile.ZipFile) -> None:
+        records = []
+        for arcname, path in self._get_entries():
+            content = self.read_bytes(path)
+            self._write_entry(archive, arcname, content)
+            records.append((arcname, content))
+
+        readme = None
+        if "readme" in self.project and isinstance(self.project["readme"], str):
+            readme_path = self.template_path / self.project["readme"]
+            if readme_path.is_file():
+                readme = readme_path.read_text(encoding="utf-8")
+        metadata_files = {
+            "METADATA": get_core_metadata(self.project, readme).encode("utf-8"),
+            "WHEEL": (
+                "Wheel-Version: 1.0\n"
+                f"Generator: pyconverter-xml2py {__version__}\n"
+                "Root-Is-Purelib: true\n"
+                "Tag: py3-none-any\n"
+            ).encode("utf-8"),
+        }
+        for license_file in self.project.get("license-files", []):
+            license_path = self.template_path / license_file
+            if license_path.is_file():
+                metadata_files[f"licenses/{license_file}"] = license_path.read_bytes()
+
+        for name, content in metadata_files.items():
+            arcname = f"{self.dist_info}/{name}"
+            self._write_entry(archive, arcname, content)
+            records.append((arcname, content))
+
+        record = "".join(
+            f"{arcname},{_record_hash(content)},{len(content)}\n" for arcname, content in records
+        )
+        record += f"{self.dist_info}/RECORD,,\n"
+        self._write_entry(archive, f"{self.dist_info}/RECORD", record.encode("utf-8"))
@@ -29,17 +29,18 @@ from inflect import engine
 from lxml.etree import tostring
 from lxml.html import fromstring
 from pyconverter.xml2py.custom_functions import CustomFunctions
+from pyconverter.xml2py.equation_cache import (
+    EquationCache,
+    latex_to_text,
+    mathml_to_latex,
+    normalize_mathml,
+)
 import pyconverter.xml2py.utils.regex_pattern as regp
 from pyconverter.xml2py.utils.utils import is_numeric, split_trail_alpha
 import regex as re
 
 CONV_EQN = False
-
-if CONV_EQN:
-    from py_asciimath.translator.translator import MathML2Tex
-    from pylatexenc.latex2text import LatexNodes2Text
-else:
-    pass
+EQUATION_CACHE = None
 
 logger = logging.getLogger("py_asciimath.utils")
 logger.setLevel(logging.INFO)
@@ -115,6 +116,10 @@ FORBIDDEN_ARGUMENT_NAMES = [
 # Map XML command to pycommand function
 NAME_MAP_GLOB = {}
 
+# Commands whose arguments need a special treatment, with the following format:
+# ``{py_name: (group, initial_args, py_arg_names)}``
+SPECIAL_ARGUMENTS = {}
+
 NO_RESIZE_LIST = [
     "Variablelist",
     "ItemizedList",
@@ -139,6 +144,23 @@ class NameMap:
         NAME_MAP_GLOB = name_map
 
 
+def set_equation_conversion(enabled: bool, equation_cache: EquationCache | None = None):
+    """
+    Enable or disable the conversion of the MathML equations into LaTeX.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether to convert the equations.
+    equation_cache : EquationCache, optional
+        Cache used to look up the converted equations. If ``None``, each
+        equation is converted when its element is parsed.
+    """
+    global CONV_EQN, EQUATION_CACHE
+    CONV_EQN = enabled
+    EQUATION_CACHE = equation_cache
+
+
 def to_py_name(name, name_map=None):
     """
     Return a Python-compatible name for a command using the global name map.
@@ -528,28 +550,117 @@ def replace_terms(text, terms):
 # Element class
 # ############################################################################
 
+# Map the element class names to the element classes
+ELEMENT_TYPES = {}
+
+# Attributes of the lxml elements that are kept once an element is detached
+DETACHED_ATTRIBUTES = (
+    "id",
+    "filename",
+    "revisionflag",
+    "entityref",
+    "fileref",
+    "href",
+    "linkend",
+    "targetptr",
+    "targetdoc",
+    "role",
+    "cols",
+    "morerows",
+    "helpstring",
+)
+
+
+def get_element_type(_type):
+    """
+    Return the element class matching a class or a class name.
+
+    Parameters
+    ----------
+    _type : type or str
+        Element class or name of the element class.
+
+    Returns
+    -------
+    type or None
+        Element class. ``None`` is returned if the name does not match any element class.
+    """
+    if isinstance(_type, str):
+        if _type == "str":
+            return str
+        return ELEMENT_TYPES.get(_type)
+    return _type
+
 
 class Element:
     """Provides the base element."""
 
+    __slots__ = (
+        "_element",
+        "_children",
+        "_id",
+        "_tag",
+        "_attributes",
+        "_type_index",
+        "_subtree_types",
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        ELEMENT_TYPES[cls.__name__] = cls
+
     def __init__(self, element, parse_children=True):
         self._element = element
-        self._content = []
+        self._tag = element.tag
+        self._attributes = None
+        # Lazily built lookup tables, see ``type_index`` and ``subtree_types``.
+        self._type_index = None
+        self._subtree_types = None
         self._id = self._element.get("id")
         if self._id:
             self._id = self._id.replace(".", "_")
 
+        if parse_children:
+            # The children are wrapped on first access, see ``_content``.
+            self._children = None
+        else:
+            self._children = self._parse_content(parse_children=False)
+
+    def _parse_content(self, parse_children=True):
+        """Return the text, the wrapped children, and the tail of the lxml element."""
+        element = self._element
+        content = []
         if element.text is not None:
-            content = " ".join(element.text.split())
-            if content:
-                self._content.append(content)
+            text = " ".join(element.text.split())
+            if text:
+                content.append(text)
         if parse_children:
             for child in element.getchildren():
-                self._content.append(parse_element(child))
+                content.append(parse_element(child))
         if element.tail is not None:
             text = " ".join(element.tail.split())
             if text:
-                self._content.append(text)
+                content.append(text)
+        return content
+
+    @property
+    def _content(self):
+        """Content of the element, materialized on first access."""
+        if self._children is None:
+            self._children = self._parse_content()
+        return self._children
+
+    @_content.setter
+    def _content(self, content):
+        self._children = content
+        # The lookup tables are rebuilt from the new content
+        self._type_index = None
+        self._subtree_types = None
+
+    @property
+    def is_materialized(self):
+        """Whether the children of the element have been wrapped."""
+        return self._children is not None
 
     @property
     def text_content(self):
@@ -572,8 +683,39 @@ class Element:
 
     def get(self, entry):
         """Get an item from an element."""
+        if self._element is None:
+            return self._attributes.get(entry)
         return self._element.get(entry)
 
+    @property
+    def is_detached(self):
+        """Whether the element has released its lxml element."""
+        return self._element is None
+
+    def detach(self):
+        """
+        Release the lxml element of the element and of its whole subtree.
+
+        The attributes listed in ``DETACHED_ATTRIBUTES`` are copied before the
+        lxml element is released so that they remain available through ``get``.
+        Properties navigating the lxml tree, such as ``text_content``, ``raw``,
+        or ``next_elem``, are no longer available once the element is detached.
+        Children that have not been materialized yet are discarded.
+        """
+        if self._children is None:
+            self._children = []
+        if self._element is not None:
+            attributes = {}
+            for name in DETACHED_ATTRIBUTES:
+                value = self._element.get(name)
+                if value is not None:
+                    attributes[name] = value
+            self._attributes = attributes
+            self._element = None
+        for child in self._content:
+            if isinstance(child, Element):
+                child.detach()
+
     @property
     def added(self):
         """Has the revision flag ``added``."""
@@ -613,13 +755,41 @@ class Element:
         """Types of the children."""
         return [type(child).__name__ for child in self.children]
 
-    def get_children_by_type(self, type_name):
+    @property
+    def type_index(self):
+        """Dictionary mapping each child type to the list of children of that type."""
+        if self._type_index is None:
+            type_index = {}
+            for child in self._content:
+                type_index.setdefault(type(child), []).append(child)
+            self._type_index = type_index
+        return self._type_index
+
+    @property
+    def subtree_types(self):
+        """
+        Set of the types contained in the element's subtree, excluding the element itself.
+
+        If the children have not been materialized yet, the set is read from the lxml
+        tree and may contain types, such as ``str``, that are not in the subtree.
+        """
+        if self._subtree_types is None:
+            if self._children is None:
+                # Read the types from the lxml tree to avoid materializing the subtree
+                subtree_types = {str}
+                for descendant in self._element.iterdescendants():
+                    subtree_types.add(parsers.get(descendant.tag, Element))
+            else:
+                subtree_types = set(self.type_index)
+                for child in self._children:
+                    if isinstance(child, Element):
+                        subtree_types |= child.subtree_types
+            self._subtree_types = frozenset(subtree_types)
+        return self._subtree_types
+
+    def get_children_by_type(self, _type):
         """Get children of a specific type."""
-        specific_children = []
-        for child in self.children:
-            if type(child).__name__ == type_name:
-                specific_children.append(child)
-        return specific_children
+        return list(self.type_index.get(get_element_type(_type), []))
 
     def get_titles_in_element_list(list_element):
         """Get the titles of the elements in a list of elements."""
@@ -628,7 +798,7 @@ class Element:
     @property
     def title(self):
         """Element title."""
-        return self.find("Title")
+        return self.find(Title)
 
     @property
     def content(self):
@@ -683,10 +853,13 @@ class Element:
         return " ".join(items)
 
     def rec_find(self, _type, terms=None):
-        """Find the first type matching a given type string recursively."""
+        """Find the first element matching a given type recursively."""
+        _type = get_element_type(_type)
+        if _type not in self.subtree_types:
+            return None
         for item in self:
-            if type(item).__name__ == _type:
-                if _type == "Refname" or _type == "Refnamediv":
+            if type(item) is _type:
+                if _type is Refname or _type is Refnamediv:
                     item.terms = terms
                 return item
             if isinstance(item, Element):
@@ -696,28 +869,38 @@ class Element:
         return None
 
     def find(self, _type, terms=None):
-        """Find the first type matching a given type string."""
-        for item in self:
-            if type(item).__name__ == _type:
-                if _type == "Refname":
-                    if terms == None:
-                        logging.error("ERROR: terms are not defined for a 'Refname' class.")
-                    item.terms = terms
-                return item
-        return None
+        """Find the first child matching a given type."""
+        _type = get_element_type(_type)
+        items = self.type_index.get(_type)
+        if not items:
+            return None
+        item = items[0]
+        if _type is Refname:
+            if terms == None:
+                logging.error("ERROR: terms are not defined for a 'Refname' class.")
+            item.terms = terms
+        return item
 
     def find_all(self, _type, recursive=False, terms=None):
-        """Find all types matching a given type string."""
-        items = []
-        for item in self:
-            if type(item).__name__ == _type:
-                if _type == "Refname":
-                    if not terms:
-                        logging.error("ERROR: terms are not defined for a 'Refname' class.")
-                    item.terms = terms
-                items.append(item)
-            elif recursive and isinstance(item, Element):
-                items.extend(item.find_all(_type))
+        """Find all children matching a given type."""
+        _type = get_element_type(_type)
+        if not recursive:
+            items = list(self.type_index.get(_type, []))
+        elif _type not in self.subtree_types:
+            return []
+        else:
+            items = []
+            for item in self:
+                if type(item) is _type:
+                    items.append(item)
+                elif isinstance(item, Element):
+                    items.extend(item.find_all(_type))
+
+        if _type is Refname:
+            if not terms:
+                logging.error("ERROR: terms are not defined for a 'Refname' class.")
+            for item in items:
+                item.terms = terms
 
         return items
 
@@ -736,12 +919,17 @@ class Element:
     @property
     def tag(self):
         """Element tag."""
-        return self._element.tag
+        return self._tag
+
+
+ELEMENT_TYPES[Element.__name__] = Element
 
 
 class ItemizedList(Element):
     """Provides the itemized list element."""
 
+    __slots__ = ()
+
     def __repr__(self):
         return "\n".join([f"* {str(item).strip()}" for item in self])
 
@@ -817,6 +1005,8 @@ class ItemizedList(Element):
 class SimpleList(ItemizedList):
     """Provides the simple itemized list element."""
 
+    __slots__ = ()
+
     def __repr__(self):
         return "\n".join([f"* {str(item).strip()}" for item in self])
 
@@ -824,6 +1014,8 @@ class SimpleList(ItemizedList):
 class Member(Element):
     """Provides the member element for a simple itemized list."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100, links=None, base_url=None, fcache=None):
         rst_members = []
         for item in self:
@@ -882,6 +1074,8 @@ def ponctuation_whitespace(text, ponctuation):
 class OrderedList(Element):
     """Provides the ordered list element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100, links=None, base_url=None):
         """Return a string to enable converting the element to an RST format."""
         ordered_list = []
@@ -902,6 +1096,8 @@ class OrderedList(Element):
 class ListItem(Element):
     """Provides the list item element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100, links=None, base_url=None, fcache=None):
         """Return a string to enable converting the element to an RST format."""
         items = []
@@ -937,6 +1133,8 @@ class ListItem(Element):
 class FileName(Element):
     """Provides the filename element."""
 
+    __slots__ = ("_tail", "_filename")
+
     def __init__(self, element, parse_children=True):
         super().__init__(element, parse_children)
         self._tail = self.children[-1] if len(self) > 1 else None
@@ -965,6 +1163,8 @@ class FileName(Element):
 class OLink(Element):
     """Provides the external link element."""
 
+    __slots__ = ()
+
     def __init__(self, element):
         super().__init__(element)
 
@@ -1012,6 +1212,8 @@ class OLink(Element):
 class Paragraph(Element):
     """Provides the paragraph element."""
 
+    __slots__ = ()
+
     def __repr__(self):
         lines = [""]
         lines.append(" ".join([str(item) for item in self._content]))
@@ -1116,6 +1318,8 @@ class Paragraph(Element):
 class Phrase(Paragraph):
     """Provides the phrase element."""
 
+    __slots__ = ()
+
     def __repr__(self):
         return " ".join([str(item) for item in self._content])
 
@@ -1129,6 +1333,8 @@ class Phrase(Paragraph):
 class Structname(Element):
     """Provides the structure name element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100, links=None, base_url=None, fcache=None):
         """Return a string to enable converting the element to an RST format."""
         rst_replaceable = f"``{self.content[0]}`` {self.tail}"
@@ -1138,6 +1344,8 @@ class Structname(Element):
 class Title(Element):
     """Provides the title element."""
 
+    __slots__ = ()
+
     def __repr__(self):
         return " ".join([str(item) for item in self._content]) + "\n"
 
@@ -1145,10 +1353,12 @@ class Title(Element):
 class Emphasis(Element):
     """Provides the emphasis element."""
 
+    __slots__ = ()
+
     @property
     def role(self):
         """Return the role parameter value contained in the Emphasis element."""
-        return self._element.get("role")
+        return self.get("role")
 
     def to_rst(self, indent="", max_length=100, links=None, base_url=None):
         """Return a string to enable converting the element to an RST format."""
@@ -1186,6 +1396,8 @@ class Emphasis(Element):
 class Example(Element):
     """Provides the example element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100):
         rst_example = []
         for item in self:
@@ -1207,6 +1419,8 @@ class Example(Element):
 class InformalExample(Element):
     """Provides the informal example element."""
 
+    __slots__ = ()
+
     def __repr__(self):
         lines = ["\n"]
         if self.title:
@@ -1220,12 +1434,14 @@ class InformalExample(Element):
 class GuiMenu(Element):
     """Provides the GUI menu element."""
 
-    pass
+    __slots__ = ()
 
 
 class Replaceable(Element):
     """Provides the replaceable element."""
 
+    __slots__ = ()
+
     @property
     def is_equals(self):
         """Replaceable equals something."""
@@ -1278,6 +1494,8 @@ class Replaceable(Element):
 class ProgramListing(Element):
     """Provides the program listing element."""
 
+    __slots__ = ()
+
     @property
     def source(self):
         """Return the source value."""
@@ -1322,6 +1540,8 @@ def resize_element_list(text, max_length=100, initial_indent="", subsequent_inde
 class Variablelist(Element):
     """Provides the variable list."""
 
+    __slots__ = ()
+
     def __init__(self, element):
         super().__init__(element)
 
@@ -1392,6 +1612,8 @@ class Variablelist(Element):
 class RefSection(Element):
     """Provides the reference section element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100, links=None, base_url=None, fcache=None):
         """Return a string to enable converting the element to an RST format."""
         items = []
@@ -1423,6 +1645,8 @@ class RefSection(Element):
 class VarlistEntry(Element):
     """Provides the variable list entry element."""
 
+    __slots__ = ()
+
     @property
     def parm_types(self):
         """One or more parameter types.
@@ -1433,7 +1657,7 @@ class VarlistEntry(Element):
         This is either a string, float, or integer (or some combination thereof).
 
         """
-        varlist = self.rec_find("Variablelist")
+        varlist = self.rec_find(Variablelist)
 
         parm_types = [str]
         if varlist is not None:
@@ -1572,6 +1796,8 @@ class VarlistEntry(Element):
 class Term(Element):
     """Provides the term element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100, links=None, base_url=None, fcache=None):
         """Return a string to enable converting the element to an RST format."""
 
@@ -1605,12 +1831,14 @@ class Term(Element):
 class GuiLabel(Element):
     """Provides the GUI label element."""
 
-    pass
+    __slots__ = ()
 
 
 class GuiMenuItem(Element):
     """Provides the GUI menu item element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100):
         """Return a string to enable converting the element to an RST format."""
         gui_rst = f"``{self[0]}`` {self.tail}"
@@ -1620,6 +1848,8 @@ class GuiMenuItem(Element):
 class SuperScript(Element):
     """Provides the superscript element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100):
         """Return a string to enable converting the element to an RST format."""
         return f":sup:`{self.content[0]}` {self.tail}"
@@ -1628,44 +1858,46 @@ class SuperScript(Element):
 class Code(Element):
     """Provides the code element."""
 
-    pass
+    __slots__ = ()
 
 
 class _Math(Element):
+    __slots__ = ()
+
     def __init__(self, element):
-        self._element = element
+        super().__init__(element, parse_children=False)
         self._content = []
         self._parse_equation(element)
 
     def _parse_equation(self, eqn):
-        if eqn is not None:
-            raw = tostring(eqn).decode().replace("xmlns:m", "xmlns")
-            raw = raw.replace('display="block"', "")
-            raw = raw.replace("<mtext>&#8202;</mtext>\n", "")
-            raw = raw.replace("<mtext>&#8201;</mtext>\n", "")
-        try:
-            parsed = MathML2Tex().translate(raw, network=False, from_file=False)
-            parsed = parsed.replace("\\hspace", "").strip()
-            self._content = [parsed]
-        except NameError:
+        if not CONV_EQN or eqn is None:
             self._content = [""]
+            return
+        mathml = normalize_mathml(tostring(eqn, with_tail=False).decode())
+        if EQUATION_CACHE is not None:
+            self._content = [EQUATION_CACHE.get(mathml)]
+        else:
+            self._content = [mathml_to_latex(mathml)]
 
     def __repr__(self):
-        try:
-            return LatexNodes2Text().latex_to_text(self.equation)
-        except NameError:
+        if not CONV_EQN:
             return "<Equation>"
+        return latex_to_text(self.equation)
 
     @property
     def equation(self):
         """Return the equation related to the math element."""
-        # return self.content[0][1:-1]
-        return "equation not available"
+        equation = self._content[0].strip("$ ") if self._content else ""
+        if not equation:
+            return "equation not available"
+        return equation
 
 
 class Math(_Math):
     """Provides the math element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100):
         """Return a string to enable converting the element to an RST format."""
         lines = ["", "", f"{indent}.. math::\n"]
@@ -1677,8 +1909,10 @@ class Math(_Math):
 class InlineEquation(Math):
     """Provides the inline equation element."""
 
+    __slots__ = ()
+
     def __init__(self, element):
-        self._element = element
+        Element.__init__(self, element, parse_children=False)
         self._content = []
         self._parse_equation(element.find("math"))
 
@@ -1696,6 +1930,8 @@ class InlineEquation(Math):
 class SubScript(Element):
     """Provides the subscript element."""
 
+    __slots__ = ()
+
     def __init__(self, element):
         super().__init__(element)
 
@@ -1707,14 +1943,18 @@ class SubScript(Element):
 class InlineGraphic(Element):
     """Provides the inline graphic element."""
 
+    __slots__ = ()
+
     def fileref(self):
         """File reference."""
-        return self._element.get("fileref")
+        return self.get("fileref")
 
 
 class Quote(Element):
     """Provides the quote element."""
 
+    __slots__ = ()
+
     def __init__(self, element):
         super().__init__(element)
         # self._content[0] = f"{self._content[0]}"
@@ -1731,6 +1971,8 @@ class Quote(Element):
 class Link(Element):
     """Provides the link element."""
 
+    __slots__ = ("_linkend",)
+
     def __init__(self, element):
         super().__init__(element)
         self._linkend = element.get("linkend")
@@ -1769,6 +2011,8 @@ class Link(Element):
 class XRef(Link):
     """Provides the cross reference element."""
 
+    __slots__ = ()
+
     @property
     def tail(self):
         """Tail of the element as a string."""
@@ -1795,18 +2039,20 @@ class XRef(Link):
 class UserInput(ProgramListing):
     """Provides the user input element."""
 
-    pass
+    __slots__ = ()
 
 
 class Screen(Element):
     """Provides the screen element."""
 
-    pass
+    __slots__ = ()
 
 
 class Literal(Element):
     """Provides the literal output element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100):
         """Return a string to enable converting the element to an RST format."""
         return f"``{self.content[0]}`` {self.tail}"
@@ -1815,6 +2061,8 @@ class Literal(Element):
 class Caution(Element):
     """Provides the caution element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", links=None, base_url=None, max_length=100):
         """Return a string to enable converting the element to an RST format."""
         lines = ["", "", ".. warning::", ""]
@@ -1839,6 +2087,8 @@ class Caution(Element):
 class Graphic(Element):
     """Provides the graphic element."""
 
+    __slots__ = ()
+
     @property
     def entityref(self):
         """Value of the ``entityref`` parameter contained in the graphic element."""
@@ -1872,18 +2122,20 @@ class Graphic(Element):
 class Function(Element):
     """Provides the function element."""
 
-    pass
+    __slots__ = ()
 
 
 class Note(Element):
     """Provides the note element."""
 
-    pass
+    __slots__ = ()
 
 
 class BlockQuote(Element):
     """Provides the block quote element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100, links=None, base_url=None, fcache=None):
         """Return a string to enable converting the element to an RST format."""
         items = []
@@ -1925,10 +2177,12 @@ class BlockQuote(Element):
 class RefMeta(Element):
     """Provides the reference metadata element."""
 
+    __slots__ = ()
+
     @property
     def refentry_title(self):
         """Title of the referency entry."""
-        title = self.rec_find("Refentrytitle")
+        title = self.rec_find(Refentrytitle)
         if title is not None:
             title = str(title).strip()
         else:
@@ -1939,13 +2193,13 @@ class RefMeta(Element):
 class IndexTerm(Element):
     """Provides the index term element."""
 
-    pass
+    __slots__ = ()
 
 
 class Primary(Element):
     """Provides the primary element."""
 
-    pass
+    __slots__ = ()
 
 
 def parse_element(element):
@@ -1982,25 +2236,27 @@ def parse_children(element):
 class TGroup(Element):
     """Provides the tgroup element, which contains the header and body rows of a table."""
 
+    __slots__ = ()
+
     @property
     def n_col(self):
         """Number of columns."""
-        return self._element.get("cols")
+        return self.get("cols")
 
     @property
     def thead(self):
         """THead."""
-        return self.find("THead")
+        return self.find(THead)
 
     @property
     def tbody(self):
         """TBody."""
-        return self.find("TBody")
+        return self.find(TBody)
 
     @property
     def row_in_tbody(self):
         """List of the rows in the TBody."""
-        return self.find("TBody").find_all("Row")
+        return self.find(TBody).find_all(Row)
 
     def to_rst(self, indent="", links=None, base_url=None):
         """Return a string to enable converting the element to an RST format."""
@@ -2025,15 +2281,17 @@ class TGroup(Element):
 class Table(Element):
     """Provides the table element"""
 
+    __slots__ = ()
+
     @property
     def title(self):
         """Table title."""
-        return self.find("Title")
+        return self.find(Title)
 
     @property
     def tgroup(self):
         """TGroup."""
-        return self.find("TGroup")
+        return self.find(TGroup)
 
     def to_rst(self, indent="", max_length=100, links=None, base_url=None):
         """Return a string to enable converting the element to an RST format."""
@@ -2066,6 +2324,8 @@ class Table(Element):
 class Refentrytitle(Element):
     """Provides the title of the reference entry."""
 
+    __slots__ = ()
+
     def __repr__(self):
         items = []
         for item in self._content:
@@ -2080,6 +2340,8 @@ class Refnamediv(Element):
     """Provides the refnamediv element, which contains the name,
     purpose, and classification of a reference."""
 
+    __slots__ = ("_terms",)
+
     def __init__(self, element, terms=None):
         self._element = element
         self._terms = terms
@@ -2098,18 +2360,20 @@ class Refnamediv(Element):
     @property
     def refname(self):
         """Refname of the element."""
-        return self.find("Refname", self._terms)
+        return self.find(Refname, self._terms)
 
     @property
     def purpose(self):
         "Refpurpose of the element."
-        return self.find("Refpurpose")
+        return self.find(Refpurpose)
 
 
 class Refname(Element):
     """Provides the refname element which contains
     the name of a reference."""
 
+    __slots__ = ("_terms",)
+
     def __init__(self, element, terms=None):
         self._element = element
         self._terms = terms
@@ -2157,9 +2421,7 @@ class Refname(Element):
                 args.append("...")
 
             elif arg.isidentifier() is False:
-                raise ValueError(
-                    f"Invalid argument '{arg}' in refname element: {self._element.tag}"
-                )
+                raise ValueError(f"Invalid argument '{arg}' in refname element: {self.tag}")
 
             else:
                 args.append(arg)
@@ -2197,28 +2459,32 @@ class Refpurpose(Element):
     """Provides the refpurpose element, which contains
     a short synopsis of a reference."""
 
+    __slots__ = ()
+
     def __repr__(self):
         return " ".join([str(item) for item in self._content])
 
 
 class Refclass(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Application(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Refsect1(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Command(Element):
     """Provides the command element."""
 
+    __slots__ = ()
+
     @property
     def command(self):
         """Name of the command."""
@@ -2316,6 +2582,8 @@ class Command(Element):
 class ComputerOutput(Element):
     """Provides the computer output element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100):
         """Return a string to enable converting the element to an RST format."""
         return f"``{self[0]}`` {self[1]}"
@@ -2324,15 +2592,17 @@ class ComputerOutput(Element):
 class Figure(Element):
     """Provides the figure element."""
 
+    __slots__ = ()
+
     @property
     def title(self):
         """First title element found in the figure element."""
-        return self.rec_find("Title")
+        return self.rec_find(Title)
 
     @property
     def graphic(self):
         """First graphic element found in the figure element."""
-        return self.rec_find("Graphic")
+        return self.rec_find(Graphic)
 
     def to_rst(self, indent="", max_length=100, fcache=None):
         """Return a string to enable converting the element to an RST format."""
@@ -2359,138 +2629,145 @@ class Figure(Element):
 
 class Footnote(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Footnoteref(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Formalpara(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Glossterm(Element):
 
-    pass
+    __slots__ = ()
 
 
 class GuiButton(Element):
 
-    pass
+    __slots__ = ()
 
 
 class GuiIcon(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Highlights(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Important(Element):
 
-    pass
+    __slots__ = ()
 
 
 class InformalEquation(Math):
 
-    pass
+    __slots__ = ()
+
+    def __init__(self, element):
+        Element.__init__(self, element, parse_children=False)
+        self._content = []
+        self._parse_equation(element.find("math"))
 
 
 class Interface(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Markup(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Mediaobject(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Option(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Refsect3(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Refsynopsisdiv(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Sidebar(Element):
 
-    pass
+    __slots__ = ()
 
 
 class XMLType(Element):
 
-    pass
+    __slots__ = ()
 
 
 class XMLWarning(Caution):
     """XML Warning element are handled the same as Caution elements."""
 
-    pass
+    __slots__ = ()
 
 
 class ClassName(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Imageobject(Element):
 
-    pass
+    __slots__ = ()
 
 
 class InformalFigure(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Envar(Element):
 
-    pass
+    __slots__ = ()
 
 
 class ImageData(Element):
 
-    pass
+    __slots__ = ()
 
 
 class ColSpec(Element):
 
-    pass
+    __slots__ = ()
 
 
 class TBody(Element):
     """Provides the tbody element."""
 
+    __slots__ = ()
+
     @property
     def rows(self):
         """Return all the row elements found in the TBody element."""
-        return self.find_all("Row")
+        return self.find_all(Row)
 
     def to_rst(self, l_head, indent="", links=None, base_url=None):
         """Return a list to enable converting the element to an RST format."""
         rst_rows = []
         for i, row_i in enumerate(self.rows):
-            row = row_i.find_all("Entry")
+            row = row_i.find_all(Entry)
             if len(row[0]) > 0:
                 if type(row[0][0]) == Command:
                     command = f"   * - :ref:`{row[0][0].py_cmd}`"
@@ -2525,10 +2802,12 @@ class TBody(Element):
 class Entry(Element):
     """Provides the entry element."""
 
+    __slots__ = ()
+
     @property
     def morerows(self):
         """Value for the ``morerows`` parameter contained in the entry element."""
-        return self._element.get("morerows")
+        return self.get("morerows")
 
     def to_rst(self, indent="", max_length=100, links=None, base_url=None, fcache=None):
         """Return a string to enable converting the element to an RST format."""
@@ -2559,10 +2838,12 @@ class Entry(Element):
 class Row(Element):
     """Provides the row element."""
 
+    __slots__ = ()
+
     @property
     def entry(self):
         """Return all entry elements found in the row element."""
-        return self.find_all("Entry")
+        return self.find_all(Entry)
 
     def to_rst_list(self, indent="", max_length=100, links=None, base_url=None):
         """Return a list to enable converting the element to an RST format."""
@@ -2578,10 +2859,12 @@ class Row(Element):
 class THead(Element):
     """Provides the thead element."""
 
+    __slots__ = ()
+
     @property
     def rows(self):
         """Return all row elements found in the THead element."""
-        return self.find_all("Row")
+        return self.find_all(Row)
 
     def to_rst(self, indent="", links=None, base_url=None):
         """Return a list and the length of the list for converting the element
@@ -2622,36 +2905,38 @@ class THead(Element):
 
 class Remark(Element):
 
-    pass
+    __slots__ = ()
 
 
 class LiteralLayout(Element):
 
-    pass
+    __slots__ = ()
 
 
 class CiteTitle(Element):
 
-    pass
+    __slots__ = ()
 
 
 class ULink(Element):
 
-    pass
+    __slots__ = ()
 
 
 class SegTitle(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Chapter(Element):
     """Provides the chapter element."""
 
+    __slots__ = ()
+
     @property
     def helpstring(self):
         """Value for the ``helpstring`` parameter contained in the chapter element."""
-        return self[1]._element.get("helpstring")
+        return self[1].get("helpstring")
 
     def __repr__(self):
         items = [f"Chapter {self.helpstring}\n\n"]
@@ -2661,12 +2946,12 @@ class Chapter(Element):
 
 class Section1(Element):
 
-    pass
+    __slots__ = ()
 
 
 class ProductName(Element):
 
-    pass
+    __slots__ = ()
 
 
 class Argument:
@@ -2841,7 +3126,7 @@ class Argument:
         """
         parm_types = [str]
         if isinstance(self._description, Element):
-            varlist = self._description.rec_find("Variablelist")
+            varlist = self._description.rec_find(Variablelist)
 
             if varlist is not None:
                 terms = varlist.terms
@@ -3063,6 +3348,23 @@ class ArgumentList:
 class XMLCommand(Element):
     """Provides the XML command from the documentation."""
 
+    __slots__ = (
+        "_xml_filename",
+        "_terms",
+        "_docu_global",
+        "_autogenerated_directory_name",
+        "_links",
+        "_base_url",
+        "_fcache",
+        "_group",
+        "_is_archived",
+        "_refentry",
+        "_max_length",
+        "_notes",
+        "_other_parameters",
+        "_is_paragraph_in_arg_desc",
+    )
+
     def __init__(
         self,
         filename,
@@ -3123,7 +3425,7 @@ class XMLCommand(Element):
     @property
     def arg_desc(self) -> List[Argument]:
         """Argument object list of the command."""
-        refsyn = self.rec_find("Refsynopsisdiv")
+        refsyn = self.rec_find(Refsynopsisdiv)
         # search by ID
         arguments = None
         if refsyn and "Variablelist" in refsyn.children_types:
@@ -3141,7 +3443,7 @@ class XMLCommand(Element):
                     self._is_paragraph_in_arg_desc = True
 
         else:
-            refsections = self.find_all("RefSection")
+            refsections = self.find_all(RefSection)
             for elem in refsections:
                 for child in elem:
                     if isinstance(child, Variablelist):
@@ -3158,15 +3460,13 @@ class XMLCommand(Element):
 
         # Check whether arguments have been caught
         if not arguments:
-            refnamediv = self.find("Refnamediv")
-            available_arguments = refnamediv[0].get_children_by_type("Replaceable")
+            refnamediv = self.find(Refnamediv)
+            available_arguments = refnamediv[0].get_children_by_type(Replaceable)
             if available_arguments:
                 arguments = ArgumentList(
                     self.py_name, self.url, self._terms, available_arguments, self.args
                 )
 
-        arg_file = Path("args.txt")
-
         if arguments is not None:
             # Remove last argument if it's empty
             while arguments.py_arg_names[-1] == "":
@@ -3174,21 +3474,11 @@ class XMLCommand(Element):
 
             if len(arguments.py_arg_names) != len(arguments.initial_args):
                 # This function needs a special treatment
-                if arg_file.exists():
-                    with open(arg_file, "r", encoding="utf-8") as f:
-                        for line in f:
-                            pass
-                        last_line = line
-                else:
-                    last_line = ""
-                with open(arg_file, "a", encoding="utf-8") as f:
-                    if last_line != f"py_arg_name : {arguments.py_arg_names}\n":
-                        f.write("--------------------------------------------------\n")
-                        f.write(f"{self.py_name}: {self.group}\n")
-                        f.write("initial_args : ")
-                        f.write(f"{arguments.initial_args}\n")
-                        f.write("py_arg_name : ")
-                        f.write(f"{arguments.py_arg_names}\n")
+                SPECIAL_ARGUMENTS[self.py_name] = (
+                    self.group,
+                    list(arguments.initial_args),
+                    list(arguments.py_arg_names),
+                )
 
             return arguments.arguments
 
@@ -3208,11 +3498,11 @@ class XMLCommand(Element):
 
     @property
     def _metadata(self):
-        if self.rec_find("RefMeta") is None:
+        if self.rec_find(RefMeta) is None:
             for item in self._refentry.getchildren():
                 if item.tag == "refmeta":
                     return parse_element(item)
-        return self.rec_find("RefMeta")
+        return self.rec_find(RefMeta)
 
     @property
     def name(self):
@@ -3263,6 +3553,17 @@ class XMLCommand(Element):
         """Set the notes of the command."""
         self._notes = notes
 
+    def detach(self):
+        """
+        Release the lxml tree of the command.
+
+        This is meant to be called once the command has been rendered. The
+        command name and group remain available, but the command can no
+        longer be rendered with ``to_python``.
+        """
+        super().detach()
+        self._refentry = None
+
     def set_notes_and_other_parameters(self):
         """Set the notes and other parameters of the command."""
         other_parameters = []
@@ -3616,19 +3917,19 @@ class XMLCommand(Element):
     @property
     def filename(self):
         """Command filename"""
-        return self[0]._element.get("filename")
+        return self[0].get("filename")
 
     @property
     def _refname_div(self):
-        return self.rec_find("Refnamediv", self._terms)
+        return self.rec_find(Refnamediv, self._terms)
 
     @property
     def _refsynopsis(self):
-        return self.find("Refsynopsisdiv")
+        return self.find(Refsynopsisdiv)
 
     @property
     def _refsections(self):
-        return self.find_all("RefSection")
+        return self.find_all(RefSection)
 
     def __repr__(self):
         lines = [f"Original command: {self.name}"]
@@ -3681,7 +3982,69 @@ class XMLCommand(Element):
                 lines.append("")
         return lines
 
-    def py_source(self, custom_functions=None, indent=""):
+    def py_command(self, trim_empty_fields=False) -> str:
+        """
+        Python expression of the command string.
+
+        Parameters
+        ----------
+        trim_empty_fields: bool, optional
+            Whether the trailing empty fields are removed from the command string.
+            For example, ``"K,1,,,"`` is sent as ``"K,1"``. Only the empty fields are
+            removed, so that the argument values are sent unchanged unless they contain
+            NUL characters. The default is ``False``.
+        """
+        if len(self.arg_desc) > 0:
+            # The trimmed fields are separated with NUL characters, so that only the
+            # trailing separators are stripped and the commas of the values are kept.
+            separator = "\\x00" if trim_empty_fields else ","
+            command = 'f"' + self.name
+            for arg in self.arg_desc:
+                name = arg.py_arg_name
+                if name == "":
+                    command += separator
+                else:
+                    command += separator + "{"
+                    command += arg.py_arg_name
+                    command += "}"
+            command += '"'
+            if trim_empty_fields:
+                command += f'.rstrip("{separator}").replace("{separator}", ",")'
+        else:
+            command = f'"{self.name}"'
+        return command
+
+    def py_builder(self, indent="", trim_empty_fields=False):
+        """
+        Return the Python source of the function formatting the command string.
+
+        The ``_fmt_<py_name>`` static method has no side effect, so that commands can be
+        formatted without being run.
+
+        Parameters
+        ----------
+        indent: str, optional
+            Indentation of the Python function. The default is ``""``.
+        trim_empty_fields: bool, optional
+            Whether the trailing empty fields are removed from the command string.
+            The default is ``False``.
+        """
+        args = []
+        for argument in self.arg_desc:
+            new_arg = to_py_signature(argument.py_arg_name, argument.types)
+            if new_arg is not None:
+                args.append(new_arg)
+        lines = [
+            "@staticmethod",
+            f"def _fmt_{self.py_name}({', '.join(args)}) -> str:",
+            f'    """Format the ``{self.name}`` command string."""',
+            f"    return {self.py_command(trim_empty_fields)}",
+        ]
+        return "".join(f"{indent}{line}\n" for line in lines)
+
+    def py_source(
+        self, custom_functions=None, indent="", command_builders=False, trim_empty_fields=False
+    ):
         """
         Return the Python source.
 
@@ -3689,22 +4052,21 @@ class XMLCommand(Element):
         ----------
         custom_functions: CustomFunctions, optional
             Custom functions to add to the command. The default is ``None``.
+        indent: str, optional
+            Indentation of the Python function. The default is ``""``.
+        command_builders: bool, optional
+            Whether the command string is formatted by the ``_fmt_<py_name>`` static
+            method of the class. See :meth:`py_builder`. The default is ``False``.
+        trim_empty_fields: bool, optional
+            Whether the trailing empty fields are removed from the command string.
+            See :meth:`py_command`. The default is ``False``.
         """
         if custom_functions is None or self.py_name not in custom_functions.py_names:
-
-            if len(self.arg_desc) > 0:
-                command = 'command = f"' + self.name
-                for arg in self.arg_desc:
-                    name = arg.py_arg_name
-                    if name == "":
-                        command += ","
-                    else:
-                        command += ",{"
-                        command += arg.py_arg_name
-                        command += "}"
-                command += '"\n'
+            if command_builders:
+                args = [arg.py_arg_name for arg in self.arg_desc if arg.py_arg_name != ""]
+                command = f"command = self._fmt_{self.py_name}({', '.join(args)})\n"
             else:
-                command = f'command = "{self.name}"\n'
+                command = f"command = {self.py_command(trim_empty_fields)}\n"
             return_command = "return self.run(command, **kwargs)\n"
             source = textwrap.indent("".join([command, return_command]), prefix=" " * 4 + indent)
 
@@ -3718,6 +4080,8 @@ class XMLCommand(Element):
         comment_command_dict=None,
         indent="",
         image_folder_path: Path = None,
+        command_builders=False,
+        trim_empty_fields=False,
     ):
         """
         Return the complete Python definition of the command.
@@ -3736,12 +4100,29 @@ class XMLCommand(Element):
         indent: str, optional
             Indentation of the Python function. The default is ``""``.
 
+        image_folder_path: Path, optional
+            Path to the folder containing the images. The default is ``None``.
+
+        command_builders: bool, optional
+            Whether to add the ``_fmt_<py_name>`` static method formatting the command
+            string, used by the Python function. Customized functions are left
+            untouched. The default is ``False``.
+
+        trim_empty_fields: bool, optional
+            Whether the trailing empty fields are removed from the command string.
+            Customized functions are left untouched. The default is ``False``.
+
         Returns
         -------
         str
             Python function of the command including the converted docstring.
         """
 
+        if self.is_detached:
+            raise RuntimeError(
+                f"The '{self.name}' command has been detached and cannot be rendered again."
+            )
+
         if image_folder_path is not None:
             global IMAGE_FOLDER_PATH
             IMAGE_FOLDER_PATH = image_folder_path
@@ -3750,26 +4131,33 @@ class XMLCommand(Element):
             f'r"""{self.py_docstring(custom_functions, comment_command_dict)}\n"""',
             prefix=indent + " " * 4,
         )
+        is_custom = custom_functions is not None and self.py_name in custom_functions.py_names
+        command_builders = command_builders and not is_custom
+        source = self.py_source(custom_functions, indent, command_builders, trim_empty_fields)
         if custom_functions is not None and self.py_name in custom_functions.lib_import:
             imports = "\n".join(custom_functions.lib_import[self.py_name])
             out = f"""
 {imports}
 {self.py_signature(custom_functions, indent)}
 {docstr}
-{self.py_source(custom_functions, indent)}
+{source}
 """
         else:
             out = f"""
 {self.py_signature(custom_functions, indent)}
 {docstr}
-{self.py_source(custom_functions, indent)}
+{source}
 """
+        if command_builders:
+            out += f"\n{self.py_builder(indent, trim_empty_fields)}"
         return out
 
 
 class InformalTable(Element):
     """Provides the informal table element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100):
         """Return a string to enable converting the element to an RST format."""
         output = """
@@ -3783,6 +4171,8 @@ documentation pointed above.
 class BridgeHead(Element):
     """Provides the bridgehead element."""
 
+    __slots__ = ()
+
     def to_rst(self, indent="", max_length=100):
         """Return a string to enable converting the element to an RST format."""
         subtitle = super().to_rst(indent=indent, max_length=max_length)
@@ -3967,6 +4357,8 @@ def get_parser():
 class OxygenXmlTree(Element):
     """Provides for loading an XML file as an AST (abstract syntax tree)."""
 
+    __slots__ = ("_xml_filename",)
+
     def __init__(self, filename, meta_only=False):
         """Parse command from XML file."""
         self._xml_filename = filename
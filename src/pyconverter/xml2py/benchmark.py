@@ -0,0 +1,402 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module contains the functions generating the benchmarks of the generated packages."""
+
+import json
+import os
+from pathlib import Path
+import re
+import statistics
+
+# Subprocess is needed to import the packages in fresh interpreters.
+# Excluding bandit check.
+import subprocess  # nosec B404
+import sys
+import time
+from typing import Union
+
+BENCHMARK_FILE_NAME = "bench_command_strings.py"
+
+# f-string of a command string expression, followed by its method calls
+_COMMAND_STRING = re.compile(r'^f"((?:[^"\\]|\\.)*)"(.*)$', re.S)
+# Replacement fields and characters, which are never split
+_COMMAND_TOKEN = re.compile(r"\{[^}]*\}|\\x[0-9a-fA-F]{2}|\\.|[^{\\]")
+
+#: Metrics of the import benchmark compared with the baseline, with their unit
+IMPORT_METRICS = {
+    "import_time": "s",
+    "process_time": "s",
+    "rss_delta": "B",
+    "source_bytes": "B",
+    "bytecode_bytes": "B",
+}
+
+# Run in a fresh interpreter with the module name and whether to import the submodules
+_IMPORT_SCRIPT = """
+import json
+import os
+import pkgutil
+import sys
+import time
+
+
+def get_rss():
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, AttributeError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak RSS, in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+# ``__import__`` is used as ``importlib.import_module`` is not reported by ``-X importtime``
+start_rss = get_rss()
+start = time.perf_counter()
+__import__(sys.argv[1])
+module = sys.modules[sys.argv[1]]
+if sys.argv[2] == "1" and hasattr(module, "__path__"):
+    for info in pkgutil.walk_packages(module.__path__, f"{module.__name__}."):
+        __import__(info.name)
+import_time = time.perf_counter() - start
+end_rss = get_rss()
+rss_delta = None if start_rss is None else end_rss - start_rss
+print(json.dumps({"import_time": import_time, "rss_delta": rss_delta}))
+"""
+
+_COMMAND_STRINGS_MAIN = '''
+
+def main(number=10000):
+    """Time the command strings formatted with the default and the first argument."""
+    results = {"full": [0, 0.0], "trimmed": [0, 0.0]}
+    calls = 0
+    for name, full, trimmed, has_args in COMMANDS:
+        samples = ((), ("1",)) if has_args else ((),)
+        calls += len(samples) * number
+        for mode, function in (("full", full), ("trimmed", trimmed)):
+            for args in samples:
+                results[mode][0] += len(function(*args)) * number
+                results[mode][1] += timeit.timeit(lambda: function(*args), number=number)
+    (full_bytes, full_time), (trimmed_bytes, trimmed_time) = results.values()
+    print(f"Commands: {len(COMMANDS)}, calls per mode: {calls}")
+    print(f"Full command strings: {full_bytes} bytes in {full_time:.3f} s")
+    print(f"Trimmed command strings: {trimmed_bytes} bytes in {trimmed_time:.3f} s")
+    print(f"Saved bytes: {100 * (1 - trimmed_bytes / full_bytes):.1f} %")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
+'''
+
+
+def get_command_strings_entry(command, custom_functions=None) -> Union[tuple, None]:
+    """
+    Get the benchmark entry of a command.
+
+    The entry must be computed before the command is detached.
+
+    Parameters
+    ----------
+    command: XMLCommand
+        Command to benchmark.
+    custom_functions: CustomFunctions, optional
+        Custom functions of the package, which are not benchmarked.
+        The default value is ``None``.
+
+    Returns
+    -------
+    tuple or None
+        Command name, argument names, and full and trimmed command string expressions.
+        ``None`` is returned if the command has no argument or is a custom function.
+    """
+    if custom_functions is not None and command.py_name in custom_functions.py_names:
+        return None
+    if not command.arg_desc:
+        return None
+    arg_names = tuple(arg.py_arg_name for arg in command.arg_desc if arg.py_arg_name != "")
+    return command.name, arg_names, command.py_command(), command.py_command(True)
+
+
+def _wrap_command(command: str, width: int) -> str:
+    """Split the f-string of a command string expression into strings of ``width`` characters.
+
+    Black does not split strings, so the strings are split here and parenthesized,
+    so that Black can write each of them on its own line.
+    """
+    match = _COMMAND_STRING.match(command)
+    if match is None or len(command) <= width:
+        return command
+    content, trailer = match.groups()
+    pieces = [""]
+    for token in _COMMAND_TOKEN.findall(content):
+        if pieces[-1] and len(pieces[-1]) + len(token) > width - 3:
+            pieces.append("")
+        pieces[-1] += token
+    strings = " ".join(f'{"f" if "{" in piece else ""}"{piece}"' for piece in pieces)
+    return f"({strings}){trailer}"
+
+
+def get_command_strings_benchmark(entries: list, line_length: int = 88) -> str:
+    """
+    Get the source of the micro-benchmark comparing full and trimmed command strings.
+
+    The command strings are formatted with and without their trailing empty fields,
+    for all the arguments set to their default value and for the first argument set.
+    Both the size of the command stream and the formatting time are reported.
+
+    Parameters
+    ----------
+    entries: list
+        Benchmark entries of the commands. See :func:`get_command_strings_entry`.
+    line_length: int, optional
+        Maximum line length of the script once formatted with Black. The command
+        strings are split so that they fit in it. The default value is ``88``.
+
+    Returns
+    -------
+    str
+        Source of a standalone script, which only depends on the standard library.
+    """
+    # The strings are indented by 12 spaces at most once formatted
+    width = line_length - 12
+    lines = [
+        '"""Micro-benchmark of the command strings with trailing empty fields trimmed."""',
+        "",
+        "import sys",
+        "import timeit",
+        "",
+    ]
+    items = []
+    for index, (name, arg_names, full, trimmed) in enumerate(entries):
+        args = ", ".join(f'{arg_name}=""' for arg_name in arg_names)
+        for mode, command in (("full", full), ("trimmed", trimmed)):
+            command = _wrap_command(command, width)
+            lines.extend(["", f"def _{mode}_{index}({args}):", f"    return {command}", ""])
+        items.append(f"    ({name!r}, _full_{index}, _trimmed_{index}, {bool(arg_names)}),")
+    lines.extend(["", "COMMANDS = ("] + items + [")"])
+    return "\n".join(lines) + _COMMAND_STRINGS_MAIN
+
+
+def parse_importtime(output: str, prefix: str) -> dict:
+    """
+    Parse the report written by the ``-X importtime`` option of Python.
+
+    Parameters
+    ----------
+    output: str
+        Standard error of the Python process.
+    prefix: str
+        Name of the package whose modules are kept.
+
+    Returns
+    -------
+    dict
+        Dictionary with the following format:
+        ``{module: (self_us, cumulative_us)}``.
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        if name == prefix or name.startswith(f"{prefix}."):
+            modules[name] = (int(fields[0]), int(fields[1]))
+    return modules
+
+
+def get_package_sizes(source_path: Path, module: Union[str, None] = None) -> dict:
+    """
+    Get the size of the source and bytecode files of a package.
+
+    Parameters
+    ----------
+    source_path: Path
+        Path object of the directory containing the package.
+    module: str, optional
+        Name of the imported module, whose files are the only ones counted. The default
+        value is ``None``, in which case all the files of the directory are counted.
+
+    Returns
+    -------
+    dict
+        Numbers of source files, and sizes in bytes of the source and bytecode files.
+    """
+    paths = []
+    module_path = Path(source_path).joinpath(*module.split(".")) if module else Path(source_path)
+    if module_path.is_dir():
+        paths = module_path.rglob("*")
+    elif module_path.with_suffix(".py").is_file():
+        # Single module, with its bytecode cached in the ``__pycache__`` directory
+        cache_path = module_path.parent / "__pycache__"
+        paths = [module_path.with_suffix(".py"), *cache_path.glob(f"{module_path.name}.*.pyc")]
+    sizes = {"source_files": 0, "source_bytes": 0, "bytecode_bytes": 0}
+    for path in paths:
+        if path.suffix == ".py":
+            sizes["source_files"] += 1
+            sizes["source_bytes"] += path.stat().st_size
+        elif path.suffix == ".pyc":
+            sizes["bytecode_bytes"] += path.stat().st_size
+    return sizes
+
+
+def benchmark_import(
+    source_path: Path,
+    module: str,
+    runs: int = 5,
+    submodules: bool = False,
+    python: Union[str, None] = None,
+) -> dict:
+    """
+    Import a package in fresh Python processes and measure its runtime cost.
+
+    A first run, not measured, writes the bytecode that is not precompiled. The times
+    and the memory are measured in processes run without ``-X importtime``, whose
+    overhead would bias them. The import times of the modules are measured in separate
+    processes run with it.
+
+    Parameters
+    ----------
+    source_path: Path
+        Path object of the directory containing the package, which is added
+        to ``PYTHONPATH``.
+    module: str
+        Name of the module to import.
+    runs: int, optional
+        Number of measured runs. The medians are reported. The default value is ``5``.
+    submodules: bool, optional
+        Whether to import all the submodules of the package, which includes the
+        modules imported lazily. The default value is ``False``.
+    python: str, optional
+        Python executable. The default value is ``None``, in which case the current
+        executable is used.
+
+    Returns
+    -------
+    dict
+        Benchmark results, with the metrics of ``IMPORT_METRICS``, the sizes returned by
+        :func:`get_package_sizes`, and the self and cumulative import times of each module
+        of the package in microseconds.
+    """
+    env = dict(os.environ)
+    python_paths = [str(Path(source_path).resolve())]
+    if env.get("PYTHONPATH"):
+        python_paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(python_paths)
+    args = ["-c", _IMPORT_SCRIPT, module, "1" if submodules else "0"]
+    measures = []
+    module_times = {}
+    for run in range(runs + 1):
+        for options in ((), ("-X", "importtime")):
+            start = time.perf_counter()
+            # The arguments are controlled by the library.
+            # Excluding bandit check.
+            output = subprocess.run(
+                [python or sys.executable, *options, *args],
+                capture_output=True,
+                text=True,
+                env=env,
+            )  # nosec B603
+            process_time = time.perf_counter() - start
+            if output.returncode != 0:
+                raise RuntimeError(f"Failed to import '{module}':\n{output.stderr[-2000:]}")
+            if run == 0:
+                break
+            if options:
+                for name, times in parse_importtime(output.stderr, module.split(".")[0]).items():
+                    module_times.setdefault(name, []).append(times)
+            else:
+                measure = json.loads(output.stdout.strip().splitlines()[-1])
+                measure["process_time"] = process_time
+                measures.append(measure)
+
+    results = {"module": module, "runs": runs, "submodules": submodules}
+    for metric in ("import_time", "process_time", "rss_delta"):
+        values = [measure[metric] for measure in measures if measure[metric] is not None]
+        results[metric] = statistics.median(values) if values else None
+    results.update(get_package_sizes(source_path, module))
+    results["modules"] = {
+        name: {
+            "self_us": statistics.median(self_us for self_us, _ in times),
+            "cumulative_us": statistics.median(cumulative_us for _, cumulative_us in times),
+        }
+        for name, times in sorted(module_times.items())
+    }
+    return results
+
+
+def _format_value(value, unit: str) -> str:
+    if value is None:
+        return "n/a"
+    if unit == "s":
+        return f"{value * 1000:.1f} ms"
+    return f"{value / 1024:.1f} kB"
+
+
+def format_import_results(results: dict, baseline: Union[dict, None] = None, top: int = 10) -> str:
+    """
+    Format the results of an import benchmark, compared with a baseline.
+
+    Parameters
+    ----------
+    results: dict
+        Results returned by :func:`benchmark_import`.
+    baseline: dict, optional
+        Results of a previous benchmark. The default value is ``None``.
+    top: int, optional
+        Number of modules with the largest cumulative import time to report.
+        The default value is ``10``.
+
+    Returns
+    -------
+    str
+        Report of the benchmark.
+    """
+    lines = [
+        f"Import of '{results['module']}' ({results['runs']} runs, "
+        f"{results['source_files']} source files)"
+    ]
+    for metric, unit in IMPORT_METRICS.items():
+        line = f"{metric}: {_format_value(results[metric], unit)}"
+        if baseline is not None and baseline.get(metric) and results[metric] is not None:
+            change = 100 * (results[metric] / baseline[metric] - 1)
+            line += f" (baseline: {_format_value(baseline[metric], unit)}, {change:+.1f} %)"
+        lines.append(line)
+    modules = sorted(
+        results["modules"].items(), key=lambda item: item[1]["cumulative_us"], reverse=True
+    )
+    if modules:
+        lines.append("Slowest modules (cumulative / self, in us):")
+    for name, times in modules[:top]:
+        line = f"  {name}: {times['cumulative_us']:.0f} / {times['self_us']:.0f}"
+        if baseline is not None and name in baseline.get("modules", {}):
+            line += f" (baseline: {baseline['modules'][name]['cumulative_us']:.0f})"
+        lines.append(line)
+    return "\n".join(lines)
@@ -22,6 +22,7 @@
 
 """Command Line Interface for PyConverter-XML2Py."""
 
+import json
 import logging
 import os
 from pathlib import Path
@@ -30,6 +31,13 @@ from typing import Union
 import click
 from pyconverter.xml2py import __version__, download, formatter
 from pyconverter.xml2py import writer as wr
+from pyconverter.xml2py.archive import ArchiveWriter, WheelWriter
+from pyconverter.xml2py.benchmark import benchmark_import, format_import_results
+from pyconverter.xml2py.config import load_config
+from pyconverter.xml2py.equation_cache import DEFAULT_EQUATION_CACHE_PATH
+from pyconverter.xml2py.synth import DEFAULT_PROPORTIONS, write_corpus
+
+OUTPUT_FORMATS = ("dir", "zip", "wheel")
 
 
 def create_package(
@@ -39,6 +47,23 @@ def create_package(
     custom_functions_path: Union[Path, None] = None,
     run_pre_commit: bool = False,
     max_docstring_length: int = 100,
+    convert_equations: bool = False,
+    equation_cache_path: Union[Path, None] = DEFAULT_EQUATION_CACHE_PATH,
+    max_workers: int = 1,
+    format_code: bool = False,
+    output_format: str = "dir",
+    lazy_imports: bool = False,
+    short_docstrings: bool = False,
+    compressed_docstrings: bool = False,
+    command_tables: bool = False,
+    command_builders: bool = False,
+    trim_empty_fields: bool = False,
+    command_index: bool = False,
+    precompile: bool = False,
+    optimizations: tuple = (0,),
+    invalidation_mode: str = "checked-hash",
+    check_collisions: bool = False,
+    autosummary_stubs: bool = False,
 ) -> None:
     """Create Python package based on a XML documentation.
 
@@ -57,11 +82,70 @@ def create_package(
         Path to the directory that contains the functions that need to be customized.
         The default value is None.
     run_pre_commit: bool, optional
-        Whether to run pre-commit hooks on the autogenerated package source code.
-        The default value is ``False``.
+        Whether to run pre-commit hooks on the files of the autogenerated package
+        that changed. The default value is ``False``.
     max_docstring_length: int, optional
         Maximum length of the generated docstrings.
         The default is ``100``.
+    convert_equations: bool, optional
+        Whether to convert the MathML equations into LaTeX.
+        The default value is ``False``.
+    equation_cache_path: str or Path, optional
+        Path to the JSON file caching the converted equations across runs.
+        If ``None``, the cache is only kept in memory.
+        The default value is ``~/.cache/pyconverter-xml2py/equations.json``.
+    max_workers: int, optional
+        Number of worker processes used to convert the equations and render the commands.
+        The default value is ``1``.
+    format_code: bool, optional
+        Whether to format the autogenerated source code with Black.
+        The default value is ``False``.
+    output_format: str, optional
+        Format of the autogenerated package. Options are ``"dir"`` for a package
+        directory, ``"zip"`` for a zip archive of the package directory, and
+        ``"wheel"`` for a wheel of the package source code. The archives are
+        written directly, without creating the package directory.
+        The default value is ``"dir"``.
+    lazy_imports: bool, optional
+        Whether the ``__init__.py`` files of the autogenerated package import the
+        modules on first attribute access instead of eagerly.
+        The default value is ``False``.
+    short_docstrings: bool, optional
+        Whether the autogenerated modules only keep the first line of the method
+        docstrings. The full docstrings are written to ``.pyi`` stub files.
+        The default value is ``False``.
+    compressed_docstrings: bool, optional
+        Whether the method docstrings of the autogenerated classes are stored in
+        compressed resources and loaded on first access.
+        The default value is ``False``.
+    command_tables: bool, optional
+        Whether the methods of the autogenerated classes running a formatted command
+        are built from a command table when the class is created.
+        The default value is ``False``.
+    command_builders: bool, optional
+        Whether the autogenerated methods format their command with a side-effect free
+        ``_fmt_<command>`` static method, which can be used to batch commands.
+        The default value is ``False``.
+    trim_empty_fields: bool, optional
+        Whether the autogenerated methods remove the trailing empty fields from
+        their command string. The default value is ``False``.
+    command_index: bool, optional
+        Whether to add a ``_command_index`` module mapping each command name to its
+        Python method. The default value is ``False``.
+    precompile: bool, optional
+        Whether to write the bytecode of the autogenerated package in parallel.
+        The default value is ``False``.
+    optimizations: tuple, optional
+        Optimization levels of the precompiled bytecode. The default value is ``(0,)``.
+    invalidation_mode: str, optional
+        Invalidation mode of the precompiled bytecode: ``"timestamp"``,
+        ``"checked-hash"`` or ``"unchecked-hash"``. The default value is ``"checked-hash"``.
+    check_collisions: bool, optional
+        Whether to check that no method is defined in several classes of the package.
+        The default value is ``False``.
+    autosummary_stubs: bool, optional
+        Whether to write the autosummary stub pages of the methods, so that Sphinx
+        does not import the package to generate them. The default value is ``False``.
     """  # noqa : E501
     if xml_path is None:
         xml_path = os.environ.get("XML_PATH")
@@ -100,22 +184,81 @@ def create_package(
         target_path.mkdir(parents=True, exist_ok=True)
         print(f"The autogenerated package will be saved in {target_path}.")
 
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Invalid output format '{output_format}'. Options are {', '.join(OUTPUT_FORMATS)}."
+        )
+
+    if precompile and run_pre_commit and output_format == "dir":
+        raise ValueError(
+            "The bytecode cannot be precompiled when the pre-commit hooks modify the sources."
+        )
+
     if template_path is None:
         if not (Path.cwd() / "_package").is_dir():
             download.download_template()
+    else:
+        template_path = Path(template_path).expanduser().resolve()
 
-    command_map, name_map = wr.convert(xml_path)
-    arg_file = Path("args.txt")
-    if arg_file.exists():
-        # Delete the file if it exists
-        arg_file.unlink()
+    config = load_config(Path("config.yaml"))
+    package_path = target_path / config.new_package_name
+    if output_format == "wheel":
+        file_writer = WheelWriter(
+            target_path, package_path, template_path or Path.cwd() / "_package"
+        )
+    elif output_format == "zip":
+        file_writer = ArchiveWriter(
+            target_path / f"{config.new_package_name}.zip",
+            package_path,
+            prefix=f"{config.new_package_name}/",
+        )
+    else:
+        file_writer = wr.FileWriter()
+    command_map, name_map = wr.convert(
+        xml_path,
+        convert_equations=convert_equations,
+        equation_cache_path=equation_cache_path,
+        max_workers=max_workers,
+        config_path=config,
+    )
     package_structure = wr.write_source(
-        command_map, name_map, xml_path, target_path, custom_functions_path
+        command_map,
+        name_map,
+        xml_path,
+        target_path,
+        custom_functions_path,
+        template_path=template_path,
+        config_path=config,
+        format_code=format_code,
+        lazy_imports=lazy_imports,
+        short_docstrings=short_docstrings,
+        compressed_docstrings=compressed_docstrings,
+        command_tables=command_tables,
+        command_builders=command_builders,
+        trim_empty_fields=trim_empty_fields,
+        command_index=command_index,
+        precompile=precompile,
+        optimizations=optimizations,
+        invalidation_mode=invalidation_mode,
+        check_collisions=check_collisions,
+        autosummary_stubs=autosummary_stubs,
+        max_workers=max_workers,
+        file_writer=file_writer,
     )
-    package_path = target_path / "package"
-    wr.write_docs(package_path, package_structure)
-    if run_pre_commit is True:
-        formatter.run_pre_commit(package_path)
+    wr.write_special_arguments(Path("args.txt"))
+    wr.write_docs(
+        package_path,
+        package_structure,
+        config_path=config,
+        file_writer=file_writer,
+        autosummary_stubs=autosummary_stubs,
+    )
+    print(f"Package files: {file_writer.summary}.")
+    archive_path = file_writer.close()
+    if archive_path is not None:
+        print(f"The autogenerated package was written to {archive_path}.")
+    elif run_pre_commit is True:
+        formatter.run_pre_commit(package_path, file_writer.changed_paths)
 
 
 @click.group()
@@ -171,6 +314,127 @@ def version():
     default=100,
     help="Maximum length of the generated docstrings.",
 )
+@click.option(
+    "-b",
+    "--format-code",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to format the autogenerated source code with Black.",
+)
+@click.option(
+    "-e",
+    "--convert-equations",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to convert the MathML equations into LaTeX.",
+)
+@click.option(
+    "--equation-cache",
+    type=click.Path(),
+    default=None,
+    help="Path to the JSON file caching the converted equations across runs.",
+)
+@click.option(
+    "-j",
+    "--workers",
+    type=click.INT,
+    default=1,
+    help="Number of worker processes to use.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default="dir",
+    help="Format of the autogenerated package: a directory, a zip archive, or a wheel.",
+)
+@click.option(
+    "--lazy-imports",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether the autogenerated package imports its modules on first access.",
+)
+@click.option(
+    "--short-docstrings",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to keep only one-line docstrings in the modules and write .pyi stubs.",
+)
+@click.option(
+    "--compressed-docstrings",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to store the method docstrings in compressed resources loaded on access.",
+)
+@click.option(
+    "--command-tables",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to build the command methods from a table when the classes are created.",
+)
+@click.option(
+    "--command-builders",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to add side-effect free command string builders to the classes.",
+)
+@click.option(
+    "--trim-empty-fields",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to remove the trailing empty fields from the command strings.",
+)
+@click.option(
+    "--command-index",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to add a module mapping each command name to its Python method.",
+)
+@click.option(
+    "--precompile",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to write the bytecode of the autogenerated package using the workers.",
+)
+@click.option(
+    "-O",
+    "--optimize",
+    "optimizations",
+    type=click.IntRange(0, 2),
+    multiple=True,
+    default=(0,),
+    help="Optimization level of the precompiled bytecode. Can be repeated.",
+)
+@click.option(
+    "--invalidation-mode",
+    type=click.Choice(wr.INVALIDATION_MODES),
+    default="checked-hash",
+    help="How Python checks that the precompiled bytecode is up to date.",
+)
+@click.option(
+    "--check-collisions",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to check that no method is defined in several classes of the package.",
+)
+@click.option(
+    "--autosummary-stubs",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to write the autosummary stub pages instead of Sphinx.",
+)
 def package(
     xml_path: Path,
     targ_path: Path,
@@ -178,6 +442,147 @@ def package(
     func_path: Path,
     run_pre_commit: bool,
     max_length: int,
+    format_code: bool,
+    convert_equations: bool,
+    equation_cache: Path,
+    workers: int,
+    output_format: str,
+    lazy_imports: bool,
+    short_docstrings: bool,
+    compressed_docstrings: bool,
+    command_tables: bool,
+    command_builders: bool,
+    trim_empty_fields: bool,
+    command_index: bool,
+    precompile: bool,
+    optimizations: tuple,
+    invalidation_mode: str,
+    check_collisions: bool,
+    autosummary_stubs: bool,
 ) -> None:
     """Create a Python package from your XML documentation."""
-    create_package(xml_path, targ_path, template_path, func_path, run_pre_commit, max_length)
+    if equation_cache is None:
+        equation_cache = DEFAULT_EQUATION_CACHE_PATH
+    create_package(
+        xml_path,
+        targ_path,
+        template_path,
+        func_path,
+        run_pre_commit,
+        max_length,
+        convert_equations,
+        equation_cache,
+        workers,
+        format_code,
+        output_format,
+        lazy_imports,
+        short_docstrings,
+        compressed_docstrings,
+        command_tables,
+        command_builders,
+        trim_empty_fields,
+        command_index,
+        precompile,
+        optimizations,
+        invalidation_mode,
+        check_collisions,
+        autosummary_stubs,
+    )
+
+
+@main.command(name="bench-import")
+@click.argument("package_path", type=click.Path(exists=True, file_okay=False), required=False)
+@click.option(
+    "-m",
+    "--module",
+    type=click.STRING,
+    default=None,
+    help="Name of the module to import. By default, the library of the config.yaml file.",
+)
+@click.option(
+    "-n",
+    "--runs",
+    type=click.IntRange(1),
+    default=5,
+    help="Number of measured imports, each in a fresh Python process.",
+)
+@click.option(
+    "--submodules",
+    type=click.BOOL,
+    default=False,
+    is_flag=True,
+    help="Whether to import all the submodules of the package.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Path to the JSON results of a previous benchmark to compare with.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Path to the JSON file where to save the results.",
+)
+def bench_import(
+    package_path: Union[str, None],
+    module: Union[str, None],
+    runs: int,
+    submodules: bool,
+    baseline: Union[str, None],
+    output: Union[str, None],
+) -> None:
+    """Measure the import cost of an autogenerated package.
+
+    PACKAGE_PATH is the directory of the package, which contains the ``src`` directory.
+    By default, it is the package autogenerated in the current directory.
+    """
+    if package_path is None or module is None:
+        config = load_config(Path("config.yaml"))
+        if package_path is None:
+            package_path = Path.cwd() / config.new_package_name
+        if module is None:
+            module = config.library_import_name
+    results = benchmark_import(Path(package_path) / "src", module, runs, submodules)
+    baseline_results = None
+    if baseline is not None and Path(baseline).is_file():
+        baseline_results = json.loads(Path(baseline).read_text(encoding="utf-8"))
+    print(format_import_results(results, baseline_results))
+    if output is not None:
+        Path(output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Results saved to {output}.")
+
+
+@main.command()
+@click.option(
+    "-n",
+    "--commands",
+    type=click.IntRange(1),
+    default=1000,
+    help="Number of commands to generate.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(file_okay=False),
+    default="synthetic_xml",
+    help="Path to the directory where to write the XML documentation.",
+)
+@click.option(
+    "--proportion",
+    type=(click.Choice(list(DEFAULT_PROPORTIONS)), click.FloatRange(0, 1)),
+    multiple=True,
+    help="Proportion of the commands containing a kind of content, for example ``tables 0.5``.",
+)
+@click.option(
+    "--seed",
+    type=click.INT,
+    default=0,
+    help="Seed of the random number generator.",
+)
+def synth(commands: int, output: str, proportion: tuple, seed: int) -> None:
+    """Generate a synthetic XML documentation for benchmarks."""
+    path = write_corpus(Path(output), commands, dict(proportion), seed=seed)
+    print(f"{commands} commands written to {path}.")
@@ -0,0 +1,105 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Batches of commands formatted by the ``_fmt_<command>`` builders of the generated classes.
+
+This module only depends on the standard library, as it is copied into the
+generated packages built with command builders.
+"""
+
+
+class CommandBatch:
+    """
+    Collects formatted commands and submits them as one input block.
+
+    Commands are called on the batch like on the object running them. For example,
+    ``batch.k(1, 0, 0, 0)`` formats the command with the ``_fmt_k`` builder of the
+    object class and collects the line. The lines are submitted when the context exits
+    without an exception.
+
+    Parameters
+    ----------
+    commands: object
+        Object with the generated command methods.
+    submit: callable, optional
+        Function submitting the input block as a string. The default value is ``None``,
+        in which case the ``input_strings`` method of ``commands`` is used.
+
+    Examples
+    --------
+    >>> with CommandBatch(mapdl) as batch:
+    ...     for i in range(1000):
+    ...         batch.k(i + 1, i, 0, 0)
+    """
+
+    def __init__(self, commands, submit=None):
+        self._commands = commands
+        self._submit = submit
+        self.lines = []
+
+    def __getattr__(self, name):
+        builder = getattr(type(self._commands), f"_fmt_{name}", None)
+        if builder is None or name.startswith("_"):
+            raise AttributeError(
+                f"'{type(self._commands).__name__}' object has no command builder for '{name}'"
+            )
+        lines = self.lines
+
+        def add(*args, **kwargs):
+            lines.append(builder(*args, **kwargs))
+
+        add.__name__ = name
+        add.__doc__ = builder.__doc__
+        # Following accesses find the function in the instance dictionary
+        self.__dict__[name] = add
+        return add
+
+    def add(self, line: str) -> None:
+        """Add a raw input line to the batch."""
+        self.lines.append(line)
+
+    def submit(self):
+        """
+        Submit the collected lines as one input block.
+
+        Returns
+        -------
+        object
+            Output of the submit function, or ``None`` if there are no lines.
+        """
+        if not self.lines:
+            return None
+        block = "\n".join(self.lines)
+        self.lines.clear()
+        submit = self._submit if self._submit is not None else self._commands.input_strings
+        return submit(block)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.submit()
+        else:
+            self.lines.clear()
+        return False
@@ -0,0 +1,120 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Methods of the generated classes built from a command table.
+
+This module only depends on the standard library, as it is copied into the
+generated packages built with command tables.
+"""
+
+import inspect
+
+_SELF = inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)
+_KWARGS = inspect.Parameter("kwargs", inspect.Parameter.VAR_KEYWORD)
+
+
+def build_method(
+    owner: type, py_name: str, name: str, fields: tuple, parameters: tuple, docstring: str
+):
+    """
+    Build the method running a command.
+
+    Parameters
+    ----------
+    owner: type
+        Class the method belongs to.
+    py_name: str
+        Name of the method.
+    name: str
+        Name of the command.
+    fields: tuple
+        Names of the parameters formatted in each field of the command, in order.
+        Empty names are empty fields.
+    parameters: tuple
+        Parameters of the method with the following format:
+        ``(("name", "annotation", default), ...)``. The annotation may be ``None``.
+    docstring: str
+        Docstring of the method.
+
+    Returns
+    -------
+    function
+        Method formatting the command and running it with ``self.run``.
+    """
+    names = tuple(parameter[0] for parameter in parameters)
+    defaults = tuple(parameter[2] for parameter in parameters)
+    n_names = len(names)
+
+    def method(self, *args, **kwargs):
+        if len(args) > n_names:
+            raise TypeError(
+                f"{py_name}() takes {n_names + 1} positional arguments "
+                f"but {len(args) + 1} were given"
+            )
+        values = dict(zip(names, args))
+        for arg_name in names[: len(args)]:
+            if arg_name in kwargs:
+                raise TypeError(f"{py_name}() got multiple values for argument '{arg_name}'")
+        for arg_name, default in zip(names[len(args) :], defaults[len(args) :]):
+            values[arg_name] = kwargs.pop(arg_name, default)
+        command = ",".join([name] + [format(values[field]) if field else "" for field in fields])
+        return self.run(command, **kwargs)
+
+    method.__name__ = py_name
+    method.__qualname__ = f"{owner.__qualname__}.{py_name}"
+    method.__module__ = owner.__module__
+    method.__doc__ = docstring
+    method.__signature__ = inspect.Signature(
+        [_SELF]
+        + [
+            inspect.Parameter(
+                arg_name,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=default,
+                annotation=inspect.Parameter.empty if annotation is None else annotation,
+            )
+            for arg_name, annotation, default in parameters
+        ]
+        + [_KWARGS]
+    )
+    return method
+
+
+def command_table(commands: tuple):
+    """
+    Class decorator adding the methods of a command table.
+
+    Parameters
+    ----------
+    commands: tuple
+        Commands with the following format:
+        ``(("py_name", "NAME", fields, parameters, docstring), ...)``.
+        See :func:`build_method`.
+    """
+
+    def decorator(cls):
+        for py_name, name, fields, parameters, docstring in commands:
+            setattr(cls, py_name, build_method(cls, py_name, name, fields, parameters, docstring))
+        return cls
+
+    return decorator
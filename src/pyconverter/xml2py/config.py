@@ -0,0 +1,255 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Configuration of the package generation."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import fnmatch
+from functools import lru_cache
+import os
+from pathlib import Path
+import re
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Optional, Pattern, Tuple, Union
+
+import yaml
+
+
+def _freeze(value):
+    """Return a read-only copy of a value parsed from a YAML file."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(val) for key, val in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+def _thaw(value):
+    """Return a mutable copy of a frozen value."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(val) for key, val in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(val) for val in value]
+    return value
+
+
+@dataclass(frozen=True)
+class BaseClassRule:
+    """Provides a pattern-based inheritance rule of the generated classes.
+
+    Parameters
+    ----------
+    pattern: str
+        ``fnmatch`` pattern matched against ``"module_name/class_name"``.
+    module: str
+        Module of the base class.
+    class_name: str
+        Name of the base class.
+    slots: bool, optional
+        Whether the generated classes define empty ``__slots__``. The default value is
+        ``None``, in which case the ``slots`` value of the ``base_class`` section is used.
+    """
+
+    pattern: str
+    module: str
+    class_name: str
+    slots: Optional[bool] = None
+    regex: Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Same case normalization as ``fnmatch.fnmatch``
+        regex = fnmatch.translate(os.path.normcase(self.pattern))
+        object.__setattr__(self, "regex", re.compile(regex))
+
+    def match(self, full_path: str) -> bool:
+        """Whether the rule applies to a ``"module_name/class_name"`` path."""
+        return self.regex.match(os.path.normcase(full_path)) is not None
+
+
+@dataclass(frozen=True)
+class Config:
+    """Provides the read-only content of a ``config.yaml`` file.
+
+    Use :func:`load_config` to create it, so that each file is parsed once.
+    """
+
+    path: Path
+    project_name: Optional[str] = None
+    library_name_structured: Tuple[str, ...] = ()
+    subfolders: Tuple[str, ...] = ()
+    new_package_name: Optional[str] = None
+    image_folder_path: Optional[str] = None
+    documentation_subfolder: Optional[str] = None
+    rules: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    specific_command_mapping: Mapping[str, str] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    ignored_commands: FrozenSet[str] = frozenset()
+    comments: Tuple[Mapping, ...] = ()
+    specific_classes: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    base_class_rules: Tuple[BaseClassRule, ...] = ()
+    class_slots: bool = False
+    _data: Mapping = field(default_factory=lambda: MappingProxyType({}), repr=False, compare=False)
+    _base_class_cache: Dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, data: dict, path: Path = Path("config.yaml")) -> "Config":
+        """Create a configuration from the content of a YAML file.
+
+        Parameters
+        ----------
+        data: dict
+            Content of the YAML file.
+        path: Path, optional
+            Path object of the YAML file. The default value is ``Path(config.yaml)``.
+        """
+        data = data or {}
+        base_class_rules = []
+        base_class = data.get("base_class") or {}
+        for rule in base_class.get("rules") or []:
+            if not isinstance(rule, dict):
+                continue
+            pattern, module, class_name = (
+                rule.get(key) for key in ("pattern", "module", "class_name")
+            )
+            if pattern and module and class_name:
+                slots = rule.get("slots")
+                base_class_rules.append(
+                    BaseClassRule(
+                        pattern, module, class_name, None if slots is None else bool(slots)
+                    )
+                )
+
+        return cls(
+            path=Path(path),
+            project_name=data.get("project_name"),
+            library_name_structured=_freeze(data.get("library_name_structured") or []),
+            subfolders=_freeze(data.get("subfolders") or []),
+            new_package_name=data.get("new_package_name"),
+            image_folder_path=data.get("image_folder_path"),
+            documentation_subfolder=data.get("documentation_subfolder"),
+            rules=_freeze(data.get("rules") or {}),
+            specific_command_mapping=_freeze(data.get("specific_command_mapping") or {}),
+            ignored_commands=frozenset(data.get("ignored_commands") or []),
+            comments=_freeze(data.get("comments") or []),
+            specific_classes=_freeze(data.get("specific_classes") or {}),
+            base_class_rules=tuple(base_class_rules),
+            class_slots=bool(base_class.get("slots", False)),
+            _data=_freeze(data),
+        )
+
+    def get(self, key: str, default=None):
+        """Return a mutable copy of the value of a key of the YAML file."""
+        value = self._data.get(key, default)
+        return _thaw(value)
+
+    def get_library_parts(self, subfolder: bool = True) -> Tuple[str, ...]:
+        """Return the parts of the library path, relative to the new package path.
+
+        Parameters
+        ----------
+        subfolder: bool, optional
+            Whether to include the subfolders. The default value is ``True``.
+        """
+        parts = self.library_name_structured
+        if "src" not in parts:
+            parts = ("src",) + parts
+        if subfolder:
+            parts += self.subfolders
+        return parts
+
+    @property
+    def library_import_name(self) -> str:
+        """Name used to import the generated library, including its subfolders."""
+        parts = self.library_name_structured
+        if parts and parts[0] == "src":
+            parts = parts[1:]
+        return ".".join(parts + self.subfolders)
+
+    def get_base_class(
+        self, module_name: str, class_name: str
+    ) -> Optional[Dict[str, Union[str, bool]]]:
+        """Return the base class of a generated class.
+
+        Rules are evaluated in order and the first matching rule wins.
+        Results are memoized per module and class.
+
+        Parameters
+        ----------
+        module_name: str
+            Module name (e.g., "apdl", "prep7").
+        class_name: str
+            Class name (e.g., "Abbreviations", "Meshing").
+
+        Returns
+        -------
+        dict or None
+            Dictionary with 'module', 'class_name' and 'slots' keys if inheritance should be
+            applied, None if no pattern matches.
+        """
+        full_path = f"{module_name}/{class_name}"
+        if full_path not in self._base_class_cache:
+            base_class = None
+            for rule in self.base_class_rules:
+                if rule.match(full_path):
+                    slots = self.class_slots if rule.slots is None else rule.slots
+                    base_class = (rule.module, rule.class_name, slots)
+                    break
+            self._base_class_cache[full_path] = base_class
+
+        base_class = self._base_class_cache[full_path]
+        if base_class is None:
+            return None
+        return {"module": base_class[0], "class_name": base_class[1], "slots": base_class[2]}
+
+
+@lru_cache(maxsize=None)
+def _load_config(path: Path, mtime_ns: int) -> Config:
+    with open(path, "r", encoding="utf-8") as file:
+        data = yaml.safe_load(file)
+    return Config.from_dict(data, path)
+
+
+def load_config(config: Union[Path, str, Config]) -> Config:
+    """
+    Load a configuration file.
+
+    Each file is parsed once, and parsed again only if it has been modified.
+
+    Parameters
+    ----------
+    config: Path, str or Config
+        Path object of the configuration YAML file. If a ``Config`` object is
+        provided, it is returned as is.
+
+    Returns
+    -------
+    Config
+        Read-only configuration.
+    """
+    if isinstance(config, Config):
+        return config
+    path = Path(config).resolve()
+    if not path.is_file():
+        raise FileNotFoundError(f"File {config} not found.")
+    return _load_config(path, path.stat().st_mtime_ns)
@@ -0,0 +1,222 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Persistent cache for the MathML to LaTeX equation conversion."""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, Union
+
+EQUATION_CACHE_VERSION = 1
+DEFAULT_EQUATION_CACHE_PATH = Path.home() / ".cache" / "pyconverter-xml2py" / "equations.json"
+
+# statements removed from the raw MathML before its conversion
+MATHML_CLEANUP = {
+    "xmlns:m": "xmlns",
+    'display="block"': "",
+    "<mtext>&#8202;</mtext>\n": "",
+    "<mtext>&#8201;</mtext>\n": "",
+}
+
+# translators are expensive to create, so they are created once per process
+_TRANSLATOR = None
+_LATEX_TO_TEXT = None
+
+
+def normalize_mathml(raw: str) -> str:
+    """Normalize a raw MathML string so that equivalent equations share the same key.
+
+    Parameters
+    ----------
+    raw : str
+        Raw MathML string, as serialized from the XML documentation.
+
+    Returns
+    -------
+    str
+        Normalized MathML string.
+    """
+    for key, value in MATHML_CLEANUP.items():
+        raw = raw.replace(key, value)
+    return raw.strip()
+
+
+def equation_key(mathml: str) -> str:
+    """Return the cache key of a normalized MathML string."""
+    return hashlib.sha256(mathml.encode("utf-8")).hexdigest()
+
+
+def mathml_to_latex(mathml: str) -> str:
+    """Convert a normalized MathML string into LaTeX.
+
+    Parameters
+    ----------
+    mathml : str
+        Normalized MathML string.
+
+    Returns
+    -------
+    str
+        LaTeX equation. An empty string is returned if the conversion fails.
+    """
+    global _TRANSLATOR
+    if _TRANSLATOR is None:
+        from py_asciimath.translator.translator import MathML2Tex
+
+        _TRANSLATOR = MathML2Tex()
+    try:
+        parsed = _TRANSLATOR.translate(mathml, network=False, from_file=False)
+    except Exception as err:
+        logging.warning(f"Equation could not be converted: {err}")
+        return ""
+    return parsed.replace("\\hspace", "").strip()
+
+
+@lru_cache(maxsize=None)
+def latex_to_text(latex: str) -> str:
+    """Convert a LaTeX equation into plain text."""
+    global _LATEX_TO_TEXT
+    if _LATEX_TO_TEXT is None:
+        from pylatexenc.latex2text import LatexNodes2Text
+
+        _LATEX_TO_TEXT = LatexNodes2Text()
+    return _LATEX_TO_TEXT.latex_to_text(latex)
+
+
+class EquationCache:
+    """Provides a disk-backed cache of the converted equations.
+
+    Equations are keyed by the hash of their normalized MathML, so the
+    cache remains valid across documentation versions.
+
+    Parameters
+    ----------
+    path : Path, optional
+        Path to the JSON file storing the cache. If ``None``, the cache is
+        only kept in memory.
+    """
+
+    def __init__(self, path: Union[Path, None] = None):
+        self._path = None if path is None else Path(path)
+        self._equations = {}
+        self._failed = set()
+        self._modified = False
+        if self._path is not None and self._path.is_file():
+            self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as err:
+            logging.warning(f"Equation cache '{self._path}' could not be read: {err}")
+            return
+        if data.get("version") != EQUATION_CACHE_VERSION:
+            logging.info(f"Equation cache '{self._path}' is outdated and will be rebuilt.")
+            return
+        self._equations = data.get("equations", {})
+
+    @property
+    def path(self):
+        """Path to the JSON file storing the cache."""
+        return self._path
+
+    def __len__(self):
+        return len(self._equations)
+
+    def __contains__(self, mathml):
+        return equation_key(mathml) in self._equations
+
+    def get(self, mathml: str) -> str:
+        """Return the LaTeX equation of a normalized MathML string.
+
+        The equation is converted and stored if it is not cached yet. Failed
+        conversions return an empty string and are not stored.
+        """
+        key = equation_key(mathml)
+        if key in self._equations:
+            return self._equations[key]
+        if key in self._failed:
+            return ""
+        latex = mathml_to_latex(mathml)
+        self._store(key, latex)
+        return latex
+
+    def _store(self, key, latex):
+        # failed conversions are only skipped for this run so that they are retried later
+        if latex:
+            self._equations[key] = latex
+            self._modified = True
+        else:
+            self._failed.add(key)
+
+    def convert_all(self, mathml_list: Iterable[str], max_workers: int = 1) -> int:
+        """Convert all the equations that are missing from the cache.
+
+        Parameters
+        ----------
+        mathml_list : Iterable[str]
+            Normalized MathML strings.
+        max_workers : int, optional
+            Number of worker processes used for the conversion. The default is ``1``,
+            in which case the equations are converted in the current process.
+
+        Returns
+        -------
+        int
+            Number of equations that were converted.
+        """
+        missing = {}
+        for mathml in mathml_list:
+            key = equation_key(mathml)
+            if key not in self._equations and key not in self._failed:
+                missing[key] = mathml
+        if not missing:
+            return 0
+
+        if max_workers is None or max_workers > 1:
+            max_workers = min(max_workers or os.cpu_count() or 1, len(missing))
+            chunksize = max(1, len(missing) // (max_workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                latex = executor.map(mathml_to_latex, missing.values(), chunksize=chunksize)
+                for key, equation in zip(missing.keys(), latex):
+                    self._store(key, equation)
+        else:
+            for key, mathml in missing.items():
+                self._store(key, mathml_to_latex(mathml))
+
+        return len(missing)
+
+    def save(self) -> None:
+        """Write the cache to its JSON file if it has been modified."""
+        if self._path is None or not self._modified:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": EQUATION_CACHE_VERSION, "equations": self._equations}
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        tmp_path.write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self._path)
+        self._modified = False
@@ -23,22 +23,138 @@
 """This module contains the functions to format the generated docstrings with
 `Black <black_>`_."""
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
 from pathlib import Path
 
 # Subprocess is needed to run pre-commit hooks.
 # Excluding bandit check.
 import subprocess  # nosec B404
+from typing import Union
 
+import black
+import yaml
 
-def run_pre_commit(package_path) -> None:
-    """Run `pre-commit <pre-commit_>`_ on the autogenerated package."""
+DEFAULT_LINE_LENGTH = 88
+
+
+def get_black_line_length(pre_commit_file: Path) -> int:
+    """
+    Get the line length used by the Black hook of a pre-commit configuration file.
+
+    Parameters
+    ----------
+    pre_commit_file: Path
+        Path object of the ``.pre-commit-config.yaml`` file.
+
+    Returns
+    -------
+    int
+        Line length. The default value of ``88`` is returned if the file or
+        the argument does not exist.
+    """
+    if not pre_commit_file.is_file():
+        return DEFAULT_LINE_LENGTH
+    with open(pre_commit_file, "r", encoding="utf-8") as file:
+        pre_commit_config = yaml.safe_load(file) or {}
+    for repo in pre_commit_config.get("repos", []):
+        for hook in repo.get("hooks", []):
+            if hook.get("id") != "black":
+                continue
+            for arg in hook.get("args", []):
+                if str(arg).startswith("--line-length="):
+                    return int(str(arg).split("=", 1)[1])
+    return DEFAULT_LINE_LENGTH
+
+
+def format_source(source: str, line_length: int = DEFAULT_LINE_LENGTH) -> str:
+    """
+    Format Python source code with `Black <black_>`_.
+
+    Parameters
+    ----------
+    source: str
+        Python source code.
+    line_length: int, optional
+        Maximum line length. The default value is ``88``.
+
+    Returns
+    -------
+    str
+        Formatted source code.
+    """
+    return black.format_str(source, mode=black.Mode(line_length=line_length))
+
+
+def format_sources(
+    sources: dict, line_length: int = DEFAULT_LINE_LENGTH, max_workers: int = 1
+) -> dict:
+    """
+    Format in-memory Python sources with `Black <black_>`_.
+
+    Parameters
+    ----------
+    sources: dict
+        Dictionary with the following format: ``{file_path: source}``.
+    line_length: int, optional
+        Maximum line length. The default value is ``88``.
+    max_workers: int, optional
+        Number of worker processes. If ``None``, all the available CPUs are used.
+        The default value is ``1``.
+
+    Returns
+    -------
+    dict
+        Dictionary with the following format: ``{file_path: formatted_source}``.
+    """
+    file_paths = list(sources.keys())
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(file_paths))
+    formatter = partial(format_source, line_length=line_length)
+    try:
+        if max_workers <= 1:
+            return {path: formatter(source) for path, source in sources.items()}
+        chunksize = max(1, len(file_paths) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            formatted = executor.map(formatter, list(sources.values()), chunksize=chunksize)
+            return dict(zip(file_paths, formatted))
+    except black.InvalidInput as err:
+        raise RuntimeError(f"Failed to format the generated source files: {err}") from err
+
+
+def run_pre_commit(package_path, files: Union[list, None] = None, max_runs: int = 10) -> None:
+    """Run `pre-commit <pre-commit_>`_ on the autogenerated package.
+
+    Parameters
+    ----------
+    package_path: Path
+        Path object of the autogenerated package, where the hooks are run.
+    files: list, optional
+        Files to check. If ``None``, all the files are checked.
+        The default value is ``None``.
+    max_runs: int, optional
+        Maximum number of runs. A run fails whenever a hook modifies a file, for
+        example when isort reorders imports that Black then reformats, so the hooks
+        are rerun until they pass. The default value is ``10``.
+    """
     output = 1
     cur_run = 0
-    max_run = 10
+    package_path = Path(package_path).resolve()
     pre_commit_file = package_path / Path(".pre-commit-config.yaml")
     if not pre_commit_file.exists():
         raise FileNotFoundError(f"Pre-commit configuration file not found at {pre_commit_file}.")
-    while cur_run < max_run and output != 0:
+    if files is None:
+        file_args = ["--all-files"]
+    elif len(files) == 0:
+        print("No changed files to run pre-commit on.")
+        return
+    else:
+        file_args = ["--files"] + [
+            os.path.relpath(Path(file).resolve(), package_path) for file in files
+        ]
+    while cur_run < max_runs and output != 0:
         cur_run += 1
         # pre_commit_file is controlled by the library.
         # Excluding bandit check.
@@ -46,11 +162,12 @@ def run_pre_commit(package_path) -> None:
             [
                 "pre-commit",
                 "run",
-                "--all-files",
+                *file_args,
                 "--config",
                 str(pre_commit_file),
             ],
             capture_output=True,
+            cwd=package_path,
         ).returncode  # nosec B603 B607
     if output != 0:
         raise RuntimeError("Pre-commit failed.")
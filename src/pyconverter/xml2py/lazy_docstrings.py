@@ -0,0 +1,156 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Docstrings loaded from a compressed resource on first access.
+
+This module only depends on the standard library, as it is copied into the
+generated packages built with compressed docstrings.
+"""
+
+import functools
+import importlib.resources
+import inspect
+import json
+import zlib
+
+DOCSTRINGS_SUFFIX = ".docstrings.z"
+"""Suffix of the compressed docstring resource of a module."""
+
+
+def get_docstrings_resource_name(module_file_name: str) -> str:
+    """Return the name of the compressed docstring resource of a module file."""
+    return module_file_name.rsplit(".", 1)[0] + DOCSTRINGS_SUFFIX
+
+
+def pack_docstrings(docstrings: dict) -> bytes:
+    """
+    Pack docstrings into a compressed resource.
+
+    Each docstring is compressed separately, so that only the requested ones are
+    decompressed. The resource starts with a JSON index of the offset and length of
+    each compressed docstring, followed by a new line.
+
+    Parameters
+    ----------
+    docstrings: dict
+        Dictionary with the following format: ``{"qualified_name": "docstring"}``.
+
+    Returns
+    -------
+    bytes
+        Content of the resource.
+    """
+    index = {}
+    chunks = []
+    offset = 0
+    for name in sorted(docstrings):
+        chunk = zlib.compress(docstrings[name].encode("utf-8"), 9)
+        index[name] = [offset, len(chunk)]
+        chunks.append(chunk)
+        offset += len(chunk)
+    header = json.dumps(index, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return b"\n".join([header, b"".join(chunks)])
+
+
+def read_index(content: bytes) -> tuple:
+    """
+    Read the index of a compressed resource.
+
+    Parameters
+    ----------
+    content: bytes
+        Content of the resource.
+
+    Returns
+    -------
+    tuple
+        Dictionary with the following format: ``{"qualified_name": [offset, length]}``
+        and position of the first compressed docstring.
+    """
+    header_end = content.index(b"\n")
+    return json.loads(content[:header_end]), header_end + 1
+
+
+def unpack_docstring(content: bytes, index: dict, start: int, name: str):
+    """
+    Return a docstring from a compressed resource, or ``None`` if it is missing.
+
+    Parameters
+    ----------
+    content: bytes
+        Content of the resource.
+    index: dict
+        Index of the resource.
+    start: int
+        Position of the first compressed docstring.
+    name: str
+        Qualified name of the function.
+    """
+    if name not in index:
+        return None
+    offset, length = index[name]
+    return zlib.decompress(content[start + offset : start + offset + length]).decode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_resource(module_name: str) -> tuple:
+    package, _, name = module_name.rpartition(".")
+    resource = importlib.resources.files(package).joinpath(
+        get_docstrings_resource_name(f"{name}.py")
+    )
+    try:
+        content = resource.read_bytes()
+    except OSError:
+        return b"", {}, 0
+    return (content,) + read_index(content)
+
+
+class LazyDocstring:
+    """
+    Method descriptor setting the docstring of a function on first access.
+
+    The descriptor then replaces itself with the function in its class, so that the
+    following accesses do not go through it.
+    """
+
+    __slots__ = ("function", "owner")
+
+    def __init__(self, function, owner):
+        self.function = function
+        self.owner = owner
+
+    def __get__(self, instance, owner=None):
+        function = self.function
+        docstring = unpack_docstring(*_load_resource(function.__module__), function.__qualname__)
+        if docstring is not None:
+            function.__doc__ = docstring
+        setattr(self.owner, function.__name__, function)
+        return function.__get__(instance, owner)
+
+
+def lazy_docstrings(cls):
+    """Class decorator loading the docstrings of the methods on first access."""
+    for name, value in list(vars(cls).items()):
+        if inspect.isfunction(value):
+            setattr(cls, name, LazyDocstring(value, cls))
+    return cls
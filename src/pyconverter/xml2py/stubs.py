@@ -0,0 +1,394 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Transformations of the generated class sources: docstrings, stubs and command tables."""
+
+import ast
+from typing import List, Tuple, Union
+
+STUB_BODY = "..."
+
+
+def _get_functions(body: list) -> list:
+    """Return the functions defined at module level or in classes."""
+    functions = []
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node)
+        elif isinstance(node, ast.ClassDef):
+            functions.extend(_get_functions(node.body))
+    return functions
+
+
+def _get_docstring_node(function: ast.AST) -> ast.Expr:
+    first = function.body[0]
+    if (
+        isinstance(first, ast.Expr)
+        and isinstance(first.value, ast.Constant)
+        and isinstance(first.value.value, str)
+    ):
+        return first
+    return None
+
+
+def _replace(lines: List[str], edits: List[Tuple[int, int, int, int, str]]) -> str:
+    # Edits are applied from the end so that the positions of the previous ones are kept.
+    # Insertions at the same position end up in the order of the edits.
+    # The column offsets of the AST nodes are UTF-8 byte offsets.
+    for lineno, col_offset, end_lineno, end_col_offset, text in sorted(
+        edits, key=lambda edit: edit[:4], reverse=True
+    ):
+        before = lines[lineno - 1].encode("utf-8")[:col_offset].decode("utf-8")
+        after = lines[end_lineno - 1].encode("utf-8")[end_col_offset:].decode("utf-8")
+        lines[lineno - 1 : end_lineno] = [before + text + after]
+    return "".join(lines)
+
+
+def _get_summary(segment: str) -> str:
+    """Return the first line of a docstring, keeping its string prefix and quotes."""
+    quote_index = min(index for index in (segment.find('"""'), segment.find("'''")) if index != -1)
+    opening = segment[: quote_index + 3]
+    for line in segment[quote_index + 3 :].splitlines():
+        summary = line.strip().rstrip(opening[-3:]).rstrip()
+        if summary:
+            break
+    else:
+        summary = ""
+    # The closing quotes must not be escaped or merged with the summary
+    if summary.endswith(("\\", opening[-1])):
+        summary += " "
+    return f"{opening}{summary}{opening[-3:]}"
+
+
+def _get_docstring_edit(source: str, function: ast.AST) -> Union[tuple, None]:
+    """Return the edit replacing the docstring of a function with its first line."""
+    docstring = _get_docstring_node(function)
+    if docstring is None:
+        return None
+    segment = ast.get_source_segment(source, docstring)
+    if '"""' not in segment and "'''" not in segment:
+        return None
+    return (
+        docstring.lineno,
+        docstring.col_offset,
+        docstring.end_lineno,
+        docstring.end_col_offset,
+        _get_summary(segment),
+    )
+
+
+def shorten_docstrings(source: str) -> str:
+    """
+    Replace the docstrings of the functions of a source with their first line.
+
+    Parameters
+    ----------
+    source: str
+        Python source code.
+
+    Returns
+    -------
+    str
+        Python source code with one-line docstrings.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    edits = []
+    for function in _get_functions(tree.body):
+        edit = _get_docstring_edit(source, function)
+        if edit is not None:
+            edits.append(edit)
+    return _replace(lines, edits)
+
+
+def extract_docstrings(source: str, decorator_import: str) -> Tuple[str, dict]:
+    """
+    Extract the docstrings of the methods of the classes of a source.
+
+    The docstrings are replaced with their first line and the classes are decorated
+    with ``lazy_docstrings``, which loads the full docstrings on first access.
+
+    Parameters
+    ----------
+    source: str
+        Python source code.
+    decorator_import: str
+        Statement importing the ``lazy_docstrings`` decorator.
+
+    Returns
+    -------
+    str
+        Python source code with one-line docstrings.
+    dict
+        Dictionary with the following format: ``{"Class.method": "docstring"}``.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    edits = []
+    docstrings = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        class_docstrings = {}
+        for function in node.body:
+            if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            edit = _get_docstring_edit(source, function)
+            if edit is not None:
+                edits.append(edit)
+                docstring = _get_docstring_node(function).value.value
+                class_docstrings[f"{node.name}.{function.name}"] = docstring
+        if class_docstrings:
+            docstrings.update(class_docstrings)
+            first = node.decorator_list[0] if node.decorator_list else node
+            edits.append((first.lineno, 0, first.lineno, 0, "@lazy_docstrings\n"))
+
+    if not docstrings:
+        return source, docstrings
+    decorator_edits = [edit for edit in edits if edit[4] == "@lazy_docstrings\n"]
+
+    # The decorator is imported after the imports preceding the first class
+    imports = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            break
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports.append(node)
+    if imports:
+        end_lineno = imports[-1].end_lineno
+        end_col_offset = len(lines[end_lineno - 1].rstrip("\r\n").encode("utf-8"))
+        edits.append(
+            (end_lineno, end_col_offset, end_lineno, end_col_offset, f"\n{decorator_import}")
+        )
+    else:
+        # The decorator is imported right before the first decorated class
+        first_edit = decorator_edits[0]
+        edits.remove(first_edit)
+        edits.append(first_edit[:4] + (f"{decorator_import}\n\n\n{first_edit[4]}",))
+    return _replace(lines, edits), docstrings
+
+
+def get_stub_source(source: str) -> str:
+    """
+    Get the stub of a source, in which the body of the functions is replaced with ``...``.
+
+    The imports, classes, signatures and docstrings are kept.
+
+    Parameters
+    ----------
+    source: str
+        Python source code.
+
+    Returns
+    -------
+    str
+        Content of the ``.pyi`` stub file.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    edits = []
+    for function in _get_functions(tree.body):
+        body = function.body
+        if _get_docstring_node(function) is not None:
+            body = body[1:]
+        if not body:
+            continue
+        end = body[-1]
+        edits.append(
+            (
+                body[0].lineno,
+                body[0].col_offset,
+                end.end_lineno,
+                len(lines[end.end_lineno - 1].rstrip("\r\n").encode("utf-8")),
+                STUB_BODY,
+            )
+        )
+    return _replace(lines, edits)
+
+
+def _get_command_fields(command: ast.expr, names: set) -> Union[Tuple[str, tuple], None]:
+    """Return the name and fields of a command string, or ``None`` if it has literal fields."""
+    if isinstance(command, ast.Constant) and isinstance(command.value, str):
+        parts = [command.value]
+    elif isinstance(command, ast.JoinedStr):
+        parts = []
+        for value in command.values:
+            if isinstance(value, ast.Constant):
+                parts.append(value.value)
+            elif (
+                isinstance(value, ast.FormattedValue)
+                and value.conversion == -1
+                and value.format_spec is None
+                and isinstance(value.value, ast.Name)
+                and value.value.id in names
+            ):
+                # Names cannot contain commas, so they can be used as placeholders
+                parts.append(f"{{{value.value.id}}}")
+            else:
+                return None
+    else:
+        return None
+    name, *fields = "".join(parts).split(",")
+    if "{" in name:
+        return None
+    for index, field in enumerate(fields):
+        if field and not (field[0] == "{" and field[-1] == "}" and field[1:-1] in names):
+            return None
+        fields[index] = field[1:-1]
+    return name, tuple(fields)
+
+
+def _get_command_entry(source: str, function: ast.AST) -> Union[str, None]:
+    """Return the command table entry of a method running a formatted command."""
+    docstring = _get_docstring_node(function)
+    body = function.body[1:] if docstring is not None else function.body
+    arguments = function.args
+    if (
+        function.decorator_list
+        or function.returns is not None
+        or isinstance(function, ast.AsyncFunctionDef)
+        or len(body) != 2
+        or arguments.posonlyargs
+        or arguments.vararg
+        or arguments.kwonlyargs
+        or arguments.kwarg is None
+        or arguments.kwarg.arg != "kwargs"
+        or not arguments.args
+        or arguments.args[0].arg != "self"
+        or len(arguments.defaults) != len(arguments.args) - 1
+        or not all(isinstance(default, ast.Constant) for default in arguments.defaults)
+    ):
+        return None
+    assign, run = body
+    if not (
+        isinstance(assign, ast.Assign)
+        and len(assign.targets) == 1
+        and isinstance(assign.targets[0], ast.Name)
+        and assign.targets[0].id == "command"
+        and ast.get_source_segment(source, run) == "return self.run(command, **kwargs)"
+    ):
+        return None
+
+    names = {argument.arg for argument in arguments.args[1:]}
+    command = _get_command_fields(assign.value, names)
+    if command is None:
+        return None
+    name, fields = command
+    parameters = []
+    for argument, default in zip(arguments.args[1:], arguments.defaults):
+        # The annotations are evaluated with the table, like in the method signatures
+        annotation = "None"
+        if argument.annotation is not None:
+            annotation = ast.get_source_segment(source, argument.annotation)
+        parameters.append(
+            _tuple_literal([to_literal(argument.arg), annotation, to_literal(default.value)])
+        )
+    docstring_segment = "None"
+    if docstring is not None:
+        docstring_segment = ast.get_source_segment(source, docstring)
+    items = [
+        to_literal(function.name),
+        to_literal(name),
+        _tuple_literal([to_literal(field) for field in fields]),
+        _tuple_literal(parameters),
+        docstring_segment,
+    ]
+    return "    (\n" + "".join(f"        {item},\n" for item in items) + "    ),\n"
+
+
+def to_literal(value) -> str:
+    """Return a Python literal, with double-quoted strings."""
+    if isinstance(value, tuple):
+        return _tuple_literal([to_literal(item) for item in value])
+    if isinstance(value, str) and '"' not in value and "\\" not in value and value.isprintable():
+        return f'"{value}"'
+    return repr(value)
+
+
+def _tuple_literal(items: list) -> str:
+    if len(items) == 1:
+        return f"({items[0]},)"
+    return f"({', '.join(items)})"
+
+
+def tabulate_commands(source: str, decorator_import: str) -> str:
+    """
+    Replace the methods running a formatted command with a command table.
+
+    The methods are built from the table when the class is created by the
+    ``command_table`` decorator, which shares a single formatting function.
+    Other methods, such as the customized ones, are kept.
+
+    Parameters
+    ----------
+    source: str
+        Python source code.
+    decorator_import: str
+        Statement importing the ``command_table`` decorator.
+
+    Returns
+    -------
+    str
+        Python source code with command tables.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    edits = []
+    tables = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        entries = []
+        removed = []
+        for function in node.body:
+            if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            entry = _get_command_entry(source, function)
+            if entry is not None:
+                entries.append(entry)
+                removed.append(function)
+        if not entries:
+            continue
+
+        table_name = f"_{node.name.upper()}_COMMANDS"
+        tables.append(f"{table_name} = (\n{''.join(entries)})\n\n\n")
+        for function in removed:
+            # The blank lines following the method are removed with it
+            end_lineno = function.end_lineno
+            while end_lineno < len(lines) and not lines[end_lineno].strip():
+                end_lineno += 1
+            edits.append((function.lineno, 0, end_lineno, len(lines[end_lineno - 1]), ""))
+        if len(removed) == len(node.body):
+            indent = " " * removed[0].col_offset
+            edits[-1] = edits[-1][:4] + (f"{indent}pass\n",)
+        # The table decorator is applied first, so that other decorators see the methods
+        edits.append((node.lineno, 0, node.lineno, 0, f"@command_table({table_name})\n"))
+
+    if not tables:
+        return source
+
+    # The tables and the decorator import are inserted before the first class
+    first_class = next(node for node in tree.body if isinstance(node, ast.ClassDef))
+    first = first_class.decorator_list[0] if first_class.decorator_list else first_class
+    header = f"{decorator_import}\n\n{''.join(tables)}"
+    edits.append((first.lineno, 0, first.lineno, 0, header))
+    return _replace(lines, edits)
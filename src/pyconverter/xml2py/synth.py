@@ -0,0 +1,296 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""This module contains the functions generating synthetic XML documentation.
+
+The synthetic corpus follows the directory format of :func:`get_paths`, so that the
+conversion can be tested and benchmarked without the actual documentation.
+"""
+
+from pathlib import Path
+import random
+from typing import Union
+
+#: Default proportions of the commands containing each kind of content
+DEFAULT_PROPORTIONS = {
+    "arguments": 0.9,
+    "tables": 0.2,
+    "lists": 0.5,
+    "links": 0.3,
+    "entities": 0.5,
+    "graphics": 0.1,
+}
+
+_MODULES = ("APDL", "PREP7", "SOLUTION", "POST1", "POST26", "DISPLAY", "SESSION", "DATABASE")
+_CLASSES = (
+    "Keypoints",
+    "Meshing",
+    "Results",
+    "Controls",
+    "Loads",
+    "Materials",
+    "Elements",
+    "Nodes",
+    "Parameters",
+    "Abbreviations",
+)
+_WORDS = (
+    "node",
+    "element",
+    "keypoint",
+    "load",
+    "value",
+    "option",
+    "label",
+    "step",
+    "component",
+    "table",
+    "increment",
+    "coordinate",
+)
+_LINK_TARGETS = (("ds_Support_Types", "Support Type Boundary Conditions"), ("ds_Loads", "Loads"))
+
+# Global terms, the special characters with their Unicode name, and the documents
+_TERMS = {"me": "Ansys Mechanical", "pn006p": "Mechanical APDL"}
+_CHARACTERS = {"alpha": "GREEK SMALL LETTER ALPHA", "deg": "DEGREE SIGN"}
+
+
+def _mnemonic(index: int) -> str:
+    letters = ""
+    index += 26 * 27  # At least three letters
+    while index:
+        index, remainder = divmod(index, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def _sentence(rng: random.Random, words: int = 8) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _get_group(index: int) -> tuple:
+    module = _MODULES[index % len(_MODULES)]
+    class_name = _CLASSES[(index // len(_MODULES)) % len(_CLASSES)]
+    cycle = index // (len(_MODULES) * len(_CLASSES))
+    if cycle:
+        class_name = f"{class_name} {cycle}"
+    return module, class_name, f"grp{index}"
+
+
+def _get_arguments(rng: random.Random, name: str, names: list, count: int) -> str:
+    entries = []
+    for position in range(1, count + 1):
+        values = "".join(
+            f"<varlistentry><term>{value}</term><listitem><para>{_sentence(rng, 4)}"
+            "</para></listitem></varlistentry>"
+            for value in range(rng.randint(0, 3))
+        )
+        values = f"<variablelist>{values}</variablelist>" if values else ""
+        other = rng.choice(names)
+        entries.append(
+            f"<varlistentry><term><replaceable>ARG{position}</replaceable></term>"
+            f"<listitem><para>Argument {position} of <command>{name}</command>. "
+            f"{_sentence(rng)} See <command>{other}</command>.</para>{values}"
+            "</listitem></varlistentry>"
+        )
+    return (
+        "<refsynopsisdiv><title>Argument Descriptions</title>"
+        f"<variablelist>{''.join(entries)}</variablelist></refsynopsisdiv>"
+    )
+
+
+def _get_table(rng: random.Random) -> str:
+    rows = "".join(
+        f"<row><entry><literal>{rng.choice(_WORDS).upper()}</literal></entry>"
+        f"<entry>{_sentence(rng, 5)}</entry></row>"
+        for _ in range(rng.randint(2, 6))
+    )
+    return (
+        '<informaltable><tgroup cols="2"><colspec colname="c1"/><colspec colname="c2"/>'
+        "<thead><row><entry>Label</entry><entry>Description</entry></row></thead>"
+        f"<tbody>{rows}</tbody></tgroup></informaltable>"
+    )
+
+
+def get_command_xml(
+    rng: random.Random, index: int, name: str, group: tuple, names: list, proportions: dict
+) -> str:
+    """
+    Get the XML reference entry of a synthetic command.
+
+    Parameters
+    ----------
+    rng: random.Random
+        Random number generator.
+    index: int
+        Index of the command, used in its identifiers.
+    name: str
+        Name of the command.
+    group: tuple
+        Module, class and group entity names of the command.
+    names: list
+        Names of all the commands, which are referenced by the command.
+    proportions: dict
+        Proportions of the commands containing each kind of content.
+        See ``DEFAULT_PROPORTIONS``.
+
+    Returns
+    -------
+    str
+        Content of the XML file.
+    """
+    count = rng.randint(1, 12) if rng.random() < proportions["arguments"] else 0
+    arguments = "".join(
+        f", <replaceable>ARG{position}</replaceable>" for position in range(1, count + 1)
+    )
+    synopsis = _get_arguments(rng, name, names, count) if count else ""
+
+    notes = [f"<para>{_sentence(rng, 12)} Use <literal>{name}</literal> with care.</para>"]
+    if rng.random() < proportions["entities"]:
+        term = rng.choice(sorted(_TERMS))
+        character = rng.choice(sorted(_CHARACTERS))
+        notes.append(f"<para>Available in &{term};, with an angle in &{character};.</para>")
+    if rng.random() < proportions["lists"]:
+        items = "".join(
+            f"<listitem><para>{_sentence(rng, 6)}</para></listitem>"
+            for _ in range(rng.randint(2, 5))
+        )
+        notes.append(f"<itemizedlist>{items}</itemizedlist>")
+    if rng.random() < proportions["tables"]:
+        notes.append(_get_table(rng))
+    if rng.random() < proportions["links"]:
+        target, title = rng.choice(_LINK_TARGETS)
+        notes.append(f'<para>See <link linkend="{target}">{title}</link>.</para>')
+    if rng.random() < proportions["graphics"]:
+        notes.append(f'<para><graphic entityref="gcmd{index % 10}"/></para>')
+
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<reference><refentry id="Hlp_C_{index}"><refmeta filename="Hlp_C_{index}.html">
+<refentrytitle>{name}</refentrytitle></refmeta>
+<refnamediv><refname>{name}{arguments}</refname><refpurpose>{_sentence(rng, 6)}</refpurpose>
+<refclass>&{group[2]};</refclass></refnamediv>
+{synopsis}
+<refsect1 id="Hlp_C_{index}_notes"><title>Notes</title>{''.join(notes)}</refsect1>
+<refsect1><title>Menu Paths</title><para><guimenu>Main Menu</guimenu>&gt;
+<guimenuitem>{group[0]}</guimenuitem></para><indexterm><primary>{name}</primary></indexterm>
+</refsect1></refentry></reference>
+"""
+
+
+def write_corpus(
+    path: Path,
+    commands: int = 1000,
+    proportions: Union[dict, None] = None,
+    commands_per_group: int = 50,
+    seed: int = 0,
+) -> Path:
+    """
+    Write a synthetic XML documentation of commands.
+
+    The corpus follows the directory format of :func:`get_paths`, with the ``xml``,
+    ``links``, ``terms`` and ``graphics`` directories. The same seed always gives
+    the same corpus.
+
+    Parameters
+    ----------
+    path: Path
+        Path object of the directory to write the corpus to.
+    commands: int, optional
+        Number of commands. The default value is ``1000``.
+    proportions: dict, optional
+        Proportions of the commands containing each kind of content. Missing kinds
+        use the values of ``DEFAULT_PROPORTIONS``. The default value is ``None``.
+    commands_per_group: int, optional
+        Average number of commands of each generated class. The default value is ``50``.
+    seed: int, optional
+        Seed of the random number generator. The default value is ``0``.
+
+    Returns
+    -------
+    Path
+        Path object of the corpus directory.
+    """
+    unknown = set(proportions or {}) - set(DEFAULT_PROPORTIONS)
+    if unknown:
+        raise ValueError(
+            f"Invalid proportions {', '.join(sorted(unknown))}. "
+            f"Options are {', '.join(DEFAULT_PROPORTIONS)}."
+        )
+    proportions = {**DEFAULT_PROPORTIONS, **(proportions or {})}
+    rng = random.Random(seed)
+    path = Path(path)
+    command_path = path / "xml" / "cmds"
+    for directory in (command_path, path / "links", path / "terms" / "glb", path / "terms" / "ent"):
+        directory.mkdir(parents=True, exist_ok=True)
+    (path / "graphics").mkdir(exist_ok=True)
+
+    glb_path = path / "terms" / "glb"
+    (glb_path / "build_variables.ent").write_text(
+        "<!ENTITY ansys_internal_version '25.2'>\n", encoding="utf-8"
+    )
+    (glb_path / "terms_global.ent").write_text(
+        "".join(f"<!ENTITY {term} '{text}'>\n" for term, text in _TERMS.items()),
+        encoding="utf-8",
+    )
+    (glb_path / "docu_global.ent").write_text(
+        '<!ENTITY simguide \'<olink targetdoc="wb_sim" targetptr="wb_sim">'
+        "<citetitle>&me; User's Guide</citetitle></olink>'>\n",
+        encoding="utf-8",
+    )
+    (glb_path / "manuals.ent").write_text("", encoding="utf-8")
+    (path / "terms" / "ent" / "isotech.ent").write_text(
+        "".join(
+            f'<!ENTITY {character} "&#x0000;"> <!-- {unicode_name} -->\n'
+            for character, unicode_name in _CHARACTERS.items()
+        ),
+        encoding="utf-8",
+    )
+    sections = "".join(
+        f'<div element="sect1" href="{target}.html" targetptr="{target}"><ttl>{title}</ttl></div>'
+        for target, title in _LINK_TARGETS
+    )
+    (path / "links" / "wb_sim.db").write_text(
+        '<div element="book" href="index.html" targetptr="wb_sim">'
+        f"<ttl>Mechanical User's Guide</ttl>{sections}</div>",
+        encoding="utf-8",
+    )
+    for index in range(10):
+        (path / "graphics" / f"gcmd{index}.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+
+    groups = [_get_group(index) for index in range(max(1, commands // commands_per_group))]
+    (path / "xml" / "ansys.groupcodes.commands.ent").write_text(
+        "".join(
+            f'<!ENTITY {entity} "<classname>{module}</classname>:<type>{class_name}</type>">\n'
+            for module, class_name, entity in groups
+        ),
+        encoding="utf-8",
+    )
+
+    names = []
+    for index in range(commands):
+        prefix = rng.choices(("", "*", "/"), weights=(8, 1, 1))[0]
+        names.append(f"{prefix}{_mnemonic(index)}")
+    for index, name in enumerate(names):
+        group = groups[rng.randrange(len(groups))]
+        content = get_command_xml(rng, index, name, group, names, proportions)
+        (command_path / f"cmd{index}.xml").write_text(content, encoding="utf-8")
+    return path
@@ -20,12 +20,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import fnmatch
 import logging
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from lxml.html import fromstring
+from pyconverter.xml2py.config import Config, load_config
 import yaml
 
 logger = logging.getLogger("py_asciimath.utils")
@@ -54,29 +54,32 @@ def parse_yaml(yaml_path: Path) -> dict:
         raise FileNotFoundError(f"File {yaml_path} not found.")
 
 
-def get_config_data_value(yaml_path: Path, value: str) -> Union[str, dict, list, None]:
+def get_config_data_value(
+    yaml_path: Union[Path, Config], value: str
+) -> Union[str, dict, list, None]:
     """
     Return the value of a specific key in the YAML file.
 
+    The YAML file is only parsed once. The returned value is a copy that can be modified.
+
     Parameters
     ----------
-    yaml_path: Path
-        Path object of the YAML file.
+    yaml_path: Path or Config
+        Path object of the YAML file or loaded configuration.
     value: str
         Key to search for in the YAML file.
     """
-    config_data = parse_yaml(yaml_path)
-    return config_data.get(value)
+    return load_config(yaml_path).get(value)
 
 
-def get_base_class_config(config_path: Path) -> dict:
+def get_base_class_config(config_path: Union[Path, Config]) -> dict:
     """
     Get base class configuration from config file.
 
     Parameters
     ----------
-    config_path: Path
-        Path object of the configuration YAML file.
+    config_path: Path or Config
+        Path object of the configuration YAML file or loaded configuration.
 
     Returns
     -------
@@ -90,7 +93,7 @@ def get_base_class_config(config_path: Path) -> dict:
 
 
 def get_base_class_for_pattern(
-    config_path: Path, module_name: str, class_name: str
+    config_path: Union[Path, Config], module_name: str, class_name: str
 ) -> Optional[Dict[str, str]]:
     """
     Determine if a class should inherit based on pattern matching.
@@ -100,8 +103,8 @@ def get_base_class_for_pattern(
 
     Parameters
     ----------
-    config_path: Path
-        Path object of the configuration YAML file.
+    config_path: Path or Config
+        Path object of the configuration YAML file or loaded configuration.
     module_name: str
         Module name (e.g., "apdl", "prep7").
     class_name: str
@@ -120,42 +123,16 @@ def get_base_class_for_pattern(
     >>> get_base_class_for_pattern(config_path, "database", "Save")
     None
     """
-    base_class_config = get_base_class_config(config_path)
-
-    # If no base_class config or no rules, return None
-    if not base_class_config or "rules" not in base_class_config:
+    base_class = load_config(config_path).get_base_class(module_name, class_name)
+    if base_class is None:
         return None
-
-    rules = base_class_config.get("rules", [])
-    if not rules:
-        return None
-
-    # Construct the full path for matching: "module_name/class_name"
-    full_path = f"{module_name}/{class_name}"
-
-    # Iterate through rules and find first match
-    for rule in rules:
-        if not isinstance(rule, dict):
-            continue
-
-        pattern = rule.get("pattern")
-        if not pattern:
-            continue
-
-        # Use fnmatch for wildcard pattern matching
-        if fnmatch.fnmatch(full_path, pattern):
-            # Found a match, return the base class info
-            base_module = rule.get("module")
-            base_class_name = rule.get("class_name")
-
-            if base_module and base_class_name:
-                return {"module": base_module, "class_name": base_class_name}
-
-    # No matching pattern found
-    return None
+    # The ``slots`` value is only used internally by the writer
+    return {"module": base_class["module"], "class_name": base_class["class_name"]}
 
 
-def get_library_path(new_package_path: Path, config_path: Path, subfolder: bool = True) -> Path:
+def get_library_path(
+    new_package_path: Path, config_path: Union[Path, Config], subfolder: bool = True
+) -> Path:
     """
     Get the desired library path with the following format:
     ``new_package_path/library_structure``.
@@ -168,33 +145,29 @@ def get_library_path(new_package_path: Path, config_path: Path, subfolder: bool
     ----------
     new_package_path: Path
         Path object of the new package directory.
-    config_path: str
-        Path to the configuration file.
+    config_path: Path or Config
+        Path object of the configuration file or loaded configuration.
+    subfolder: bool, optional
+        Whether to include the subfolders. The default value is ``True``.
 
     Returns
     -------
     Path
         Path object of the new library structure.
     """
-    library_name = get_config_data_value(config_path, "library_name_structured")
-    if not "src" in library_name:
-        library_name.insert(0, "src")
-    if subfolder:
-        subfolder_values = get_config_data_value(config_path, "subfolders")
-        if subfolder_values:
-            library_name.extend(subfolder_values)
+    library_name = load_config(config_path).get_library_parts(subfolder)
     return new_package_path.joinpath(*library_name)
 
 
-def get_comment_command_dict(yaml_path: Path) -> dict:
+def get_comment_command_dict(yaml_path: Union[Path, Config]) -> dict:
     """
     Get a dictionnary of messages to be added as warning, note, or info at the beginning of
     a command documentation.
 
     Parameters
     ----------
-    yaml_path: Path
-        Path object of the YAML file.
+    yaml_path: Path or Config
+        Path object of the YAML file or loaded configuration.
 
     Returns
     -------
@@ -202,8 +175,8 @@ def get_comment_command_dict(yaml_path: Path) -> dict:
         Dictionary of comment to be added with the following format:
         ``{"command": [["message_type", "message"]}``.
     """
-    comments_ = get_config_data_value(yaml_path, "comments")
-    if comments_ is None:
+    comments_ = load_config(yaml_path).comments
+    if not comments_:
         logger.info("No comments to be added found in the YAML file.")
     comment_command_dict = {}
     if comments_:
@@ -227,7 +200,7 @@ def get_comment_command_dict(yaml_path: Path) -> dict:
     return comment_command_dict
 
 
-def create_name_map(meta_command: list[str], yaml_file_path: Path) -> dict:
+def create_name_map(meta_command: list[str], yaml_file_path: Union[Path, Config]) -> dict:
     """
     Create a mapping between the initial command name and the Python function name.
 
@@ -235,8 +208,8 @@ def create_name_map(meta_command: list[str], yaml_file_path: Path) -> dict:
     ----------
     meta_command: list[str]
         List of command names.
-    yaml_file_path: Path
-        Path object of the YAML file.
+    yaml_file_path: Path or Config
+        Path object of the YAML file or loaded configuration.
 
     Returns
     -------
@@ -245,9 +218,10 @@ def create_name_map(meta_command: list[str], yaml_file_path: Path) -> dict:
     """
     # convert all to flat and determine number of occurances
     naive_names = []
-    rules = get_config_data_value(yaml_file_path, "rules")
-    specific_command_mapping = get_config_data_value(yaml_file_path, "specific_command_mapping")
-    ignored_commands = get_config_data_value(yaml_file_path, "ignored_commands")
+    config = load_config(yaml_file_path)
+    rules = config.rules
+    specific_command_mapping = config.specific_command_mapping
+    ignored_commands = config.ignored_commands
     for ans_name in meta_command:
         ans_name = ans_name.lower()
         if not ans_name[0].isalnum():
@@ -305,6 +279,10 @@ def import_handler(
     """
     Handle the imports in the Python file.
 
+    The generated class files are assembled in memory with
+    :func:`split_method_imports`. This function is kept to append a method to
+    an existing Python file.
+
     Parameters
     ----------
     filename: Path
@@ -332,6 +310,31 @@ def import_handler(
             f.write(additional_content)
 
 
+def split_method_imports(python_method: str, py_name: str) -> Tuple[List[str], str]:
+    """
+    Split the import statements from a Python method.
+
+    Parameters
+    ----------
+    python_method: str
+        Python method, as returned by ``XMLCommand.to_python``.
+    py_name: str
+        Python name of the method.
+
+    Returns
+    -------
+    list[str]
+        Import statements defined before the method definition.
+    str
+        Python method without its import statements.
+    """
+    start = python_method.index(f"def {py_name}")
+    str_before_def = python_method[:start]
+    imports = [line.strip() for line in str_before_def.split("\n") if line.strip()]
+    indent = str_before_def.split("\n")[-1]
+    return imports, f"\n{indent}{python_method[start:]}"
+
+
 # ############################################################################
 # AST functions
 # ############################################################################
@@ -20,27 +20,53 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from ast import literal_eval
+from concurrent.futures import ProcessPoolExecutor
+import importlib.util
 import logging
+import marshal
+import multiprocessing as mp
+import os
 from pathlib import Path
 import py_compile
 import shutil
-from typing import Tuple, Union
+from typing import Iterator, Tuple, Union
 
+from lxml.etree import tostring
 from pyconverter.xml2py import ast_tree as ast
+from pyconverter.xml2py import command_batch, command_table, lazy_docstrings
 from pyconverter.xml2py import load_xml_doc as load
+from pyconverter.xml2py.benchmark import (
+    BENCHMARK_FILE_NAME,
+    get_command_strings_benchmark,
+    get_command_strings_entry,
+)
+from pyconverter.xml2py.config import Config, load_config
 from pyconverter.xml2py.custom_functions import CustomFunctions
 from pyconverter.xml2py.directory_format import get_paths
 from pyconverter.xml2py.download import download_template
+from pyconverter.xml2py.equation_cache import (
+    DEFAULT_EQUATION_CACHE_PATH,
+    EquationCache,
+    normalize_mathml,
+)
+from pyconverter.xml2py.formatter import format_source, format_sources, get_black_line_length
+from pyconverter.xml2py.lazy_docstrings import get_docstrings_resource_name, pack_docstrings
+from pyconverter.xml2py.stubs import (
+    extract_docstrings,
+    get_stub_source,
+    shorten_docstrings,
+    tabulate_commands,
+    to_literal,
+)
 import pyconverter.xml2py.utils.regex_pattern as pat
 from pyconverter.xml2py.utils.utils import (
     create_name_map,
-    get_base_class_for_pattern,
     get_comment_command_dict,
-    get_config_data_value,
     get_library_path,
     get_refentry,
-    import_handler,
     is_valid_method,
+    split_method_imports,
 )
 import regex as re
 from tqdm import tqdm
@@ -54,8 +80,20 @@ CONST = {
     '``"``': "``",
 }
 
+#: Invalidation modes of the precompiled bytecode, see ``py_compile.PycInvalidationMode``
+INVALIDATION_MODES = ("timestamp", "checked-hash", "unchecked-hash")
+
+# commands and options shared with the forked rendering processes
+_RENDER_CONTEXT = None
+
 
-def convert(directory_path):
+def convert(
+    directory_path,
+    convert_equations: bool = False,
+    equation_cache_path: Union[Path, None] = DEFAULT_EQUATION_CACHE_PATH,
+    max_workers: int = 1,
+    config_path: Union[Path, Config] = Path("config.yaml"),
+):
     """
     Convert an XML directory into an RST dictionary.
 
@@ -63,6 +101,18 @@ def convert(directory_path):
     ----------
     directory_path: Path
         Path to the directory containing the XML files to convert.
+    convert_equations: bool, optional
+        Whether to convert the MathML equations into LaTeX. The default is ``False``.
+    equation_cache_path: Path, optional
+        Path to the JSON file caching the converted equations across runs.
+        If ``None``, the cache is only kept in memory. The default is
+        ``~/.cache/pyconverter-xml2py/equations.json``.
+    max_workers: int, optional
+        Number of worker processes used to convert the equations missing
+        from the cache. The default is ``1``.
+    config_path: Path or Config, optional
+        Path object of the configuration file or loaded configuration.
+        The default value is ``Path(config.yaml)``.
 
     Returns
     -------
@@ -72,12 +122,17 @@ def convert(directory_path):
         Dictionary with the following format: ``{"initial_command_name": "python_name"}``.
     """
 
+    config = load_config(config_path)
     graph_path, link_path, term_path, xml_path = get_paths(directory_path)
     links = load.load_links(link_path)
     fcache = load.load_fcache(graph_path)
     docu_global = load.load_docu_global(term_path)
     terms, version_variables = load.load_terms(term_path, docu_global, links, fcache)
 
+    equation_cache = EquationCache(equation_cache_path) if convert_equations else None
+    ast.set_equation_conversion(convert_equations, equation_cache)
+    equations = []
+
     def load_commands(
         xml_path,
         meta_only=False,
@@ -126,9 +181,15 @@ def convert(directory_path):
                     meta_only=meta_only,
                 )
                 xml_commands.append(command)
+                if meta_only and equation_cache is not None:
+                    # the metadata pass does not parse the equations
+                    equations.extend(
+                        normalize_mathml(tostring(math, with_tail=False).decode())
+                        for math in refentry[0].iter("math")
+                    )
                 if meta_only == False:
-                    refnamediv = command.get_children_by_type("Refnamediv")[0]
-                    ref = str(refnamediv.get_children_by_type("Refclass")[0])
+                    refnamediv = command.get_children_by_type(ast.Refnamediv)[0]
+                    ref = str(refnamediv.get_children_by_type(ast.Refclass)[0])
                     group = re.findall(pat.GET_GROUP, ref)
                     if len(group) > 0:
                         if group[0] == "xtycadimport":
@@ -158,7 +219,7 @@ def convert(directory_path):
     # remove the start and slash whenever possible, for example, /GCOLUMN can simply
     # be gcolumn since it's the only command, but VGET and *VGET must be vget and star_vget
 
-    name_map = create_name_map(meta_command, Path("config.yaml"))
+    name_map = create_name_map(meta_command, config)
     ast.NameMap(name_map)
 
     # TODO: accept conversion of a single command
@@ -172,12 +233,238 @@ def convert(directory_path):
     #     commands = {to_py_name(cmd.name): cmd}
     # else:  # convert all commands
 
+    # equations are converted upfront so that parsing the commands only hits the cache
+    if equation_cache is not None:
+        equation_cache.convert_all(equations, max_workers=max_workers)
+        equation_cache.save()
+
     command_map = load_commands(xml_path)
 
     return command_map, name_map
 
 
-def copy_template_package(template_path: Path, new_package_path: Path) -> Path:
+class FileWriter:
+    """
+    Provides a file writer that skips the files whose content is unchanged.
+
+    Changed files are written to a temporary file first and then moved in place,
+    so that an interrupted run never leaves partially written files.
+    """
+
+    #: Whether the files are written to the disk
+    on_disk = True
+
+    def __init__(self):
+        self.paths = set()
+        self.changed_paths = []
+        self.written = 0
+        self.unchanged = 0
+        self.deleted = 0
+
+    def _is_unchanged(self, path: Path, content: bytes) -> bool:
+        try:
+            if path.stat().st_size != len(content):
+                return False
+            return path.read_bytes() == content
+        except OSError:
+            return False
+
+    def write_bytes(
+        self, path: Path, content: bytes, mode_source: Union[Path, None] = None
+    ) -> bool:
+        """
+        Write a file if its content has changed.
+
+        Parameters
+        ----------
+        path: Path
+            Path object of the file to write.
+        content: bytes
+            Content of the file.
+        mode_source: Path, optional
+            Path object of a file to copy the permission bits from. The default value is ``None``.
+
+        Returns
+        -------
+        bool
+            ``True`` if the file has been written, ``False`` if it was unchanged.
+        """
+        path = Path(os.path.abspath(path))
+        self.paths.add(path)
+        if self._is_unchanged(path, content):
+            self.unchanged += 1
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(content)
+            if mode_source is not None:
+                shutil.copymode(mode_source, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        self.changed_paths.append(path)
+        self.written += 1
+        return True
+
+    def make_dir(self, path: Path) -> None:
+        """Create a directory."""
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+    def is_dir(self, path: Path) -> bool:
+        """Whether a path is an output directory."""
+        return Path(path).is_dir()
+
+    def list_dir(self, path: Path) -> list:
+        """Return the sorted files and directories of an output directory."""
+        if not self.is_dir(path):
+            return []
+        return sorted(Path(path).iterdir())
+
+    def is_written(self, path: Path) -> bool:
+        """Whether a file has been written, or left unchanged, by this writer."""
+        return Path(os.path.abspath(path)) in self.paths
+
+    def read_bytes(self, path: Path) -> bytes:
+        """Read an output file."""
+        return Path(path).read_bytes()
+
+    def read_text(self, path: Path) -> str:
+        """Read an output text file encoded in UTF-8."""
+        return Path(path).read_text(encoding="utf-8")
+
+    def close(self) -> Union[Path, None]:
+        """Finalize the output. Nothing needs to be done for files written to the disk."""
+        return None
+
+    def write_text(self, path: Path, content: str) -> bool:
+        """Write a text file encoded in UTF-8 if its content has changed."""
+        return self.write_bytes(path, content.encode("utf-8"))
+
+    def copy_file(self, source: Path, path: Path) -> bool:
+        """Copy a file if its content has changed."""
+        return self.write_bytes(path, Path(source).read_bytes(), mode_source=source)
+
+    def copy_tree(self, source: Path, path: Path) -> None:
+        """Copy the files of a directory if their content has changed."""
+        for source_file in sorted(Path(source).rglob("*")):
+            if source_file.is_file():
+                self.copy_file(source_file, path / source_file.relative_to(source))
+
+    def remove_stale(self, root: Path, exclude: tuple = ()) -> None:
+        """
+        Delete the files of a directory that have not been written by this writer.
+
+        Directories left empty are deleted too.
+
+        Parameters
+        ----------
+        root: Path
+            Path object of the directory to clean.
+        exclude: tuple, optional
+            Path objects of the files and directories to leave untouched.
+            The default value is ``()``.
+        """
+        root = Path(os.path.abspath(root))
+        exclude = tuple(Path(os.path.abspath(excluded)) for excluded in exclude)
+        if not root.is_dir():
+            return
+        # Children are visited before their parent directory
+        for path in sorted(root.rglob("*"), key=lambda path: len(path.parts), reverse=True):
+            if any(path == excluded or excluded in path.parents for excluded in exclude):
+                continue
+            if path.is_dir():
+                if not path.is_symlink() and not any(path.iterdir()):
+                    path.rmdir()
+            elif path not in self.paths:
+                path.unlink()
+                self.deleted += 1
+
+    @property
+    def summary(self) -> str:
+        """Counts of the written, unchanged and deleted files."""
+        return f"{self.written} written, {self.unchanged} unchanged, {self.deleted} deleted files"
+
+
+class MemoryWriter(FileWriter):
+    """
+    Provides a file writer that keeps the files in memory instead of writing them to the disk.
+
+    Copied files are kept as a reference to their source and only read when needed.
+    The written files are available in the ``files`` dictionary.
+    """
+
+    on_disk = False
+
+    def __init__(self):
+        super().__init__()
+        self.files = {}
+
+    def _store(self, path: Path, content: Union[bytes, Path]) -> bool:
+        path = Path(os.path.abspath(path))
+        self.paths.add(path)
+        if path in self.files and self.read_bytes(path) == self._get_bytes(content):
+            self.unchanged += 1
+            return False
+        self.written += 1
+        self.changed_paths.append(path)
+        self.files[path] = content
+        return True
+
+    @staticmethod
+    def _get_bytes(content: Union[bytes, Path]) -> bytes:
+        return content.read_bytes() if isinstance(content, Path) else content
+
+    def write_bytes(
+        self, path: Path, content: bytes, mode_source: Union[Path, None] = None
+    ) -> bool:
+        """Store a file in memory."""
+        return self._store(path, content)
+
+    def copy_file(self, source: Path, path: Path) -> bool:
+        """Store a reference to a file to copy."""
+        return self._store(path, Path(source))
+
+    def make_dir(self, path: Path) -> None:
+        """Directories are implicit in memory."""
+
+    def is_dir(self, path: Path) -> bool:
+        """Whether a path is a directory containing written files."""
+        path = Path(os.path.abspath(path))
+        return any(path in written_path.parents for written_path in self.paths)
+
+    def list_dir(self, path: Path) -> list:
+        """Return the sorted files and directories written in a directory."""
+        path = Path(os.path.abspath(path))
+        children = set()
+        for written_path in self.paths:
+            if path in written_path.parents:
+                children.add(path / written_path.relative_to(path).parts[0])
+        return sorted(children)
+
+    def read_bytes(self, path: Path) -> bytes:
+        """Read a file written in memory."""
+        path = Path(os.path.abspath(path))
+        if path not in self.files:
+            raise FileNotFoundError(f"File {path} has not been written.")
+        return self._get_bytes(self.files[path])
+
+    def read_text(self, path: Path) -> str:
+        """Read a text file written in memory."""
+        return self.read_bytes(path).decode("utf-8")
+
+    def remove_stale(self, root: Path, exclude: tuple = ()) -> None:
+        """Files are written in memory from scratch, so there are no stale files."""
+
+
+def copy_template_package(
+    template_path: Path,
+    new_package_path: Path,
+    file_writer: Union[FileWriter, None] = None,
+    exclude: tuple = (),
+) -> Path:
     """
     Add files and directory from a template directory path to a new path.
 
@@ -189,6 +476,13 @@ def copy_template_package(template_path: Path, new_package_path: Path) -> Path:
     new_package_path: Path
         Path object containing the directory where the new files and directorys are to be added.
 
+    file_writer: FileWriter, optional
+        Writer used to copy the files. The default value is ``None``, in which
+        case unchanged files are also skipped.
+
+    exclude: tuple, optional
+        Path objects of the template files not to copy. The default value is ``()``.
+
     Returns
     -------
     Path
@@ -196,29 +490,169 @@ def copy_template_package(template_path: Path, new_package_path: Path) -> Path:
         ``xml-commands`` package.
 
     """
+    if file_writer is None:
+        file_writer = FileWriter()
+
     filename_list = list(template_path.glob("*"))
 
     for filename in filename_list:
         new_path_dir = new_package_path / filename.name
+        if filename in exclude:
+            continue
         if filename.is_dir():
-            new_path_dir.mkdir(parents=True, exist_ok=True)
-            copy_template_package(filename, new_path_dir)
+            file_writer.make_dir(new_path_dir)
+            copy_template_package(filename, new_path_dir, file_writer, exclude)
         else:
-            shutil.copy(filename, new_package_path)
+            file_writer.copy_file(filename, new_path_dir)
 
 
-def write_global__init__file(library_path: Path, config_path: Path) -> None:
+def get_lazy_imports(package: str, names: list) -> list:
+    """
+    Get the content of a ``__init__.py`` file importing its submodules lazily.
+
+    The submodules are imported on first attribute access through the module
+    ``__getattr__`` function (PEP 562). They are also imported in a ``TYPE_CHECKING``
+    block for static analyzers.
+
+    Parameters
+    ----------
+    package: str
+        Relative name of the package containing the submodules, such as ``"."``.
+    names: list
+        Sorted names of the submodules.
+
+    Returns
+    -------
+    list
+        Lines of the ``__init__.py`` file.
+    """
+    content = ["import importlib\n", "from typing import TYPE_CHECKING\n\n"]
+    content.append("if TYPE_CHECKING:\n")
+    content.append(f"    from {package} import (\n")
+    content.extend(f"        {name},\n" for name in names)
+    content.append("    )\n\n")
+    content.append("_SUBMODULES = (\n")
+    content.extend(f'    "{name}",\n' for name in names)
+    content.append(")\n\n\n")
+    content.append("def __getattr__(name):\n")
+    content.append("    if name in _SUBMODULES:\n")
+    prefix = package if package.endswith(".") else f"{package}."
+    content.append(f'        module = importlib.import_module(f"{prefix}{{name}}", __name__)\n')
+    content.append("        globals()[name] = module\n")
+    content.append("        return module\n")
+    content.append(
+        '    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")\n\n\n'
+    )
+    content.append("def __dir__():\n")
+    content.append("    return sorted(set(globals()) | set(_SUBMODULES))\n")
+    return content
+
+
+def get_command_index_entry(
+    command: ast.XMLCommand,
+    module: str,
+    class_name: Union[str, None],
+    custom_functions: Union[CustomFunctions, None] = None,
+) -> tuple:
+    """
+    Get the command index entry of a command.
+
+    The entry must be computed before the command is detached.
+
+    Parameters
+    ----------
+    command: ast.XMLCommand
+        Command object.
+    module: str
+        Full name of the module where the command is stored.
+    class_name: str or None
+        Class where the command is stored, or ``None`` if the method is a module function.
+    custom_functions: CustomFunctions, optional
+        Custom functions, whose arguments replace the ones of the command.
+        The default value is ``None``.
+
+    Returns
+    -------
+    tuple
+        Command name and its ``(module, class_name, method, args, archived, group)``
+        description.
+    """
+    if custom_functions is not None and command.py_name in custom_functions.py_names:
+        args = tuple(
+            arg
+            for arg in custom_functions.py_args[command.py_name]
+            if arg != "self" and not arg.startswith("*")
+        )
+    else:
+        args = tuple(arg.py_arg_name for arg in command.arg_desc if arg.py_arg_name != "")
+    group = tuple(command.group) if command.group is not None else None
+    return command.name, (module, class_name, command.py_name, args, command.is_archived, group)
+
+
+def get_command_index_source(entries: list) -> str:
+    """
+    Get the source of the ``_command_index.py`` module of the generated package.
+
+    The module maps each command name to the Python method running it, so that
+    the methods can be found without importing the classes.
+
+    Parameters
+    ----------
+    entries: list
+        Command index entries. See :func:`get_command_index_entry`.
+
+    Returns
+    -------
+    str
+        Source of the module, which only contains literals.
+    """
+    content = [
+        '"""\n',
+        "Index of the commands, from their name to the Python method running them.\n\n",
+        "``COMMANDS`` maps each command name to a tuple with the fields listed in ``FIELDS``.\n",
+        '"""\n\n',
+        'FIELDS = ("module", "class_name", "method", "args", "archived", "group")\n\n',
+        "COMMANDS = {\n",
+    ]
+    content.extend(
+        f"    {to_literal(name)}: {to_literal(entry)},\n" for name, entry in sorted(entries)
+    )
+    content.append("}\n")
+    return "".join(content)
+
+
+def write_global__init__file(
+    library_path: Path,
+    package_structure: dict,
+    config_path: Union[Path, Config],
+    file_writer: Union[FileWriter, None] = None,
+    lazy_imports: bool = False,
+) -> None:
     """
     Write the ``__init__.py`` file for the package generated.
 
+    The modules are imported in alphabetical order.
+
     Parameters
     ----------
     library_path: Path
         Path object of the directory containing the generated package.
+    package_structure: dict
+        Dictionary describing the modules and files of the generated package.
+    config_path: Path or Config
+        Path object of the configuration file or loaded configuration.
+    file_writer: FileWriter, optional
+        Writer used to write the file. The default value is ``None``.
+    lazy_imports: bool, optional
+        Whether the modules are imported on first access instead of when the package
+        is imported. The default value is ``False``.
     """
 
-    project_name = get_config_data_value(config_path, "project_name")
-    subfolder_values = get_config_data_value(config_path, "subfolders")
+    if file_writer is None:
+        file_writer = FileWriter()
+    config = load_config(config_path)
+    project_name = config.project_name
+    subfolder_values = config.subfolders
 
     if subfolder_values:
         init_folder = library_path
@@ -231,42 +665,477 @@ def write_global__init__file(library_path: Path, config_path: Path) -> None:
 
     init_path = init_folder / "__init__.py"
 
-    with open(init_path, "w", encoding="utf-8") as fid:
-        fid.write(f"from .{initial_imports} import (\n")
-        for dir in library_path.iterdir():
-            if dir.is_dir():
-                fid.write(f"    {dir.stem},\n")
-        fid.write(")\n\n")
-        fid.write("try:\n")
-        fid.write("    import importlib.metadata as importlib_metadata\n")
-        fid.write("except ModuleNotFoundError:\n")
-        fid.write("    import importlib_metadata\n\n")
-        fid.write("__version__ = importlib_metadata.version(__name__.replace('.', '-'))\n")
-        fid.write(f'"""{project_name} version."""\n')
-    fid.close()
-
-
-def write__init__file(library_path: Path) -> None:
-    """ "
+    if lazy_imports:
+        content = get_lazy_imports(f".{initial_imports}", sorted(package_structure))
+        content.append("\n\n")
+    else:
+        content = [f"from .{initial_imports} import (\n"]
+        for module_name in sorted(package_structure):
+            content.append(f"    {module_name},\n")
+        content.append(")\n\n")
+    content.append("try:\n")
+    content.append("    import importlib.metadata as importlib_metadata\n")
+    content.append("except ModuleNotFoundError:\n")
+    content.append("    import importlib_metadata\n\n")
+    content.append("__version__ = importlib_metadata.version(__name__.replace('.', '-'))\n")
+    content.append(f'"""{project_name} version."""\n')
+    file_writer.write_text(init_path, "".join(content))
+
+
+def write__init__file(
+    library_path: Path,
+    package_structure: dict,
+    file_writer: Union[FileWriter, None] = None,
+    lazy_imports: bool = False,
+) -> None:
+    """
     Write the ``__init__.py`` file within each module directory.
 
+    The files of each module are imported in alphabetical order.
+
     Parameters
     ----------
     library_path: Path
         Path object of the directory containing the generated package.
+    package_structure: dict
+        Dictionary describing the modules and files of the generated package.
+    file_writer: FileWriter, optional
+        Writer used to write the files. The default value is ``None``.
+    lazy_imports: bool, optional
+        Whether the files are imported on first access instead of when the module
+        is imported. The default value is ``False``.
+    """
+
+    if file_writer is None:
+        file_writer = FileWriter()
+    for module_name, module_structure in sorted(package_structure.items()):
+        if lazy_imports:
+            content = get_lazy_imports(".", sorted(module_structure))
+        else:
+            content = ["from . import (\n"]
+            for file_name in sorted(module_structure):
+                content.append(f"    {file_name},\n")
+            content.append(")\n")
+        file_writer.write_text(library_path / module_name / "__init__.py", "".join(content))
+
+
+class ClassFile:
+    """
+    Provides the in-memory content of a generated class file.
+
+    Parameters
+    ----------
+    class_name: str
+        Name of the class.
+    base_class_info: dict, optional
+        Dictionary with the ``module`` and ``class_name`` keys of the base class.
+        The default value is ``None``.
+    slots: bool, optional
+        Whether the class defines empty ``__slots__``, so that the classes composed with
+        it as a mixin do not need an instance dictionary. The default value is ``False``.
+    """
+
+    def __init__(
+        self, class_name: str, base_class_info: Union[dict, None] = None, slots: bool = False
+    ):
+        self.class_name = class_name
+        self.base_class_info = base_class_info
+        self.slots = slots
+        # Dictionary keys are used as an ordered set
+        self.imports = {}
+        self.methods = []
+        self.method_names = []
+
+    def add_method(self, imports: list, python_method: str, name: Union[str, None] = None) -> None:
+        """Add a Python method and its import statements to the class."""
+        self.imports.update(dict.fromkeys(imports))
+        self.methods.append(f"{python_method}\n")
+        self.method_names.append(name)
+
+    def get_method_name(self, lineno: int) -> Union[str, None]:
+        """Return the name of the method defined at a line of the class source."""
+        start = self._header().count("\n") + 1
+        for name, method in zip(self.method_names, self.methods):
+            end = start + method.count("\n")
+            if lineno < end:
+                return name
+            start = end
+        return None
+
+    def _header(self) -> str:
+        imports = list(self.imports)
+        if self.base_class_info:
+            base_import = (
+                f"from {self.base_class_info['module']} "
+                f"import {self.base_class_info['class_name']}"
+            )
+            if base_import not in self.imports:
+                imports.append(base_import)
+            header = [f"class {self.class_name}({self.base_class_info['class_name']}):\n"]
+        else:
+            header = [f"class {self.class_name}:\n"]
+        if self.slots:
+            header.append("    __slots__ = ()\n")
+        if imports:
+            header.insert(0, "\n".join(imports) + "\n\n")
+        return "".join(header)
+
+    @property
+    def source(self) -> str:
+        """Python source code of the class file."""
+        return "".join([self._header()] + self.methods)
+
+
+def _compile_source(file_path: str, source: str) -> Union[Tuple[int, str], None]:
+    try:
+        compile(source, file_path, "exec", dont_inherit=True)
+    except (SyntaxError, ValueError) as err:
+        return getattr(err, "lineno", None), str(err)
+    return None
+
+
+def validate_sources(sources: dict, max_workers: int = 1) -> dict:
+    """
+    Compile Python sources in memory to check that they are valid.
+
+    Each source is compiled once, without writing any bytecode.
+
+    Parameters
+    ----------
+    sources: dict
+        Dictionary with the following format: ``{file_path: source}``.
+    max_workers: int, optional
+        Number of worker processes. If ``None``, all the available CPUs are used.
+        The default value is ``1``.
+
+    Returns
+    -------
+    dict
+        Dictionary of the invalid sources with the following format:
+        ``{file_path: (line_number, error_message)}``.
+    """
+    file_paths = list(sources.keys())
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(file_paths))
+    if max_workers <= 1:
+        errors = map(_compile_source, map(str, file_paths), sources.values())
+        return {path: error for path, error in zip(file_paths, errors) if error is not None}
+
+    chunksize = max(1, len(file_paths) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        errors = executor.map(
+            _compile_source,
+            list(map(str, file_paths)),
+            list(sources.values()),
+            chunksize=chunksize,
+        )
+        return {path: error for path, error in zip(file_paths, errors) if error is not None}
+
+
+def _get_bytecode(
+    file_path: str, source: bytes, optimization: int, invalidation_mode: str, mtime: int
+) -> bytes:
+    # Same layout as the ``.pyc`` files written by ``py_compile`` (PEP 552)
+    code = compile(source, file_path, "exec", dont_inherit=True, optimize=optimization)
+    data = bytearray(importlib.util.MAGIC_NUMBER)
+    if invalidation_mode == "timestamp":
+        data.extend((0).to_bytes(4, "little"))
+        data.extend((mtime & 0xFFFFFFFF).to_bytes(4, "little"))
+        data.extend((len(source) & 0xFFFFFFFF).to_bytes(4, "little"))
+    else:
+        flags = 0b11 if invalidation_mode == "checked-hash" else 0b01
+        data.extend(flags.to_bytes(4, "little"))
+        data.extend(importlib.util.source_hash(source))
+    data.extend(marshal.dumps(code))
+    return bytes(data)
+
+
+def precompile_sources(
+    sources: dict,
+    root: Path,
+    optimizations: tuple = (0,),
+    invalidation_mode: str = "checked-hash",
+    mtimes: Union[dict, None] = None,
+    max_workers: int = 1,
+) -> dict:
+    """
+    Compile Python sources to the bytecode files of their ``__pycache__`` directory.
+
+    The bytecode targets the running Python version.
+
+    Parameters
+    ----------
+    sources: dict
+        Dictionary with the following format: ``{file_path: source_bytes}``.
+    root: Path
+        Path object of the directory the file names recorded in the bytecode are
+        relative to, so that the bytecode does not depend on the output directory.
+    optimizations: tuple, optional
+        Optimization levels of the bytecode files. ``1`` removes the assertions and
+        ``2`` also removes the docstrings, like the ``-O`` and ``-OO`` options
+        of Python. The default value is ``(0,)``.
+    invalidation_mode: str, optional
+        How Python checks that the bytecode is up to date. Options are the values of
+        ``INVALIDATION_MODES``. The hash-based modes do not depend on the modification
+        time of the sources. The default value is ``"checked-hash"``.
+    mtimes: dict, optional
+        Modification times of the sources, required by the ``"timestamp"`` mode.
+        The default value is ``None``.
+    max_workers: int, optional
+        Number of worker processes. If ``None``, all the available CPUs are used.
+        The default value is ``1``.
+
+    Returns
+    -------
+    dict
+        Dictionary of the bytecode files with the following format:
+        ``{pyc_path: content}``.
+    """
+    if invalidation_mode not in INVALIDATION_MODES:
+        raise ValueError(
+            f"Invalid invalidation mode '{invalidation_mode}'. "
+            f"Options are {', '.join(INVALIDATION_MODES)}."
+        )
+    if invalidation_mode == "timestamp" and mtimes is None:
+        raise ValueError("Modification times are required by the 'timestamp' mode.")
+    jobs = []
+    for file_path, source in sources.items():
+        mtime = int(mtimes[file_path]) if invalidation_mode == "timestamp" else 0
+        for optimization in optimizations:
+            pyc_path = Path(
+                importlib.util.cache_from_source(
+                    str(file_path), optimization=optimization if optimization else ""
+                )
+            )
+            file_name = Path(os.path.relpath(file_path, root)).as_posix()
+            jobs.append((pyc_path, (file_name, source, optimization, invalidation_mode, mtime)))
+    pyc_paths = [pyc_path for pyc_path, _ in jobs]
+    arguments = list(zip(*[job_arguments for _, job_arguments in jobs])) or [()] * 5
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(jobs))
+    if max_workers <= 1:
+        return dict(zip(pyc_paths, map(_get_bytecode, *arguments)))
+
+    chunksize = max(1, len(jobs) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(pyc_paths, executor.map(_get_bytecode, *arguments, chunksize=chunksize)))
+
+
+def get_runtime_outputs(
+    file_path: Path,
+    source: str,
+    short_docstrings: bool = False,
+    lazy_docstrings_import: Union[str, None] = None,
+    command_table_import: Union[str, None] = None,
+) -> Tuple[dict, dict]:
+    """
+    Get the runtime source of a module, with its stub and compressed docstrings.
+
+    Parameters
+    ----------
+    file_path: Path
+        Path object of the module.
+    source: str
+        Python source code of the module, with the full docstrings.
+    short_docstrings: bool, optional
+        Whether to keep only the first line of the docstrings and return the full
+        docstrings in a ``.pyi`` stub. The default value is ``False``.
+    lazy_docstrings_import: str, optional
+        Statement importing the ``lazy_docstrings`` decorator. If provided, the method
+        docstrings of the classes are returned in a compressed resource and loaded on
+        first access. The default value is ``None``.
+    command_table_import: str, optional
+        Statement importing the ``command_table`` decorator. If provided, the methods
+        running a formatted command are replaced with a command table.
+        The default value is ``None``.
+
+    Returns
+    -------
+    dict
+        Dictionary of the text files with the following format: ``{file_path: source}``.
+    dict
+        Dictionary of the binary files with the following format: ``{file_path: content}``.
+    """
+    sources = {file_path: source}
+    resources = {}
+    if short_docstrings:
+        sources[file_path.with_suffix(".pyi")] = get_stub_source(source)
+    if lazy_docstrings_import is not None:
+        source, docstrings = extract_docstrings(source, lazy_docstrings_import)
+        if docstrings:
+            resource_path = file_path.with_name(get_docstrings_resource_name(file_path.name))
+            resources[resource_path] = pack_docstrings(docstrings)
+    elif short_docstrings:
+        source = shorten_docstrings(source)
+    if command_table_import is not None:
+        source = tabulate_commands(source, command_table_import)
+    sources[file_path] = source
+    return sources, resources
+
+
+def _render_command(index: int) -> Tuple[str, Union[tuple, None]]:
+    (
+        commands,
+        custom_functions,
+        comment_command_dict,
+        image_folder_path,
+        command_builders,
+        trim_empty_fields,
+    ) = _RENDER_CONTEXT
+    command = commands[index]
+    python_method = command.to_python(
+        custom_functions,
+        comment_command_dict,
+        indent=4 * " ",
+        image_folder_path=image_folder_path,
+        command_builders=command_builders,
+        trim_empty_fields=trim_empty_fields,
+    )
+    # The special arguments found in the worker processes are reported to the main one
+    return python_method, ast.SPECIAL_ARGUMENTS.get(command.py_name)
+
+
+def iter_rendered_commands(
+    commands: list,
+    custom_functions: Union[CustomFunctions, None] = None,
+    comment_command_dict: Union[dict, None] = None,
+    image_folder_path: Union[Path, None] = None,
+    max_workers: int = 1,
+    command_builders: bool = False,
+    trim_empty_fields: bool = False,
+) -> Iterator[str]:
+    """
+    Render the Python methods of a list of commands, one at a time.
+
+    The methods are yielded in the order of ``commands``, so that each command
+    can be detached as soon as its method is rendered. The parameters are the
+    ones of :func:`render_commands`.
+
+    Yields
+    ------
+    str
+        Python method of each command.
+    """
+    global _RENDER_CONTEXT
+    _RENDER_CONTEXT = (
+        commands,
+        custom_functions,
+        comment_command_dict,
+        image_folder_path,
+        command_builders,
+        trim_empty_fields,
+    )
+    indexes = range(len(commands))
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(commands))
+    try:
+        if max_workers <= 1 or "fork" not in mp.get_all_start_methods():
+            for index in tqdm(indexes, desc="Writing commands"):
+                yield _render_command(index)[0]
+            return
+
+        chunksize = max(1, len(commands) // (max_workers * 8))
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=mp.get_context("fork")
+        ) as executor:
+            results = executor.map(_render_command, indexes, chunksize=chunksize)
+            for command, (python_method, special_arguments) in zip(
+                commands, tqdm(results, total=len(commands), desc="Writing commands")
+            ):
+                if special_arguments is not None:
+                    ast.SPECIAL_ARGUMENTS[command.py_name] = special_arguments
+                yield python_method
+    finally:
+        _RENDER_CONTEXT = None
+
+
+def render_commands(
+    commands: list,
+    custom_functions: Union[CustomFunctions, None] = None,
+    comment_command_dict: Union[dict, None] = None,
+    image_folder_path: Union[Path, None] = None,
+    max_workers: int = 1,
+    command_builders: bool = False,
+    trim_empty_fields: bool = False,
+) -> list:
     """
+    Render the Python methods of a list of commands.
+
+    Commands are independent from each other, so they are rendered in worker
+    processes when ``max_workers`` is greater than ``1``. Worker processes are
+    forked so that they inherit the loaded commands. If forking is not available,
+    the commands are rendered in the current process.
+
+    Parameters
+    ----------
+    commands: list
+        List of ``XMLCommand`` objects.
+    custom_functions: CustomFunctions, optional
+        Customized functions. The default value is ``None``.
+    comment_command_dict: dict, optional
+        Dictionary of the commands to comment. The default value is ``None``.
+    image_folder_path: Path, optional
+        Path to the folder containing the images. The default value is ``None``.
+    max_workers: int, optional
+        Number of worker processes. If ``None``, all the available CPUs are used.
+        The default value is ``1``.
+    command_builders: bool, optional
+        Whether to add the ``_fmt_<py_name>`` static methods formatting the command
+        strings. The default value is ``False``.
+    trim_empty_fields: bool, optional
+        Whether the trailing empty fields are removed from the command strings.
+        The default value is ``False``.
 
-    for dir in library_path.iterdir():
-        if dir.is_dir():
-            listdir = list(dir.iterdir())
-            if len(listdir) > 0:
-                with open(dir / "__init__.py", "w", encoding="utf-8") as fid:
-                    fid.write(f"from . import (\n")
-                    for file in listdir:
-                        if file.name.endswith(".py"):
-                            fid.write(f"    {file.stem},\n")
-                    fid.write(")\n")
-                    fid.close()
+    Returns
+    -------
+    list
+        Python methods, in the same order as ``commands``.
+    """
+    return list(
+        iter_rendered_commands(
+            commands,
+            custom_functions,
+            comment_command_dict,
+            image_folder_path,
+            max_workers,
+            command_builders,
+            trim_empty_fields,
+        )
+    )
+
+
+def write_special_arguments(path: Path = Path("args.txt")) -> None:
+    """
+    Write the commands whose arguments need a special treatment.
+
+    The commands are the ones found while rendering the last package. Consecutive
+    commands with the same Python arguments are only written once. If there is no
+    such command, the file is removed.
+
+    Parameters
+    ----------
+    path: Path, optional
+        Path to the text file. The default value is ``Path("args.txt")``.
+    """
+    lines = []
+    last_py_arg_names = None
+    for py_name, (group, initial_args, py_arg_names) in ast.SPECIAL_ARGUMENTS.items():
+        if py_arg_names == last_py_arg_names:
+            continue
+        last_py_arg_names = py_arg_names
+        lines.append("--------------------------------------------------")
+        lines.append(f"{py_name}: {group}")
+        lines.append(f"initial_args : {initial_args}")
+        lines.append(f"py_arg_name : {py_arg_names}")
+    path = Path(path)
+    if lines:
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    elif path.exists():
+        path.unlink()
 
 
 def get_module_info(library_path: Path, command: ast.XMLCommand) -> Tuple[str, str, Path]:
@@ -326,8 +1195,9 @@ def get_class_info(initial_class_name: str, module_path: Path) -> Tuple[str, str
 def add_additional_source_files(
     template_path: Path,
     package_structure: dict,
-    config_path: Path,
+    config_path: Union[Path, Config],
     library_path: Path,
+    file_writer: Union[FileWriter, None] = None,
 ) -> dict:
     """
     Add additional source files to the package structure from the template.
@@ -341,29 +1211,35 @@ def add_additional_source_files(
         Path object of the template directory.
     package_structure: dict
         Dictionary representing the package structure.
-    config_path: Path
-        Path object of the configuration file.
+    config_path: Path or Config
+        Path object of the configuration file or loaded configuration.
     library_path: Path
         Path object of the library directory where files are generated.
+    file_writer: FileWriter, optional
+        Writer used to copy the files. The default value is ``None``.
 
     Returns
     -------
     dict
         Updated package structure.
     """
+    if file_writer is None:
+        file_writer = FileWriter()
+
     # Calculate the equivalent path in the template directory
     # library_path format: package/src/pyconverter/generatedcommands/subfolder/subsubfolder/
     # We need to find the corresponding path in the template
 
     # Extract the library structure from the library_path
-    library_name_structured = get_config_data_value(config_path, "library_name_structured")
+    config = load_config(config_path)
+    library_name_structured = config.library_name_structured
     if not library_name_structured:
         logging.info(
             "No library structure defined in config. Skipping addition of template source files."
         )
         return package_structure
 
-    subfolder_values = get_config_data_value(config_path, "subfolders")
+    subfolder_values = config.subfolders
 
     # Build the template library path by reconstructing from template_path
     template_library_path = template_path / "src"
@@ -417,23 +1293,25 @@ def add_additional_source_files(
                 package_structure[immediate_module] = {}
 
             # Add file to package structure if not already there
-            if class_file_name not in package_structure[immediate_module]:
+            is_generated = class_file_name in package_structure[immediate_module]
+            if not is_generated:
                 package_structure[immediate_module][class_file_name] = [class_name, []]
 
             # Read the content from template and copy to library_path
             try:
                 # Construct the destination path using library_path
-                dest_module_path = library_path / immediate_module
-                dest_module_path.mkdir(parents=True, exist_ok=True)
-                dest_file_path = dest_module_path / f"{class_file_name}.py"
+                dest_file_path = library_path / immediate_module / f"{class_file_name}.py"
 
-                # Copy file if it doesn't exist in destination
-                if not dest_file_path.exists():
-                    shutil.copy(file_path, dest_file_path)
+                # Copy file if it hasn't been written in destination
+                if not file_writer.is_written(dest_file_path):
+                    file_writer.copy_file(file_path, dest_file_path)
 
-                # Read the content and extract method names
-                with open(dest_file_path, "r", encoding="utf-8") as fid:
-                    content = fid.read()
+                # Read the content and extract method names. The template file is read
+                # as the written one may have been turned into a command table.
+                if is_generated:
+                    content = file_writer.read_text(dest_file_path)
+                else:
+                    content = file_path.read_text(encoding="utf-8")
                 method_names = re.findall(pat.DEF_METHOD, content)
                 package_structure[immediate_module][class_file_name][1].extend(method_names)
             except Exception as e:
@@ -442,6 +1320,76 @@ def add_additional_source_files(
     return package_structure
 
 
+def get_method_collisions(package_structure: dict) -> dict:
+    """
+    Get the methods defined in several classes of the package.
+
+    The generated classes are meant to be composed as mixins, where such a method
+    would silently override the others. Special methods are ignored.
+
+    Parameters
+    ----------
+    package_structure: dict
+        Dictionary describing the modules and files of the generated package.
+
+    Returns
+    -------
+    dict
+        Dictionary with the following format:
+        ``{method_name: ["module_name.file_name.ClassName", ...]}``.
+    """
+    classes = {}
+    for module_name, files in package_structure.items():
+        for file_name, (class_name, method_names) in files.items():
+            for method_name in dict.fromkeys(method_names):
+                if method_name.startswith("__") and method_name.endswith("__"):
+                    continue
+                classes.setdefault(method_name, []).append(
+                    f"{module_name}.{file_name}.{class_name}"
+                )
+    return {name: owners for name, owners in sorted(classes.items()) if len(owners) > 1}
+
+
+def check_method_collisions(
+    package_structure: dict, template_path: Path, config: Config, library_path: Path
+) -> None:
+    """
+    Raise an error if methods are defined in several classes of the package.
+
+    The classes of the template source files are added to a copy of the package
+    structure, without writing any file. See :func:`get_method_collisions`.
+
+    Parameters
+    ----------
+    package_structure: dict
+        Dictionary describing the modules and files of the generated package.
+    template_path: Path
+        Path object of the template package.
+    config: Config
+        Loaded configuration.
+    library_path: Path
+        Path object of the library directory of the generated package.
+    """
+    full_structure = {
+        module_name: {
+            file_name: [class_name, list(methods)]
+            for file_name, (class_name, methods) in files.items()
+        }
+        for module_name, files in package_structure.items()
+    }
+    full_structure = add_additional_source_files(
+        template_path, full_structure, config, library_path, MemoryWriter()
+    )
+    collisions = get_method_collisions(full_structure)
+    if collisions:
+        raise RuntimeError(
+            "Methods are defined in several classes of the package.\n"
+            + "\n".join(
+                f"Method '{name}': {', '.join(owners)}" for name, owners in collisions.items()
+            )
+        )
+
+
 def write_source(
     command_map: dict,
     name_map: dict,
@@ -449,11 +1397,28 @@ def write_source(
     target_path: Path,
     path_custom_functions: Union[Path, None] = None,
     template_path: Union[Path, None] = None,
-    config_path: Path = Path("config.yaml"),
+    config_path: Union[Path, Config] = Path("config.yaml"),
     clean: bool = True,
     structured: bool = True,
     check_structure_map: bool = False,
     check_files: bool = True,
+    write_bytecode: bool = False,
+    format_code: bool = False,
+    detach_commands: bool = True,
+    lazy_imports: bool = False,
+    short_docstrings: bool = False,
+    compressed_docstrings: bool = False,
+    command_tables: bool = False,
+    command_builders: bool = False,
+    trim_empty_fields: bool = False,
+    command_index: bool = False,
+    precompile: bool = False,
+    optimizations: tuple = (0,),
+    invalidation_mode: str = "checked-hash",
+    check_collisions: bool = False,
+    autosummary_stubs: bool = False,
+    max_workers: int = 1,
+    file_writer: Union[FileWriter, None] = None,
 ) -> dict:
     """Write out XML commands as Python source files.
 
@@ -471,17 +1436,89 @@ def write_source(
         Path object containing the customized functions. The default value is ``None``.
     template_path: Path, optional
         Path object of the template to use. If no path is provided, the default template is used.
-    config_path: Path, optional
-        Path object of the configuration file. The default value is ``Path(config.yaml)``.`.
+    config_path: Path or Config, optional
+        Path object of the configuration file or loaded configuration.
+        The default value is ``Path(config.yaml)``.
     clean: bool, optional
-        Whether the directories in the new package path must be cleared before adding
-        new files. The default value is ``True``.
+        Whether the files of the new package path that are not generated anymore must be
+        deleted. The default value is ``True``.
     structured: bool, optional
         Whether the package should be structured. The default value is ``True``.
     check_structure_map: bool, optional
         Whether the structure map must be checked. The default value is ``False``.
     check_files: bool, optional
-        Whether the files must be checked. The default value is ``False``.
+        Whether the files must be checked. The generated class files are compiled in memory
+        before being written. The default value is ``True``.
+    write_bytecode: bool, optional
+        Whether to write the bytecode of the package files in the ``__pycache__``
+        directories. The default value is ``False``.
+    format_code: bool, optional
+        Whether to format the class files with Black before writing them. The line length
+        is read from the ``.pre-commit-config.yaml`` file of the template.
+        The default value is ``False``.
+    detach_commands: bool, optional
+        Whether to release the lxml tree of each command once it has been written.
+        Detached commands cannot be rendered again. The default value is ``True``.
+    lazy_imports: bool, optional
+        Whether the ``__init__.py`` files import the modules and class files on first
+        attribute access instead of eagerly. The default value is ``False``.
+    short_docstrings: bool, optional
+        Whether the methods of the generated modules only keep the first line of their
+        docstring. The full docstrings are written to ``.pyi`` stub files next to the
+        modules, for IDEs and type checkers. The documentation must be built from
+        a package generated with the full docstrings. The default value is ``False``.
+    compressed_docstrings: bool, optional
+        Whether the method docstrings of each class file are stored in a compressed
+        resource next to it. The methods only keep the first line of their docstring
+        and the full docstring is loaded on first access, so that ``help()`` and Sphinx
+        still show it. Only structured packages are supported.
+        The default value is ``False``.
+    command_tables: bool, optional
+        Whether the methods of each class running a formatted command are replaced with
+        a table of the commands, from which the methods are built when the class is
+        created. Signatures, names and docstrings are kept. Only structured packages
+        are supported. The default value is ``False``.
+    command_builders: bool, optional
+        Whether each generated method formats its command with a side-effect free
+        ``_fmt_<py_name>`` static method. A ``_command_batch`` module is added to the
+        package to collect formatted commands and submit them as one input block.
+        Only structured packages are supported. The default value is ``False``.
+    trim_empty_fields: bool, optional
+        Whether the generated methods remove the trailing empty fields from their
+        command string. A micro-benchmark comparing the full and trimmed command
+        strings is added to the ``benchmarks`` folder of the package.
+        The default value is ``False``.
+    command_index: bool, optional
+        Whether to add a ``_command_index`` module to the package, mapping each
+        command name to its module, class, method, argument names, archived flag
+        and group. The default value is ``False``.
+    precompile: bool, optional
+        Whether to write the bytecode of all the Python files of the library, using
+        ``max_workers`` processes. Unlike ``write_bytecode``, the bytecode files are
+        written with the file writer, so they are also added to archives.
+        The default value is ``False``.
+    optimizations: tuple, optional
+        Optimization levels of the precompiled bytecode. ``2`` removes the docstrings,
+        like the ``-OO`` option of Python. The default value is ``(0,)``.
+    invalidation_mode: str, optional
+        Invalidation mode of the precompiled bytecode. Options are the values of
+        ``INVALIDATION_MODES``. The ``"timestamp"`` mode is only supported for files
+        written to the disk. The default value is ``"checked-hash"``.
+    check_collisions: bool, optional
+        Whether to check that no method is defined in several classes of the package,
+        including the template ones. The check is done before any source file is written.
+        The classes define empty ``__slots__`` if the ``slots`` value of the
+        ``base_class`` configuration is set. The default value is ``False``.
+    autosummary_stubs: bool, optional
+        Whether the autosummary stub pages are written by :func:`write_docs`, in which
+        case ``autosummary_generate`` is disabled in the ``conf.py`` file of the package.
+        The default value is ``False``.
+    max_workers: int, optional
+        Number of worker processes used to render the commands of a structured
+        package. The default value is ``1``.
+    file_writer: FileWriter, optional
+        Writer used to write the files. Files whose content is unchanged are not rewritten.
+        The default value is ``None``.
 
     Returns
     -------
@@ -501,36 +1538,80 @@ def write_source(
         if not template_path.is_dir:
             download_template()
 
-    new_package_name = get_config_data_value(config_path, "new_package_name")
+    config = load_config(config_path)
+    new_package_name = config.new_package_name
     logging.info(f"Creating package {new_package_name}...")
     new_package_path = target_path / new_package_name
-    image_folder_path = get_config_data_value(config_path, "image_folder_path")
+    image_folder_path = config.image_folder_path
 
-    ignored_commands = set(get_config_data_value(config_path, "ignored_commands"))
+    ignored_commands = config.ignored_commands
 
-    if clean:
-        if new_package_path.is_dir():
-            shutil.rmtree(new_package_path)
+    if file_writer is None:
+        file_writer = FileWriter()
+
+    library_path = get_library_path(new_package_path, config)
 
-    library_path = get_library_path(new_package_path, config_path)
+    comment_command_dict = get_comment_command_dict(config)
 
-    comment_command_dict = get_comment_command_dict(config_path)
+    # the special arguments are collected while rendering the commands
+    ast.SPECIAL_ARGUMENTS.clear()
 
-    if not library_path.is_dir():
-        library_path.mkdir(parents=True, exist_ok=True)
+    file_writer.make_dir(library_path)
 
+    if not structured and (compressed_docstrings or command_tables or command_builders):
+        raise ValueError(
+            "Compressed docstrings, command tables and command builders are only supported "
+            "for structured packages."
+        )
+    lazy_docstrings_import = None
+    if compressed_docstrings:
+        lazy_docstrings_import = (
+            f"from {config.library_import_name}._lazy_docstrings import lazy_docstrings"
+        )
+    command_table_import = None
+    if command_tables:
+        command_table_import = (
+            f"from {config.library_import_name}._command_table import command_table"
+        )
+    runtime_options = (short_docstrings, lazy_docstrings_import, command_table_import)
+
+    class_files = {}
+    benchmark_entries = []
+    index_entries = []
     if structured == False:
         package_structure = {}
+        if check_collisions:
+            check_method_collisions(package_structure, template_path, config, library_path)
         for initial_command_name, command_obj in tqdm(command_map.items(), desc="Writing commands"):
             if initial_command_name in ignored_commands:
                 continue
             python_name = name_map[initial_command_name]
             path = library_path / f"{python_name}.py"
-            python_method = command_obj.to_python(custom_functions, comment_command_dict, indent="")
+            python_method = command_obj.to_python(
+                custom_functions,
+                comment_command_dict,
+                indent="",
+                trim_empty_fields=trim_empty_fields,
+            )
+            if trim_empty_fields:
+                benchmark_entries.append(get_command_strings_entry(command_obj, custom_functions))
+            if command_index:
+                index_entries.append(
+                    get_command_index_entry(
+                        command_obj,
+                        f"{config.library_import_name}.{python_name}",
+                        None,
+                        custom_functions,
+                    )
+                )
+            if detach_commands:
+                command_obj.detach()
             # Check the Python method is valid before writing it to the file
             if is_valid_method(python_method):
-                with open(path, "w", encoding="utf-8") as fid:
-                    fid.write(f"{python_method}\n")
+                if short_docstrings:
+                    file_writer.write_text(path.with_suffix(".pyi"), get_stub_source(python_method))
+                    python_method = shorten_docstrings(python_method)
+                file_writer.write_text(path, f"{python_method}\n")
             else:
                 logging.warning(
                     f"Invalid Python method for {initial_command_name}: {python_method}"
@@ -539,20 +1620,16 @@ def write_source(
 
         package_structure = {}
         all_commands = []
-        specific_classes = get_config_data_value(config_path, "specific_classes")
-        for command in tqdm(
-            sorted(command_map.values(), key=lambda cmd: cmd.py_name), desc="Writing commands"
-        ):
+        specific_classes = config.specific_classes
+        commands = []
+        command_files = []
+        command_classes = []
+        for command in sorted(command_map.values(), key=lambda cmd: cmd.py_name):
             if command.name in ignored_commands or command.group is None:
                 continue
 
             module_name, initial_class_name, module_path = get_module_info(library_path, command)
 
-            # Create the module folder and structure if it doesn't exist yet
-            if not module_path.is_dir():
-                module_path.mkdir(parents=True, exist_ok=True)
-                package_structure[module_name] = {}
-
             # Check whether the class name needs to follow a specific rule
             if initial_class_name in specific_classes.keys():
                 initial_class_name = specific_classes[initial_class_name]
@@ -560,93 +1637,378 @@ def write_source(
             class_name, file_name, file_path = get_class_info(initial_class_name, module_path)
 
             # Create the class file and structure if it doesn't exist yet
-            if not file_path.is_file():
-                class_structure = []
-
-                # Check if this class should inherit from a base class
-                base_class_info = get_base_class_for_pattern(config_path, module_name, class_name)
-
-                with open(file_path, "w", encoding="utf-8") as fid:
-                    # Write import statement if base class is configured
-                    if base_class_info:
-                        import_stmt = (
-                            f"from {base_class_info['module']} "
-                            f"import {base_class_info['class_name']}\n\n"
-                        )
-                        fid.write(import_stmt)
-                        fid.write(f"class {class_name}({base_class_info['class_name']}):\n")
-                    else:
-                        fid.write(f"class {class_name}:\n")
-            else:
-                # Get the class structure
-                class_structure = package_structure[module_name][file_name][1]
-            class_structure.append(command.py_name)
-
-            package_structure[module_name][file_name] = [class_name, class_structure]
-            python_method = command.to_python(
-                custom_functions,
-                comment_command_dict,
-                indent=4 * " ",
-                image_folder_path=image_folder_path,
+            if file_path not in class_files:
+                module_structure = package_structure.setdefault(module_name, {})
+                module_structure[file_name] = [class_name, []]
+                base_class_info = config.get_base_class(module_name, class_name)
+                slots = base_class_info["slots"] if base_class_info else config.class_slots
+                class_files[file_path] = ClassFile(class_name, base_class_info, slots)
+            package_structure[module_name][file_name][1].append(command.py_name)
+            commands.append(command)
+            command_files.append(file_path)
+            command_classes.append(
+                (f"{config.library_import_name}.{module_name}.{file_name}", class_name)
             )
 
-            # Check if there are any imports to be added before the function definition.
-            reg_before_def = pat.BEFORE_DEF + f"{command.py_name})"
-            # Needs to be ``re.search`` and not ``re.findall`` for performance reasons
-            str_before_def = re.search(reg_before_def, python_method).group()
-            str_before_def = str_before_def.replace("\n    ", "")
+        # The collisions are checked before any source file is written
+        if check_collisions:
+            check_method_collisions(package_structure, template_path, config, library_path)
 
-            # Write the Python method to the class file
-            if str_before_def != "":
-                import_handler(file_path, python_method, str_before_def)
-            else:
-                with open(file_path, "a", encoding="utf-8") as fid:
-                    fid.write(f"{python_method}\n")
-                    fid.close()
+        if compressed_docstrings:
+            file_writer.copy_file(
+                Path(lazy_docstrings.__file__), library_path / "_lazy_docstrings.py"
+            )
+        if command_tables:
+            file_writer.copy_file(Path(command_table.__file__), library_path / "_command_table.py")
+        if command_builders:
+            file_writer.copy_file(Path(command_batch.__file__), library_path / "_command_batch.py")
+
+        python_methods = iter_rendered_commands(
+            commands,
+            custom_functions,
+            comment_command_dict,
+            image_folder_path=image_folder_path,
+            max_workers=max_workers,
+            command_builders=command_builders,
+            trim_empty_fields=trim_empty_fields,
+        )
+
+        # Methods are grouped by class file in the ``py_name`` order of the commands
+        for command, file_path, (module, class_name), python_method in zip(
+            commands, command_files, command_classes, python_methods
+        ):
+            # Reading the arguments before rendering would change the rendered notes
+            if trim_empty_fields:
+                benchmark_entries.append(get_command_strings_entry(command, custom_functions))
+            if command_index:
+                index_entries.append(
+                    get_command_index_entry(command, module, class_name, custom_functions)
+                )
+            if detach_commands:
+                command.detach()
+            imports, python_method = split_method_imports(python_method, command.py_name)
+            class_files[file_path].add_method(imports, python_method, command.py_name)
             all_commands.append(command.name)
 
+        sources = {file_path: class_file.source for file_path, class_file in class_files.items()}
+
+        # Check the class files are valid before writing them
+        if check_files:
+            errors = validate_sources(sources, max_workers=max_workers)
+            if errors:
+                messages = []
+                for file_path, (lineno, error) in errors.items():
+                    method_name = class_files[file_path].get_method_name(lineno or 0)
+                    if method_name is not None:
+                        messages.append(f"Method '{method_name}' from '{file_path}': {error}")
+                    else:
+                        messages.append(f"'{file_path}': {error}")
+                raise RuntimeError(
+                    "Failed to compile the generated source files.\n" + "\n".join(messages)
+                )
+
+        if any(runtime_options):
+            full_sources = sources
+            sources = {}
+            for file_path, source in full_sources.items():
+                module_sources, resources = get_runtime_outputs(file_path, source, *runtime_options)
+                sources.update(module_sources)
+                for resource_path, content in resources.items():
+                    file_writer.write_bytes(resource_path, content)
+
+        if format_code:
+            line_length = get_black_line_length(template_path / ".pre-commit-config.yaml")
+            sources = format_sources(sources, line_length=line_length, max_workers=max_workers)
+
+        # Each class file is written once, after all its methods have been rendered
+        for file_path, source in sources.items():
+            file_writer.write_text(file_path, source)
+
     logging.info(f"Commands written to {library_path}")
 
+    if command_index:
+        index_source = get_command_index_source(index_entries)
+        if format_code:
+            line_length = get_black_line_length(template_path / ".pre-commit-config.yaml")
+            index_source = format_source(index_source, line_length=line_length)
+        file_writer.write_text(library_path / "_command_index.py", index_source)
+
+    if trim_empty_fields:
+        # The benchmark is formatted as it is not part of the formatted sources
+        line_length = get_black_line_length(template_path / ".pre-commit-config.yaml")
+        benchmark_source = get_command_strings_benchmark(
+            [entry for entry in benchmark_entries if entry is not None], line_length=line_length
+        )
+        benchmark_source = format_source(benchmark_source, line_length=line_length)
+        file_writer.write_text(
+            new_package_path / "benchmarks" / BENCHMARK_FILE_NAME, benchmark_source
+        )
+
+    # The template source files are processed like the generated ones
+    template_sources = ()
+    if any(runtime_options):
+        template_sources = tuple(sorted((template_path / "src").rglob("*.py")))
+        for source_path in template_sources:
+            file_path = new_package_path / source_path.relative_to(template_path)
+            module_sources, resources = get_runtime_outputs(
+                file_path, source_path.read_text(encoding="utf-8"), *runtime_options
+            )
+            for output_path, source in module_sources.items():
+                file_writer.write_text(output_path, source)
+            for resource_path, content in resources.items():
+                file_writer.write_bytes(resource_path, content)
+
     # Copy package files to the package directory
-    copy_template_package(template_path, new_package_path)
+    # The final ``conf.py`` file is written once, so that it is unchanged across runs
+    template_conf_path = template_path / "doc" / "source" / "conf.py"
+    if autosummary_stubs and _get_stub_template(template_conf_path.parent) is not None:
+        template_sources += (template_conf_path,)
+        file_writer.write_text(
+            new_package_path / "doc" / "source" / "conf.py",
+            get_autosummary_conf(template_conf_path.read_text(encoding="utf-8")),
+        )
+    copy_template_package(template_path, new_package_path, file_writer, exclude=template_sources)
     graph_path = get_paths(xml_doc_path)[0]
-    shutil.copytree(graph_path, new_package_path / "doc" / "source" / image_folder_path)
+    file_writer.copy_tree(graph_path, new_package_path / "doc" / "source" / image_folder_path)
 
-    # Added at the end for addional source files
-    write_global__init__file(library_path, config_path)
-    write__init__file(library_path)
-
-    # Update package_structure if needed
+    # Add the additional source files of the template to the package structure
     package_structure = add_additional_source_files(
-        template_path, package_structure, config_path, library_path
+        template_path, package_structure, config, library_path, file_writer
     )
 
+    # The documentation pages are cleaned by ``write_docs``
+    doc_package_path = new_package_path / "doc" / "source" / str(config.documentation_subfolder)
+    if config.documentation_subfolder:
+        doc_exclude = (doc_package_path,)
+    else:
+        doc_exclude = (doc_package_path / "docs.rst",) + tuple(
+            doc_package_path / module_name for module_name in package_structure
+        )
+
+    write_global__init__file(library_path, package_structure, config, file_writer, lazy_imports)
+    write__init__file(library_path, package_structure, file_writer, lazy_imports)
+
+    if precompile:
+        source_root = Path(
+            os.path.abspath(get_library_path(new_package_path, config, subfolder=False))
+        )
+        file_paths = sorted(
+            path
+            for path in file_writer.paths
+            if path.suffix == ".py" and source_root in path.parents
+        )
+        mtimes = None
+        if invalidation_mode == "timestamp":
+            if not file_writer.on_disk:
+                raise ValueError(
+                    "Timestamp-based bytecode can only be written for packages written to the disk."
+                )
+            mtimes = {file_path: file_path.stat().st_mtime for file_path in file_paths}
+        bytecode = precompile_sources(
+            {file_path: file_writer.read_bytes(file_path) for file_path in file_paths},
+            new_package_path,
+            optimizations=optimizations,
+            invalidation_mode=invalidation_mode,
+            mtimes=mtimes,
+            max_workers=max_workers,
+        )
+        for pyc_path, content in bytecode.items():
+            file_writer.write_bytes(pyc_path, content)
+
+    if clean:
+        file_writer.remove_stale(new_package_path, exclude=doc_exclude)
+    logging.info(f"Package source files: {file_writer.summary}")
+
     if check_structure_map:
         for command_name in name_map.keys():
             if command_name not in all_commands:
                 raise Exception(f"{command_name} is not in the structure map.")
 
-    if check_files:
+    if check_files or write_bytecode:
+        file_paths = []
         for module_name in package_structure.keys():
             for class_name, _ in package_structure[module_name].items():
                 if (
                     module_name == library_path.name
                 ):  # happens when the file is directly under library_path without a module folder
-                    file_path = library_path / f"{class_name}.py"
+                    file_paths.append(library_path / f"{class_name}.py")
                 else:
-                    file_path = library_path / module_name / f"{class_name}.py"
-                try:
-                    py_compile.compile(str(file_path))
-                except Exception as e:
-                    raise RuntimeError(
-                        f"Failed to execute '{python_method}' from '{file_path}'."
-                    ) from e
+                    file_paths.append(library_path / module_name / f"{class_name}.py")
+
+        if check_files:
+            # The generated class files have already been checked before being written
+            sources = {
+                file_path: file_writer.read_text(file_path)
+                for file_path in file_paths
+                if file_path not in class_files
+            }
+            for file_path, (_, error) in validate_sources(sources, max_workers).items():
+                raise RuntimeError(f"Failed to compile '{file_path}': {error}")
+
+        if write_bytecode:
+            if not file_writer.on_disk:
+                raise ValueError("Bytecode can only be written for packages written to the disk.")
+            for file_path in file_paths:
+                py_compile.compile(str(file_path), doraise=True)
+
+    # store the equations converted while rendering the commands
+    if ast.EQUATION_CACHE is not None:
+        ast.EQUATION_CACHE.save()
 
     return package_structure
 
 
+#: Autosummary template of the method pages, looked up in the ``templates_path`` of ``conf.py``
+AUTOSUMMARY_TEMPLATE = "base.rst"
+
+# Variables of the autosummary templates, with their optional filters
+_TEMPLATE_FIELD = re.compile(r"{{\s*(\w+)((?:\s*\|\s*\w+)*)\s*}}")
+
+# Sphinx setting written to ``conf.py`` when the stub pages are written
+_AUTOSUMMARY_SETTING = """
+# The autosummary stub pages are written by PyConverter-XML2Py
+autosummary_generate = False
+"""
+
+
+def _rst_escape(text: str) -> str:
+    # Same escaping as the ``escape`` filter of the Sphinx autosummary templates
+    text = re.sub(r"([!-\-/:-@\[-`{-~])", r"\\\1", text)
+    return re.sub(r"^\.", r"\.", text)
+
+
+def _read_output_text(file_writer: FileWriter, path: Path) -> Union[str, None]:
+    # Archive writers record the files outside of the archive without storing them
+    try:
+        return file_writer.read_text(path)
+    except FileNotFoundError:
+        return None
+
+
+def _get_stub_template(
+    doc_source_path: Path, file_writer: Union[FileWriter, None] = None
+) -> Union[str, None]:
+    template = get_autosummary_template(doc_source_path, file_writer)
+    if template is not None and get_autosummary_stub(template, "", "") is None:
+        return None
+    return template
+
+
+def get_autosummary_conf(conf: str) -> str:
+    """
+    Get the content of a ``conf.py`` file with the autosummary generation disabled.
+
+    Parameters
+    ----------
+    conf: str
+        Content of the ``conf.py`` file.
+
+    Returns
+    -------
+    str
+        Content of the file, where ``autosummary_generate = False`` is appended if needed.
+    """
+    if _AUTOSUMMARY_SETTING in conf:
+        return conf
+    return conf.rstrip("\n") + "\n" + _AUTOSUMMARY_SETTING
+
+
+def get_autosummary_template(
+    doc_source_path: Path, file_writer: Union[FileWriter, None] = None
+) -> Union[str, None]:
+    """
+    Get the autosummary template of the method pages of a package.
+
+    The template is looked up in the ``templates_path`` folders of the ``conf.py`` file.
+
+    Parameters
+    ----------
+    doc_source_path: Path
+        Path object of the documentation source folder, which contains ``conf.py``.
+    file_writer: FileWriter, optional
+        Writer used to write the package files. The default value is ``None``.
+
+    Returns
+    -------
+    str or None
+        Content of the template, or ``None`` if the package has no such template.
+    """
+    if file_writer is None:
+        file_writer = FileWriter()
+    conf = _read_output_text(file_writer, doc_source_path / "conf.py")
+    if conf is None:
+        return None
+    match = re.search(r"^templates_path\s*=\s*(\[[^\]]*\])", conf, flags=re.MULTILINE)
+    if match is None:
+        return None
+    for templates_folder in literal_eval(match.group(1)):
+        template_path = doc_source_path / templates_folder / AUTOSUMMARY_TEMPLATE
+        template = _read_output_text(file_writer, template_path)
+        if template is not None:
+            return template
+    return None
+
+
+def get_autosummary_stub(
+    template: str, module: str, object_name: str, object_type: str = "method"
+) -> Union[str, None]:
+    """
+    Get the autosummary stub page of an object.
+
+    Only the variables and the ``escape`` and ``underline`` filters of the templates are
+    supported, which is enough for the templates without Jinja blocks.
+
+    Parameters
+    ----------
+    template: str
+        Autosummary template of the page. See :func:`get_autosummary_template`.
+    module: str
+        Module containing the object.
+    object_name: str
+        Name of the object within the module, for example ``"Class.method"``.
+    object_type: str, optional
+        Type of the object. The default value is ``"method"``.
+
+    Returns
+    -------
+    str or None
+        Content of the stub page, or ``None`` if the template is not supported.
+    """
+    if "{%" in template or "{#" in template:
+        return None
+    values = {
+        "name": object_name.split(".")[-1],
+        "objname": object_name,
+        "fullname": f"{module}.{object_name}",
+        "module": module,
+        "objtype": object_type,
+    }
+    filters = {
+        "escape": _rst_escape,
+        "underline": lambda text: f"{text}\n{'=' * len(text)}",
+    }
+    fields = _TEMPLATE_FIELD.findall(template)
+    for name, field_filters in fields:
+        field_filters = [item.strip() for item in field_filters.split("|")[1:]]
+        if name not in values or any(item not in filters for item in field_filters):
+            return None
+
+    def render(match):
+        value = values[match.group(1)]
+        for item in match.group(2).split("|")[1:]:
+            value = filters[item.strip()](value)
+        return value
+
+    return _TEMPLATE_FIELD.sub(render, template)
+
+
 def write_docs(
-    package_path: Path, package_structure: dict = None, config_path: Path = Path("config.yaml")
+    package_path: Path,
+    package_structure: dict = None,
+    config_path: Union[Path, Config] = Path("config.yaml"),
+    clean: bool = True,
+    file_writer: Union[FileWriter, None] = None,
+    autosummary_stubs: bool = False,
 ) -> Path:
     """Output to the autogenerated ``package`` directory.
 
@@ -657,32 +2019,48 @@ def write_docs(
     package_structure: dict, optional
         Dictionary with the following format:
         ``{'python_module_name': [{'python_class_name': python_names_list}]}``.
-    config_path: Path, optional
-        Path object of the configuration file. The default value is ``Path(config.yaml)``.
+    config_path: Path or Config, optional
+        Path object of the configuration file or loaded configuration.
+        The default value is ``Path(config.yaml)``.
+    clean: bool, optional
+        Whether the documentation pages that are not generated anymore must be deleted.
+        The default value is ``True``.
+    file_writer: FileWriter, optional
+        Writer used to write the files. Files whose content is unchanged are not rewritten.
+        The default value is ``None``.
+    autosummary_stubs: bool, optional
+        Whether to write the autosummary stub page of each method, so that Sphinx does not
+        need to generate them. The pages are rendered from the autosummary template of the
+        package, and ``autosummary_generate`` is then disabled in its ``conf.py`` file.
+        Nothing is changed if the package has no supported template. The default value
+        is ``False``.
 
     Returns
     -------
     Path
         Path to the new document page.
     """
-    library_name = get_config_data_value(config_path, "library_name_structured")
-    if type(library_name) == list:
-        if library_name[0] == "src":
-            library_name.pop(0)
-        subfolder_values = get_config_data_value(config_path, "subfolders")
-        if subfolder_values:
-            library_name.extend(subfolder_values)
-        library_name = ".".join(library_name)
-    else:
+    if file_writer is None:
+        file_writer = FileWriter()
+    config = load_config(config_path)
+    if not isinstance(config.library_name_structured, tuple):
         raise ValueError("library_name_structured should be a list of strings in the config file.")
+    library_name = config.library_import_name
+
+    documentation_subfolder = str(config.documentation_subfolder)
 
-    documentation_subfolder = str(get_config_data_value(config_path, "documentation_subfolder"))
+    doc_source_path = package_path / "doc" / "source"
+    doc_package_path = doc_source_path / documentation_subfolder
+    file_writer.make_dir(doc_package_path)
 
-    doc_package_path = package_path / "doc" / "source" / documentation_subfolder
-    if not doc_package_path.is_dir():
-        doc_package_path.mkdir(parents=True, exist_ok=True)
+    stub_template = None
+    if autosummary_stubs:
+        stub_template = _get_stub_template(doc_source_path, file_writer)
+        if stub_template is None:
+            logging.info("No supported autosummary template, the stub pages are not written.")
 
-    doc_src_content = """
+    doc_src_content = [
+        """
 API documentation
 ==================
 
@@ -690,16 +2068,16 @@ API documentation
    :maxdepth: 1
 
 """
+    ]
     for module_name in package_structure.keys():
-        doc_src_content += f"   {module_name}/index.rst\n"
+        doc_src_content.append(f"   {module_name}/index.rst\n")
 
     # Write the main doc file
     if documentation_subfolder != "":
         doc_src = doc_package_path / "index.rst"
     else:
         doc_src = doc_package_path / "docs.rst"
-    with open(doc_src, "w", encoding="utf-8") as fid:
-        fid.write(doc_src_content)
+    file_writer.write_text(doc_src, "".join(doc_src_content))
 
     if package_structure is not None:
         for module_folder_name, class_map in tqdm(
@@ -707,7 +2085,8 @@ API documentation
         ):
             module_title = module_folder_name.replace("_", " ").capitalize()
 
-            module_content = f"""
+            module_content = [
+                f"""
 .. _ref_{module_folder_name}:
 
 {module_title}
@@ -716,29 +2095,32 @@ API documentation
 .. list-table::
 
 """
+            ]
             for class_file_name in class_map.keys():
-                module_content += f"   * - :ref:`ref_{class_file_name}`\n"
+                module_content.append(f"   * - :ref:`ref_{class_file_name}`\n")
 
-            module_content += f"""
+            module_content.append(
+                f"""
 
 .. toctree::
    :maxdepth: 1
    :hidden:
 
 """
+            )
             for class_file_name in class_map.keys():
-                module_content += f"   {class_file_name}\n"
+                module_content.append(f"   {class_file_name}\n")
 
             # Write the module index file
             module_folder = doc_package_path / module_folder_name
-            module_folder.mkdir(parents=True, exist_ok=True)
             module_file = module_folder / "index.rst"
-            with open(module_file, "w", encoding="utf-8") as fid:
-                fid.write(module_content)
+            file_writer.write_text(module_file, "".join(module_content))
 
             for class_file_name, (class_name, method_list) in class_map.items():
+                class_module = f"{library_name}.{module_folder_name}.{class_file_name}"
 
-                class_content = f"""
+                class_content = [
+                    f"""
 .. _ref_{class_file_name}:
 
 
@@ -746,22 +2128,47 @@ API documentation
 {"=" * len(class_name)}
 
 
-.. currentmodule:: {library_name}.{module_folder_name}.{class_file_name}
+.. currentmodule:: {class_module}
 
-.. autoclass:: {library_name}.{module_folder_name}.{class_file_name}.{class_name}
+.. autoclass:: {class_module}.{class_name}
 
 .. autosummary::
-   :template: base.rst
+   :template: {AUTOSUMMARY_TEMPLATE}
    :toctree: _autosummary
 
 
 """
+                ]
                 for python_command_name in sorted(method_list):
-                    class_content += f"   {class_name}.{python_command_name}\n"
+                    class_content.append(f"   {class_name}.{python_command_name}\n")
 
                 # Write the class file
                 class_file = module_folder / f"{class_file_name}.rst"
-                with open(class_file, "w", encoding="utf-8") as fid:
-                    fid.write(class_content)
+                file_writer.write_text(class_file, "".join(class_content))
+
+                # Write the stub pages that Sphinx autosummary would otherwise generate
+                if stub_template is not None:
+                    for python_command_name in method_list:
+                        object_name = f"{class_name}.{python_command_name}"
+                        file_writer.write_text(
+                            module_folder / "_autosummary" / f"{class_module}.{object_name}.rst",
+                            get_autosummary_stub(stub_template, class_module, object_name),
+                        )
+
+    # Sphinx must not overwrite the stub pages
+    if stub_template is not None:
+        conf_path = doc_source_path / "conf.py"
+        conf = file_writer.read_text(conf_path)
+        # ``write_source`` already writes the final file when it writes the stubs too
+        if get_autosummary_conf(conf) != conf:
+            file_writer.write_text(conf_path, get_autosummary_conf(conf))
+
+    if clean:
+        if documentation_subfolder != "":
+            file_writer.remove_stale(doc_package_path)
+        elif package_structure is not None:
+            for module_folder_name in package_structure.keys():
+                file_writer.remove_stale(doc_package_path / module_folder_name)
+    logging.info(f"Documentation files: {file_writer.summary}")
 
     return doc_src
@@ -0,0 +1,119 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import zipfile
+
+from pyconverter.xml2py.archive import ArchiveWriter, WheelWriter, get_core_metadata
+from pyconverter.xml2py.cli import create_package
+from pyconverter.xml2py.synth import write_corpus
+import pytest
+
+
+def test_archive_writer(tmp_path):
+    package_path = tmp_path / "package"
+    source_file = tmp_path / "README.rst"
+    source_file.write_text("Readme\n")
+    file_writer = ArchiveWriter(tmp_path / "package.zip", package_path, prefix="package/")
+    file_writer.make_dir(package_path / "src")
+    file_writer.write_text(package_path / "src" / "b.py", "b = 1\n")
+    file_writer.write_text(package_path / "src" / "a.py", "a = 1\n")
+    file_writer.copy_file(source_file, package_path / "README.rst")
+    file_writer.write_text(tmp_path / "outside.py", "")
+
+    assert not (package_path / "src").exists()
+    assert file_writer.is_dir(package_path / "src")
+    assert file_writer.list_dir(package_path / "src") == [
+        package_path / "src" / "a.py",
+        package_path / "src" / "b.py",
+    ]
+    assert file_writer.read_text(package_path / "README.rst") == "Readme\n"
+
+    archive_path = file_writer.close()
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.namelist() == ["package/README.rst", "package/src/a.py", "package/src/b.py"]
+        assert archive.read("package/src/a.py") == b"a = 1\n"
+    first_content = archive_path.read_bytes()
+    assert file_writer.close().read_bytes() == first_content
+
+
+def test_wheel_writer(cwd, tmp_path):
+    package_path = tmp_path / "package"
+    file_writer = WheelWriter(tmp_path, package_path, cwd / "_package")
+    init_file = package_path / "src" / "pyconverter" / "generatedcommands" / "__init__.py"
+    file_writer.write_text(init_file, "")
+    file_writer.write_text(package_path / "doc" / "index.rst", "")
+
+    wheel_path = file_writer.close()
+    assert wheel_path.name == "pyconverter_generatedcommands-0.1.dev0-py3-none-any.whl"
+    dist_info = "pyconverter_generatedcommands-0.1.dev0.dist-info"
+    with zipfile.ZipFile(wheel_path) as archive:
+        assert archive.namelist() == [
+            "pyconverter/generatedcommands/__init__.py",
+            f"{dist_info}/METADATA",
+            f"{dist_info}/WHEEL",
+            f"{dist_info}/licenses/LICENSE",
+            f"{dist_info}/RECORD",
+        ]
+        metadata = archive.read(f"{dist_info}/METADATA").decode()
+        wheel = archive.read(f"{dist_info}/WHEEL").decode()
+        record = archive.read(f"{dist_info}/RECORD").decode().splitlines()
+    assert "Name: pyconverter-generatedcommands\n" in metadata
+    assert "Tag: py3-none-any\n" in wheel
+    assert record[0].startswith("pyconverter/generatedcommands/__init__.py,sha256=")
+    assert record[-1] == f"{dist_info}/RECORD,,"
+
+
+@pytest.mark.parametrize("autosummary_stubs", [False, True])
+def test_create_package_wheel(cwd, tmp_path, autosummary_stubs):
+    xml_path = write_corpus(tmp_path / "xml_doc", commands=20, commands_per_group=10)
+    create_package(
+        xml_path,
+        tmp_path / "target",
+        cwd / "_package",
+        cwd / "tests" / "customized_functions",
+        output_format="wheel",
+        autosummary_stubs=autosummary_stubs,
+    )
+    (wheel_path,) = (tmp_path / "target").glob("*.whl")
+    with zipfile.ZipFile(wheel_path) as archive:
+        names = archive.namelist()
+    assert "pyconverter/generatedcommands/__init__.py" in names
+    assert not any(name.startswith("doc/") for name in names)
+    assert not (tmp_path / "target" / "package").exists()
+
+
+def test_get_core_metadata():
+    project = {
+        "name": "package",
+        "version": "1.0",
+        "readme": "README.md",
+        "optional-dependencies": {"doc": ["sphinx", "numpy; python_version < '3.12'"]},
+    }
+    metadata = get_core_metadata(project, "Readme")
+    assert 'Requires-Dist: sphinx ; extra == "doc"\n' in metadata
+    assert "Requires-Dist: numpy ; (python_version < '3.12') and extra == \"doc\"\n" in metadata
+    assert metadata.endswith("Description-Content-Type: text/markdown\n\nReadme")
+
+
+def test_wheel_writer_dynamic_version(tmp_path):
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "package"\ndynamic = ["version"]\n')
+    with pytest.raises(ValueError):
+        WheelWriter(tmp_path, tmp_path / "package", tmp_path)
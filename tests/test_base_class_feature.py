@@ -79,3 +79,11 @@ def test_global_wildcard_pattern(base_class_test_config):
     assert result is not None
     assert result["class_name"] == "CommandsBase"
     assert result["module"] == "ansys.mapdl.core._commands"
+
+
+def test_pattern_result_keys(base_class_test_config):
+    """Test that the result only has the documented keys."""
+
+    result = get_base_class_for_pattern(base_class_test_config, "prep7", "Meshing")
+
+    assert set(result) == {"module", "class_name"}
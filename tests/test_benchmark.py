@@ -0,0 +1,128 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import runpy
+
+from pyconverter.xml2py.benchmark import (
+    benchmark_import,
+    format_import_results,
+    get_command_strings_benchmark,
+    get_package_sizes,
+    parse_importtime,
+)
+from pyconverter.xml2py.formatter import format_source
+
+
+def test_command_strings_benchmark(tmp_path, capsys):
+    entries = [
+        ("K", ("npt", "x"), 'f"K,{npt},{x},"', 'f"K,{npt},{x},".rstrip(",")'),
+        ("/SHOW", (), 'f"/SHOW,,"', 'f"/SHOW,,".rstrip(",")'),
+    ]
+    source = get_command_strings_benchmark(entries)
+    assert 'def _trimmed_0(npt="", x=""):\n' in source
+    benchmark_path = tmp_path / "bench_command_strings.py"
+    benchmark_path.write_text(source)
+
+    namespace = runpy.run_path(str(benchmark_path))
+    (_, full, trimmed, has_args), (_, show, trimmed_show, show_has_args) = namespace["COMMANDS"]
+    assert (full(), trimmed(), trimmed("1")) == ("K,,,", "K", "K,1")
+    assert has_args and not show_has_args
+    assert (show(), trimmed_show()) == ("/SHOW,,", "/SHOW")
+
+    namespace["main"](10)
+    output = capsys.readouterr().out
+    assert "Commands: 2, calls per mode: 30\n" in output
+    assert "Full command strings: 160 bytes" in output
+    assert "Trimmed command strings: 90 bytes" in output
+
+
+def test_command_strings_benchmark_line_length(tmp_path):
+    arg_names = tuple(f"value{index}" for index in range(20))
+    fields = "".join(f"\\x00{{{arg_name}}}" for arg_name in arg_names)
+    entries = [
+        (
+            "*LONGCOMMAND",
+            arg_names,
+            f'f"*LONGCOMMAND{fields}".replace("\\x00", ",")',
+            f'f"*LONGCOMMAND{fields}".rstrip("\\x00").replace("\\x00", ",")',
+        )
+    ]
+    source = format_source(get_command_strings_benchmark(entries, line_length=88), 88)
+    assert max(len(line) for line in source.splitlines()) <= 88
+    benchmark_path = tmp_path / "bench_command_strings.py"
+    benchmark_path.write_text(source)
+
+    namespace = runpy.run_path(str(benchmark_path))
+    (_, full, trimmed, _) = namespace["COMMANDS"][0]
+    assert full("1") == "*LONGCOMMAND,1" + "," * 19
+    assert trimmed("1") == "*LONGCOMMAND,1"
+    assert trimmed(*arg_names) == ",".join(("*LONGCOMMAND",) + arg_names)
+
+
+def test_parse_importtime():
+    output = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        40 |         40 |     keypoints.prep7.base
+import time:       300 |        340 |   keypoints.prep7
+import time:       500 |        840 | keypoints
+"""
+    assert parse_importtime(output, "keypoints") == {
+        "keypoints.prep7.base": (40, 40),
+        "keypoints.prep7": (300, 340),
+        "keypoints": (500, 840),
+    }
+
+
+def test_benchmark_import(tmp_path):
+    package_path = tmp_path / "keypoints"
+    (package_path / "prep7").mkdir(parents=True)
+    (package_path / "__init__.py").write_text("")
+    (package_path / "prep7" / "__init__.py").write_text("VALUE = 1\n")
+    # Other packages of the directory are not counted
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "__init__.py").write_text("OTHER = 1\n")
+    (tmp_path / "single.py").write_text("SINGLE = 1\n")
+
+    results = benchmark_import(tmp_path, "keypoints", runs=2, submodules=True)
+    assert (results["runs"], results["source_files"]) == (2, 2)
+    assert results["source_bytes"] == len("VALUE = 1\n")
+    assert results["import_time"] > 0 and results["process_time"] > results["import_time"]
+    assert list(results["modules"]) == ["keypoints", "keypoints.prep7"]
+
+    report = format_import_results(
+        results, baseline=dict(results, import_time=results["import_time"] * 2)
+    )
+    assert "import_time: " in report and "-50.0 %)" in report
+    assert "  keypoints.prep7: " in report
+
+
+def test_get_package_sizes(tmp_path):
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "single.py").write_text("SINGLE = 1\n")
+    (tmp_path / "__pycache__" / "single.cpython-312.pyc").write_bytes(b"pyc")
+    (tmp_path / "__pycache__" / "other.cpython-312.pyc").write_bytes(b"other pyc")
+    assert get_package_sizes(tmp_path, "single") == {
+        "source_files": 1,
+        "source_bytes": 11,
+        "bytecode_bytes": 3,
+    }
+    assert get_package_sizes(tmp_path)["bytecode_bytes"] == 12
+    assert get_package_sizes(tmp_path, "missing")["source_files"] == 0
@@ -34,8 +34,10 @@ def test_cli_main_group():
         in result.output
     )
 
-    assert "package  Create a Python package from your XML documentation." in result.output
-    assert "version  Display current version." in result.output
+    assert "bench-import  Measure the import cost of an autogenerated package." in result.output
+    assert "package       Create a Python package from your XML documentation." in result.output
+    assert "synth         Generate a synthetic XML documentation for benchmarks." in result.output
+    assert "version       Display current version." in result.output
 
 
 def test_cli_main_package_group():
@@ -0,0 +1,66 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from pyconverter.xml2py.command_batch import CommandBatch
+import pytest
+
+
+class Keypoints:
+    def __init__(self):
+        self.inputs = []
+
+    def input_strings(self, block):
+        self.inputs.append(block)
+        return len(self.inputs)
+
+    def k(self, npt="", x="", y="", z="", **kwargs):
+        return self._fmt_k(npt, x, y, z)
+
+    @staticmethod
+    def _fmt_k(npt="", x="", y="", z="") -> str:
+        """Format the ``K`` command string."""
+        return f"K,{npt},{x},{y},{z}"
+
+
+def test_command_batch():
+    keypoints = Keypoints()
+    with CommandBatch(keypoints) as batch:
+        for i in range(3):
+            batch.k(i + 1, i, y=0)
+        batch.add("KLIST")
+        assert batch.k.__doc__ == "Format the ``K`` command string."
+        assert "k" in vars(batch)
+    assert keypoints.inputs == ["K,1,0,0,\nK,2,1,0,\nK,3,2,0,\nKLIST"]
+    assert batch.lines == []
+    assert batch.submit() is None
+
+    with pytest.raises(AttributeError):
+        batch.kdist()
+
+
+def test_command_batch_error():
+    submitted = []
+    with pytest.raises(ValueError):
+        with CommandBatch(Keypoints(), submit=submitted.append) as batch:
+            batch.k(1)
+            raise ValueError("Failed batch.")
+    assert submitted == []
+    assert batch.lines == []
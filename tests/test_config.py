@@ -0,0 +1,79 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import dataclasses
+
+from pyconverter.xml2py.config import load_config
+from pyconverter.xml2py.utils.utils import get_config_data_value, get_library_path
+import pytest
+
+
+def test_load_config_once(base_class_test_config):
+    config = load_config(base_class_test_config)
+    assert load_config(base_class_test_config) is config
+    assert load_config(config) is config
+    assert config.library_name_structured == ("pyconverter", "generatedcommands")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.project_name = "Other"
+
+
+def test_config_values_are_not_shared(base_class_test_config, tmp_path):
+    library_name = get_config_data_value(base_class_test_config, "library_name_structured")
+    library_name.append("subfolder")
+    assert get_library_path(tmp_path, base_class_test_config) == (
+        tmp_path / "src" / "pyconverter" / "generatedcommands"
+    )
+    assert load_config(base_class_test_config).library_import_name == (
+        "pyconverter.generatedcommands"
+    )
+
+
+def test_base_class_rules_are_memoized(base_class_test_config):
+    config = load_config(base_class_test_config)
+    assert config.get_base_class("apdl", "Abbreviations")["class_name"] == "APDLBase"
+    assert "apdl/Abbreviations" in config._base_class_cache
+
+
+def test_base_class_slots(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        """
+base_class:
+  slots: true
+  rules:
+    - pattern: "apdl/*"
+      module: "base"
+      class_name: "APDLBase"
+      slots: false
+    - pattern: "*"
+      module: "base"
+      class_name: "CommandsBase"
+"""
+    )
+    config = load_config(config_file)
+    assert config.class_slots
+    assert config.get_base_class("apdl", "Abbreviations") == {
+        "module": "base",
+        "class_name": "APDLBase",
+        "slots": False,
+    }
+    assert config.get_base_class("prep7", "Keypoints")["slots"]
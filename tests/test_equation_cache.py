@@ -0,0 +1,110 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from lxml.html import fromstring
+import pyconverter.xml2py.ast_tree as ast
+from pyconverter.xml2py import equation_cache
+from pyconverter.xml2py.equation_cache import EquationCache, mathml_to_latex, normalize_mathml
+from pyconverter.xml2py.synth import write_corpus
+import pyconverter.xml2py.writer as wrt
+
+MATHML = "<math><mi>x</mi><mo>=</mo><mfrac><mn>1</mn><mn>2</mn></mfrac></math>"
+
+
+def test_equation_cache_persistence(tmp_path):
+    cache_path = tmp_path / "equations.json"
+    cache = EquationCache(cache_path)
+    assert cache.convert_all([MATHML, MATHML]) == 1
+    assert cache.get(MATHML) == "$ x=\\frac{1}{2}$"
+    cache.save()
+
+    cache = EquationCache(cache_path)
+    assert MATHML in cache
+    assert cache.convert_all([MATHML]) == 0
+
+
+def test_math_element_uses_cache():
+    cache = EquationCache()
+    element = fromstring(f"<para><informalequation>{MATHML}</informalequation></para>")
+    ast.set_equation_conversion(True, cache)
+    try:
+        math = ast.Element(element)[0]
+    finally:
+        ast.set_equation_conversion(False)
+    assert isinstance(math, ast.InformalEquation)
+    assert normalize_mathml(MATHML) in cache
+    assert len(cache) == 1
+    assert math.equation == "x=\\frac{1}{2}"
+    assert "x=\\frac{1}{2}" in math.to_rst()
+
+
+def test_failed_equations_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(equation_cache, "mathml_to_latex", lambda mathml: "")
+    cache_path = tmp_path / "equations.json"
+    cache = EquationCache(cache_path)
+    assert cache.get(MATHML) == ""
+    assert cache.convert_all([MATHML]) == 0
+    assert MATHML not in cache
+    cache.save()
+    assert not cache_path.exists()
+
+
+def test_convert_equations_upfront(tmp_path, monkeypatch):
+    corpus_path = tmp_path / "corpus"
+    write_corpus(corpus_path, 1)
+    xml_file = corpus_path / "xml" / "cmds" / "cmd0.xml"
+    xml_file.write_text(
+        xml_file.read_text().replace(
+            "<title>Notes</title>",
+            f"<title>Notes</title><informalequation>{MATHML}</informalequation>",
+        )
+    )
+    converted = []
+    in_batch = []
+    convert_all = EquationCache.convert_all
+
+    def convert_batch(self, mathml_list, max_workers=1):
+        in_batch.append(True)
+        try:
+            return convert_all(self, mathml_list, max_workers)
+        finally:
+            in_batch.pop()
+
+    def convert_mathml(mathml):
+        converted.append((mathml, bool(in_batch)))
+        return mathml_to_latex(mathml)
+
+    monkeypatch.setattr(EquationCache, "convert_all", convert_batch)
+    monkeypatch.setattr(equation_cache, "mathml_to_latex", convert_mathml)
+    cache_path = tmp_path / "equations.json"
+    try:
+        command_map, _ = wrt.convert(
+            corpus_path, convert_equations=True, equation_cache_path=cache_path
+        )
+        (command,) = command_map.values()
+        notes = "".join(note.to_rst() for note in command.notes)
+    finally:
+        ast.set_equation_conversion(False)
+    # the equation is converted in a single batch before the commands are parsed
+    assert converted == [(normalize_mathml(MATHML), True)]
+    assert normalize_mathml(MATHML) in EquationCache(cache_path)
+    assert "x=\\frac{1}{2}" in notes
@@ -0,0 +1,78 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from pathlib import Path
+import subprocess
+
+from pyconverter.xml2py import formatter
+import pytest
+
+
+def test_get_black_line_length(cwd, tmp_path):
+    assert formatter.get_black_line_length(cwd / "_package" / ".pre-commit-config.yaml") == 88
+    assert formatter.get_black_line_length(tmp_path / ".pre-commit-config.yaml") == 88
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_format_sources(tmp_path, max_workers):
+    sources = {
+        tmp_path / "a.py": "class A:\n\n    def a(self, x = 1):\n        return x\n",
+        tmp_path / "b.py": "b  =  'b'\n",
+    }
+    formatted = formatter.format_sources(sources, max_workers=max_workers)
+    assert list(formatted) == list(sources)
+    assert formatted[tmp_path / "a.py"] == "class A:\n    def a(self, x=1):\n        return x\n"
+    assert formatted[tmp_path / "b.py"] == 'b = "b"\n'
+
+
+def test_format_sources_invalid(tmp_path):
+    with pytest.raises(RuntimeError):
+        formatter.format_sources({tmp_path / "a.py": "def a(:\n"})
+
+
+def test_run_pre_commit_files(tmp_path, monkeypatch):
+    package_path = tmp_path / "package"
+    package_path.mkdir()
+    (package_path / ".pre-commit-config.yaml").write_text("repos: []\n")
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append((args, kwargs["cwd"]))
+        return subprocess.CompletedProcess(args, 1)
+
+    monkeypatch.setattr(formatter.subprocess, "run", run)
+    with pytest.raises(RuntimeError):
+        formatter.run_pre_commit(
+            package_path, [package_path / "src" / "a.py", package_path / "doc" / "b.rst"], 1
+        )
+    assert len(calls) == 1
+    args, cwd = calls[0]
+    assert cwd == package_path
+    assert args[args.index("--files") + 1 : args.index("--config")] == [
+        str(Path("src") / "a.py"),
+        str(Path("doc") / "b.rst"),
+    ]
+
+    with pytest.raises(RuntimeError):
+        formatter.run_pre_commit(package_path, [package_path / "src" / "a.py"])
+    assert len(calls) == 11
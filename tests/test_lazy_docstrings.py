@@ -0,0 +1,85 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import importlib
+import inspect
+import shutil
+import sys
+
+from pyconverter.xml2py import lazy_docstrings
+from pyconverter.xml2py.writer import get_runtime_outputs
+
+SOURCE = '''import re
+
+
+class Keypoints:
+    def k(self, npt=""):
+        r"""Defines a keypoint.
+
+        Parameters
+        ----------
+        npt : str
+            Reference number for keypoint.
+        """
+        return f"K,{npt}"
+
+    def kl(self):
+        return "KL"
+'''
+
+
+def test_pack_docstrings():
+    docstrings = {"Keypoints.kl": "Generates a keypoint.", "Keypoints.k": "Defines a keypoint µ."}
+    content = lazy_docstrings.pack_docstrings(docstrings)
+    assert content == lazy_docstrings.pack_docstrings(dict(reversed(docstrings.items())))
+    index, start = lazy_docstrings.read_index(content)
+    for name, docstring in docstrings.items():
+        assert lazy_docstrings.unpack_docstring(content, index, start, name) == docstring
+    assert lazy_docstrings.unpack_docstring(content, index, start, "Keypoints.kdist") is None
+
+
+def test_lazy_docstrings(tmp_path, monkeypatch):
+    package_path = tmp_path / "lazypackage"
+    package_path.mkdir()
+    (package_path / "__init__.py").write_text("")
+    shutil.copy(lazy_docstrings.__file__, package_path / "_lazy_docstrings.py")
+    decorator_import = "from lazypackage._lazy_docstrings import lazy_docstrings"
+    sources, resources = get_runtime_outputs(
+        package_path / "keypoints.py", SOURCE, lazy_docstrings_import=decorator_import
+    )
+    assert list(resources) == [package_path / "keypoints.docstrings.z"]
+    source = sources[package_path / "keypoints.py"]
+    assert f"import re\n{decorator_import}\n\n\n@lazy_docstrings\nclass Keypoints:\n" in source
+    assert '        r"""Defines a keypoint."""\n' in source
+    (package_path / "keypoints.py").write_text(source)
+    (package_path / "keypoints.docstrings.z").write_bytes(
+        resources[package_path / "keypoints.docstrings.z"]
+    )
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    keypoints = importlib.import_module("lazypackage.keypoints")
+    assert type(vars(keypoints.Keypoints)["k"]).__name__ == "LazyDocstring"
+    assert "Reference number for keypoint." in inspect.getdoc(keypoints.Keypoints.k)
+    assert inspect.isfunction(vars(keypoints.Keypoints)["k"])
+    assert keypoints.Keypoints().k(1) == "K,1"
+    assert keypoints.Keypoints().kl() == "KL"
+    for module_name in ("lazypackage", "lazypackage._lazy_docstrings", "lazypackage.keypoints"):
+        monkeypatch.delitem(sys.modules, module_name)
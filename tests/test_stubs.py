@@ -0,0 +1,132 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import inspect
+
+from pyconverter.xml2py.stubs import get_stub_source, shorten_docstrings, tabulate_commands
+import pytest
+
+SOURCE = '''import re
+
+
+class Keypoints:
+
+    def k(self, npt="", **kwargs):
+        r"""Defines a keypoint.
+
+        Parameters
+        ----------
+        npt : str
+            Reference number for keypoint, with the unit "µm".
+        """
+        command = f"K,{npt}"
+        return self.run(command, **kwargs)
+
+    def kl(self):
+        r"""
+        Generates a keypoint at a specified location on an existing line\\
+        """
+        return self.run("KL")
+
+    def kdist(self):
+        return self.run("KDIST")
+'''
+
+
+def test_shorten_docstrings():
+    source = shorten_docstrings(SOURCE)
+    assert '        r"""Defines a keypoint."""\n        command = f"K,{npt}"\n' in source
+    assert 'r"""Generates a keypoint at a specified location on an existing line\\ """' in source
+    assert '    def kdist(self):\n        return self.run("KDIST")\n' in source
+    namespace = {}
+    exec(compile(source, "keypoints.py", "exec"), namespace)
+    assert namespace["Keypoints"].k.__doc__ == "Defines a keypoint."
+
+
+def test_get_stub_source():
+    stub = get_stub_source(SOURCE)
+    assert stub.startswith("import re\n\n\nclass Keypoints:\n")
+    assert (
+        '            Reference number for keypoint, with the unit "µm".\n        """\n        ...\n'
+        in stub
+    )
+    assert "self.run" not in stub
+    assert "    def kdist(self):\n        ...\n" in stub
+    compile(stub, "keypoints.pyi", "exec")
+
+
+COMMAND_SOURCE = '''from typing import Optional
+
+
+class Keypoints:
+
+    def k(self, npt: int | str = "", x="", y="", **kwargs):
+        r"""Defines a keypoint."""
+        command = f"K,{npt},,{x},{y}"
+        return self.run(command, **kwargs)
+
+    def kplot(self, **kwargs):
+        command = "KPLOT"
+        return self.run(command, **kwargs)
+
+    def kdist(self, kp1="", **kwargs) -> Optional[str]:
+        command = f"KDIST,{kp1}"
+        return self.run(command, **kwargs)
+
+    def kl(self, nl1="", **kwargs):
+        command = f"KL,{nl1},ALL"
+        return self.run(command, **kwargs)
+'''
+
+
+class Runner:
+    def run(self, command, **kwargs):
+        return command, kwargs
+
+
+def _load_class(source):
+    namespace = {}
+    exec(compile(source, "keypoints.py", "exec"), namespace)
+    return type("Keypoints", (namespace["Keypoints"], Runner), {})
+
+
+def test_tabulate_commands():
+    source = tabulate_commands(
+        COMMAND_SOURCE, "from pyconverter.xml2py.command_table import command_table"
+    )
+    assert "@command_table(_KEYPOINTS_COMMANDS)\nclass Keypoints:\n" in source
+    assert "def k(" not in source and "def kplot(" not in source
+    assert "def kdist(" in source and "def kl(" in source
+
+    original, tabulated = _load_class(COMMAND_SOURCE)(), _load_class(source)()
+    for name in ("k", "kplot", "kdist", "kl"):
+        assert inspect.signature(getattr(original, name)) == inspect.signature(
+            getattr(tabulated, name)
+        )
+        assert getattr(original, name).__doc__ == getattr(tabulated, name).__doc__
+    assert tabulated.k.__qualname__ == "Keypoints.k"
+    for args, kwargs in [((), {}), ((1, 2.5), {"y": "A", "mute": True}), ((1,), {"x": 0})]:
+        assert original.k(*args, **kwargs) == tabulated.k(*args, **kwargs)
+    assert tabulated.kplot() == ("KPLOT", {})
+    with pytest.raises(TypeError):
+        tabulated.k(1, 2, 3, 4)
+    with pytest.raises(TypeError):
+        tabulated.k(1, npt=2)
@@ -0,0 +1,56 @@
+# Copyright (C) 2023 - 2026 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pyconverter.xml2py.directory_format as ff
+from pyconverter.xml2py.synth import write_corpus
+import pyconverter.xml2py.writer as wrt
+import pytest
+
+
+def test_write_corpus(tmp_path):
+    corpus_path = write_corpus(tmp_path / "xml_doc", commands=40, commands_per_group=10)
+    paths = ff.get_paths(corpus_path)
+    assert all(path.is_dir() for path in paths)
+    assert len(list((corpus_path / "xml").glob("**/*.xml"))) == 40
+    assert len(list((corpus_path / "links").glob("*.db"))) == 1
+
+    command_map, name_map = wrt.convert(corpus_path)
+    assert len(command_map) == 40
+    assert len(name_map) == 40
+    assert set(command_map) == set(name_map)
+
+    content = (corpus_path / "xml" / "cmds" / "cmd0.xml").read_text(encoding="utf-8")
+    write_corpus(tmp_path / "xml_doc", commands=40, commands_per_group=10)
+    assert (corpus_path / "xml" / "cmds" / "cmd0.xml").read_text(encoding="utf-8") == content
+
+
+def test_write_corpus_proportions(tmp_path):
+    corpus_path = write_corpus(
+        tmp_path, commands=20, proportions={"tables": 1, "graphics": 1, "links": 0}
+    )
+    for xml_path in (corpus_path / "xml").glob("**/*.xml"):
+        content = xml_path.read_text(encoding="utf-8")
+        assert "<informaltable>" in content and "<graphic " in content
+        assert "<link " not in content
+
+    with pytest.raises(ValueError, match="Invalid proportions equations"):
+        write_corpus(tmp_path, commands=1, proportions={"equations": 1})
@@ -20,8 +20,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import importlib
+from pathlib import Path
 import shutil
+import sys
 
+import pyconverter.xml2py.ast_tree as ast
+from pyconverter.xml2py.synth import write_corpus
 import pyconverter.xml2py.writer as wrt
 import pytest
 
@@ -44,6 +49,61 @@ def test_convert(command_map, custom_functions, comment_command_dict):
     assert "import re" in command_map["K"].to_python(custom_functions, comment_command_dict)
 
 
+def test_command_builders(command_map, custom_functions, comment_command_dict):
+    assert (
+        command_map["E"].py_source(custom_functions, command_builders=True)
+        == "    command = self._fmt_e(i, j, k, l, m, n, o, p)\n    return self.run(command, **kwargs)\n"  # noqa : E501
+    )
+    source = command_map["E"].to_python(
+        custom_functions, comment_command_dict, command_builders=True
+    )
+    assert '@staticmethod\ndef _fmt_e(i: str = "",' in source
+    assert 'return f"E,{i},{j},{k},{l},{m},{n},{o},{p}"\n' in source
+
+
+def test_trim_empty_fields(command_map, custom_functions):
+    assert (
+        command_map["E"].py_source(custom_functions, trim_empty_fields=True)
+        == '    command = f"E\\x00{i}\\x00{j}\\x00{k}\\x00{l}\\x00{m}\\x00{n}\\x00{o}\\x00{p}".rstrip("\\x00").replace("\\x00", ",")\n    return self.run(command, **kwargs)\n'  # noqa : E501
+    )
+
+
+@pytest.fixture
+def keypoint_command(tmp_path):
+    xml_path = write_corpus(tmp_path / "xml_doc", commands=1)
+    arguments = "".join(f", <replaceable>{arg}</replaceable>" for arg in ("NPT", "X", "Y", "Z"))
+    (xml_path / "xml" / "cmds" / "cmd0.xml").write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n<reference><refentry id="Hlp_C_K">'
+        '<refmeta filename="Hlp_C_K.html"><refentrytitle>K</refentrytitle></refmeta>'
+        f"<refnamediv><refname>K{arguments}</refname><refpurpose>Defines a keypoint."
+        "</refpurpose><refclass>&grp0;</refclass></refnamediv></refentry></reference>\n",
+        encoding="utf-8",
+    )
+    return wrt.convert(xml_path)[0]["K"]
+
+
+def test_trim_empty_fields_values(keypoint_command):
+    source = keypoint_command.py_builder(trim_empty_fields=True)
+    namespace = {}
+    exec(source.replace("@staticmethod\n", ""), namespace)
+    fmt_k = namespace["_fmt_k"]
+    assert fmt_k() == "K"
+    assert fmt_k("1") == "K,1"
+    assert fmt_k("1", "", "2") == "K,1,,2"
+    assert fmt_k("", "", "", "3") == "K,,,,3"
+    assert fmt_k("P1,") == "K,P1,"
+    assert fmt_k("1", "", "", "a,b,") == "K,1,,,a,b,"
+
+
+def test_command_builders_values(keypoint_command):
+    source = keypoint_command.to_python(comment_command_dict={}, command_builders=True)
+    assert "command = self._fmt_k(npt, x, y, z)\n" in source
+    assert 'return f"K,{npt},{x},{y},{z}"\n' in source
+    namespace = {}
+    exec(keypoint_command.py_builder().replace("@staticmethod\n", ""), namespace)
+    assert namespace["_fmt_k"]("1", z="3,") == "K,1,,,3,"
+
+
 def test_copy_template_package(cwd):
     new_package_path = cwd / "tmp_directory"
     if new_package_path.is_dir():
@@ -59,6 +119,423 @@ def test_copy_template_package(cwd):
     shutil.rmtree(new_package_path)
 
 
+def test_class_file():
+    class_file = wrt.ClassFile("Keypoints", {"module": "base", "class_name": "Base"})
+    class_file.add_method(["import re"], "\n    def k(self):\n        pass\n")
+    class_file.add_method(["import re", "import parse"], "\n    def kl(self):\n        pass\n")
+    source = class_file.source
+    assert source.startswith(
+        "import re\nimport parse\nfrom base import Base\n\nclass Keypoints(Base):\n"
+    )
+    assert source.count("import re") == 1
+    assert source.index("def k(") < source.index("def kl(")
+    compile(source, "keypoints.py", "exec")
+
+
+def test_class_file_slots():
+    class_file = wrt.ClassFile("Keypoints", slots=True)
+    class_file.add_method([], "\n    def k(self):\n        pass\n", "k")
+    assert class_file.source.startswith("class Keypoints:\n    __slots__ = ()\n\n    def k(self):")
+    assert class_file.get_method_name(4) == "k"
+    namespace = {}
+    exec(class_file.source, namespace)
+    assert not hasattr(namespace["Keypoints"](), "__dict__")
+
+
+def test_get_method_collisions():
+    package_structure = {
+        "prep7": {"keypoints": ["Keypoints", ["k", "kl", "__init__"]]},
+        "apdl": {
+            "abbreviations": ["Abbreviations", ["abbr", "abbr"]],
+            "macro_files": ["MacroFiles", ["k", "__init__"]],
+        },
+    }
+    assert wrt.get_method_collisions(package_structure) == {
+        "k": ["prep7.keypoints.Keypoints", "apdl.macro_files.MacroFiles"]
+    }
+
+
+def test_check_collisions_before_writing(tmp_path, cwd, path_custom_functions):
+    xml_path = write_corpus(tmp_path / "xml_doc", commands=1)
+    command_map, name_map = wrt.convert(xml_path)
+    template_path = tmp_path / "template"
+    shutil.copytree(cwd / "_package", template_path)
+    template_module = template_path / "src" / "pyconverter" / "generatedcommands"
+    template_module = template_module / "subfolder" / "subsubfolder" / "apdl"
+    template_module.mkdir(parents=True)
+    method_name = name_map[next(iter(command_map))]
+    (template_module / "extra.py").write_text(f"class Extra:\n    def {method_name}(self):\n")
+
+    target_path = tmp_path / "target"
+    with pytest.raises(RuntimeError, match=f"Method '{method_name}'"):
+        wrt.write_source(
+            command_map,
+            name_map,
+            xml_path,
+            target_path,
+            path_custom_functions,
+            template_path=template_path,
+            config_path=cwd / "config.yaml",
+            check_collisions=True,
+        )
+    assert not [path for path in target_path.rglob("*") if path.is_file()]
+
+
+def test_validate_sources(tmp_path):
+    class_file = wrt.ClassFile("Keypoints")
+    class_file.add_method([], "\n    def k(self):\n        pass\n", "k")
+    class_file.add_method([], "\n    def kl(self):\n        return (\n", "kl")
+    valid_path, invalid_path = tmp_path / "valid.py", tmp_path / "keypoints.py"
+    errors = wrt.validate_sources({valid_path: "x = 1\n", invalid_path: class_file.source})
+    assert list(errors) == [invalid_path]
+    assert class_file.get_method_name(errors[invalid_path][0]) == "kl"
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_precompile_sources(tmp_path, monkeypatch, max_workers):
+    package_path = tmp_path / "precompiled"
+    package_path.mkdir()
+    (package_path / "__init__.py").write_text("")
+    source = b'def k(npt=""):\n    """Define a keypoint."""\n    return f"K,{npt}"\n'
+    (package_path / "keypoints.py").write_bytes(source)
+    sources = {package_path / "keypoints.py": source}
+    bytecode = wrt.precompile_sources(
+        sources,
+        tmp_path,
+        optimizations=(0, 2),
+        invalidation_mode="unchecked-hash",
+        max_workers=max_workers,
+    )
+    pycache_path = package_path / "__pycache__"
+    assert sorted(bytecode) == sorted(
+        [
+            pycache_path / f"keypoints.{sys.implementation.cache_tag}.pyc",
+            pycache_path / f"keypoints.{sys.implementation.cache_tag}.opt-2.pyc",
+        ]
+    )
+    assert bytecode == wrt.precompile_sources(
+        sources, tmp_path, optimizations=(0, 2), invalidation_mode="unchecked-hash"
+    )
+    for pyc_path, content in bytecode.items():
+        pyc_path.parent.mkdir(exist_ok=True)
+        pyc_path.write_bytes(content)
+
+    # Unchecked bytecode is used even if the source changes
+    (package_path / "keypoints.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    keypoints = importlib.import_module("precompiled.keypoints")
+    assert keypoints.k(1) == "K,1"
+    assert keypoints.k.__doc__ == "Define a keypoint."
+    assert keypoints.k.__code__.co_filename.endswith("keypoints.py")
+
+    with pytest.raises(ValueError):
+        wrt.precompile_sources(sources, tmp_path, invalidation_mode="timestamp")
+
+
+def test_file_writer(tmp_path):
+    file_writer = wrt.FileWriter()
+    assert file_writer.write_text(tmp_path / "module" / "a.py", "a = 1\n")
+    (tmp_path / "module" / "stale.py").write_text("b = 1\n")
+    (tmp_path / "old_module").mkdir()
+    (tmp_path / "old_module" / "__init__.py").write_text("")
+
+    file_writer = wrt.FileWriter()
+    assert not file_writer.write_text(tmp_path / "module" / "a.py", "a = 1\n")
+    assert file_writer.write_text(tmp_path / "module" / "c.py", "c = 1\n")
+    file_writer.remove_stale(tmp_path)
+    assert sorted(path.name for path in tmp_path.rglob("*")) == ["a.py", "c.py", "module"]
+    assert file_writer.summary == "1 written, 1 unchanged, 2 deleted files"
+
+
+def copy_doc_configuration(cwd, package_path, file_writer):
+    for file_name in ("conf.py", "_templates/base.rst"):
+        source = cwd / "_package" / "doc" / "source" / file_name
+        file_writer.copy_file(source, package_path / "doc" / "source" / file_name)
+
+
+def test_write_docs_autosummary_stubs(tmp_path, cwd):
+    package_structure = {"prep7": {"keypoints": ["Keypoints", ["kl", "k"]]}}
+    file_writer = wrt.FileWriter()
+    copy_doc_configuration(cwd, tmp_path, file_writer)
+    wrt.write_docs(tmp_path, package_structure, file_writer=file_writer, autosummary_stubs=True)
+    conf = (tmp_path / "doc" / "source" / "conf.py").read_text()
+    assert conf.endswith("\nautosummary_generate = False\n")
+    stub_folder = tmp_path / "doc" / "source" / "docs" / "prep7" / "_autosummary"
+    stubs = sorted(path.name for path in stub_folder.iterdir())
+    assert stubs == [
+        "pyconverter.generatedcommands.subfolder.subsubfolder.prep7.keypoints.Keypoints.k.rst",
+        "pyconverter.generatedcommands.subfolder.subsubfolder.prep7.keypoints.Keypoints.kl.rst",
+    ]
+    assert (stub_folder / stubs[1]).read_text() == (
+        "kl\n==\n\n.. currentmodule:: "
+        "pyconverter.generatedcommands.subfolder.subsubfolder.prep7.keypoints\n\n"
+        ".. automethod:: Keypoints.kl\n"
+    )
+
+    package_structure["prep7"]["keypoints"][1].remove("kl")
+    file_writer = wrt.FileWriter()
+    wrt.write_docs(tmp_path, package_structure, file_writer=file_writer, autosummary_stubs=True)
+    assert len(list(stub_folder.iterdir())) == 1
+    assert file_writer.written == 1
+    assert file_writer.deleted == 1
+
+
+def test_memory_writer(tmp_path):
+    source_file = tmp_path / "source.txt"
+    source_file.write_text("source\n")
+    file_writer = wrt.MemoryWriter()
+    assert file_writer.write_text(tmp_path / "out" / "a.py", "a = 1\n")
+    assert not file_writer.write_text(tmp_path / "out" / "a.py", "a = 1\n")
+    file_writer.copy_file(source_file, tmp_path / "out" / "sub" / "b.txt")
+    assert not (tmp_path / "out").exists()
+    assert file_writer.is_dir(tmp_path / "out")
+    assert file_writer.list_dir(tmp_path / "out") == [
+        tmp_path / "out" / "a.py",
+        tmp_path / "out" / "sub",
+    ]
+    assert file_writer.read_text(tmp_path / "out" / "sub" / "b.txt") == "source\n"
+    assert file_writer.summary == "2 written, 1 unchanged, 0 deleted files"
+    with pytest.raises(FileNotFoundError):
+        file_writer.read_text(tmp_path / "out" / "c.py")
+
+
+@pytest.mark.parametrize("writer_class", [wrt.FileWriter, wrt.MemoryWriter])
+def test_writer_counters(tmp_path, writer_class):
+    file_writer = writer_class()
+    path = tmp_path / "out" / "a.py"
+    assert file_writer.write_text(path, "a = 1\n")
+    assert not file_writer.write_text(path, "a = 1\n")
+    assert file_writer.write_text(path, "a = 2\n")
+    assert file_writer.write_text(path, "a = 22\n")
+    assert file_writer.read_text(path) == "a = 22\n"
+    assert file_writer.summary == "3 written, 1 unchanged, 0 deleted files"
+    assert file_writer.changed_paths == [path] * 3
+
+
+def test_write_docs_in_memory(tmp_path, cwd):
+    package_structure = {"prep7": {"keypoints": ["Keypoints", ["kl", "k"]]}}
+    file_writer = wrt.MemoryWriter()
+    copy_doc_configuration(cwd, tmp_path, file_writer)
+    wrt.write_docs(tmp_path, package_structure, file_writer=file_writer, autosummary_stubs=True)
+    assert not any(tmp_path.iterdir())
+    stub_folder = tmp_path / "doc" / "source" / "docs" / "prep7" / "_autosummary"
+    assert len(file_writer.list_dir(stub_folder)) == 2
+
+
+def test_write_docs_without_autosummary_stubs(tmp_path, cwd):
+    package_structure = {"prep7": {"keypoints": ["Keypoints", ["kl", "k"]]}}
+    file_writer = wrt.MemoryWriter()
+    copy_doc_configuration(cwd, tmp_path, file_writer)
+    conf_path = tmp_path / "doc" / "source" / "conf.py"
+    wrt.write_docs(tmp_path, package_structure, file_writer=file_writer, autosummary_stubs=False)
+    assert "autosummary_generate" not in file_writer.read_text(conf_path)
+
+    # Templates with Jinja blocks are left to Sphinx
+    file_writer.write_text(
+        tmp_path / "doc" / "source" / "_templates" / "base.rst",
+        "{% if objtype == 'method' %}{{ objname }}{% endif %}\n",
+    )
+    wrt.write_docs(tmp_path, package_structure, file_writer=file_writer, autosummary_stubs=True)
+    assert "autosummary_generate" not in file_writer.read_text(conf_path)
+    stub_folder = tmp_path / "doc" / "source" / "docs" / "prep7" / "_autosummary"
+    assert not file_writer.is_dir(stub_folder)
+
+
+def test_get_autosummary_stub():
+    template = "{{ fullname | escape | underline }}\n\n.. auto{{ objtype }}:: {{ objname }}\n"
+    assert wrt.get_autosummary_stub(template, "package.prep7", "Keypoints.k_star") == (
+        "package.prep7.Keypoints.k\\_star\n"
+        "===============================\n\n.. automethod:: Keypoints.k_star\n"
+    )
+    assert wrt.get_autosummary_stub("{{ members }}", "package", "Keypoints") is None
+
+
+def test_command_index_source():
+    entries = [
+        (
+            "K",
+            (
+                "package.prep7.keypoints",
+                "Keypoints",
+                "k",
+                ("npt", "x"),
+                False,
+                ("PREP7", "Keypoints"),
+            ),
+        ),
+        ("*VGET", ("package.apdl.array", "Array", "star_vget", ("par",), True, ("APDL", "Array"))),
+    ]
+    source = wrt.get_command_index_source(entries)
+    assert source.index('"*VGET"') < source.index('"K"')
+    assert '"star_vget", ("par",), True,' in source
+    namespace = {}
+    exec(source, namespace)
+    assert namespace["COMMANDS"] == dict(entries)
+    assert len(namespace["FIELDS"]) == 6
+
+
+def test_command_index_unchanged_package(tmp_path, cwd, path_custom_functions):
+    xml_path = write_corpus(tmp_path / "xml_doc", commands=60, commands_per_group=20)
+    packages = []
+    for command_index in (False, True):
+        command_map, name_map = wrt.convert(xml_path)
+        file_writer = wrt.MemoryWriter()
+        wrt.write_source(
+            command_map,
+            name_map,
+            xml_path,
+            tmp_path,
+            path_custom_functions,
+            template_path=cwd / "_package",
+            config_path=cwd / "config.yaml",
+            command_index=command_index,
+            file_writer=file_writer,
+        )
+        packages.append(
+            {
+                path: file_writer.read_bytes(path)
+                for path in file_writer.files
+                if path.suffix == ".py"
+            }
+        )
+    index_paths = [path for path in packages[1] if path.name == "_command_index.py"]
+    assert len(index_paths) == 1
+    del packages[1][index_paths[0]]
+    assert packages[0] == packages[1]
+
+
+def test_autosummary_stubs_rerun(tmp_path, cwd, path_custom_functions):
+    xml_path = write_corpus(tmp_path / "xml_doc", commands=20, commands_per_group=10)
+    for run in range(2):
+        command_map, name_map = wrt.convert(xml_path)
+        file_writer = wrt.FileWriter()
+        package_structure = wrt.write_source(
+            command_map,
+            name_map,
+            xml_path,
+            tmp_path,
+            path_custom_functions,
+            template_path=cwd / "_package",
+            config_path=cwd / "config.yaml",
+            autosummary_stubs=True,
+            file_writer=file_writer,
+        )
+        wrt.write_docs(
+            tmp_path / "package",
+            package_structure,
+            config_path=cwd / "config.yaml",
+            file_writer=file_writer,
+            autosummary_stubs=True,
+        )
+    assert file_writer.written == 0
+    conf = (tmp_path / "package" / "doc" / "source" / "conf.py").read_text()
+    assert conf.count("autosummary_generate = False") == 1
+
+
+def test_write__init__files(tmp_path):
+    package_structure = {
+        "prep7": {"keypoints": ["Keypoints", []], "explicit_dynamics": ["ExplicitDynamics", []]},
+        "apdl": {"abbreviations": ["Abbreviations", []]},
+    }
+    file_writer = wrt.MemoryWriter()
+    library_path = (
+        tmp_path / "src" / "pyconverter" / "generatedcommands" / "subfolder" / "subsubfolder"
+    )
+    wrt.write_global__init__file(library_path, package_structure, Path("config.yaml"), file_writer)
+    wrt.write__init__file(library_path, package_structure, file_writer)
+
+    init_content = file_writer.read_text(library_path.parent.parent / "__init__.py")
+    assert init_content.startswith(
+        "from .subfolder.subsubfolder import (\n    apdl,\n    prep7,\n)\n"
+    )
+    prep7_init = file_writer.read_text(library_path / "prep7" / "__init__.py")
+    assert prep7_init == "from . import (\n    explicit_dynamics,\n    keypoints,\n)\n"
+
+
+def test_write__init__file_lazy_imports(tmp_path, monkeypatch):
+    package_structure = {"lazymodule": {"b_file": ["BFile", []], "a_file": ["AFile", []]}}
+    for file_name in package_structure["lazymodule"]:
+        (tmp_path / "lazymodule").mkdir(exist_ok=True)
+        (tmp_path / "lazymodule" / f"{file_name}.py").write_text(f"NAME = '{file_name}'\n")
+    wrt.write__init__file(tmp_path, package_structure, lazy_imports=True)
+    assert (
+        "if TYPE_CHECKING:\n    from . import (\n        a_file,\n        b_file,\n"
+        in (tmp_path / "lazymodule" / "__init__.py").read_text()
+    )
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    lazymodule = importlib.import_module("lazymodule")
+    assert "lazymodule.a_file" not in sys.modules
+    assert "a_file" in dir(lazymodule)
+    assert lazymodule.a_file.NAME == "a_file"
+    assert "lazymodule.a_file" in sys.modules
+    assert "lazymodule.b_file" not in sys.modules
+    with pytest.raises(AttributeError):
+        lazymodule.c_file
+    for module_name in ("lazymodule", "lazymodule.a_file"):
+        monkeypatch.delitem(sys.modules, module_name)
+
+
+class RenderedCommand:
+    def __init__(self, py_name):
+        self.py_name = py_name
+
+    def to_python(
+        self,
+        custom_functions,
+        comment_command_dict,
+        indent="",
+        image_folder_path=None,
+        command_builders=False,
+        trim_empty_fields=False,
+    ):
+        return f"\n{indent}def {self.py_name}(self):\n{indent}    pass\n"
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_render_commands(max_workers):
+    commands = [RenderedCommand(f"cmd{i}") for i in range(20)]
+    python_methods = wrt.render_commands(commands, max_workers=max_workers)
+    assert python_methods == [command.to_python(None, None, indent="    ") for command in commands]
+
+
+class SpecialArgumentsCommand(RenderedCommand):
+    def to_python(self, *args, **kwargs):
+        # Reading the arguments of a command records its special arguments
+        ast.SPECIAL_ARGUMENTS[self.py_name] = ("grp0", ["NPT", "X"], [self.py_name])
+        return super().to_python(*args, **kwargs)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_write_special_arguments(tmp_path, monkeypatch, max_workers):
+    monkeypatch.setattr(ast, "SPECIAL_ARGUMENTS", {})
+    commands = [SpecialArgumentsCommand(f"cmd{i}") for i in range(5)]
+    python_methods = wrt.iter_rendered_commands(commands, max_workers=max_workers)
+    for index, (command, _) in enumerate(zip(commands, python_methods)):
+        # Each command can be detached before the next one is rendered
+        assert list(ast.SPECIAL_ARGUMENTS)[: index + 1] == [
+            cmd.py_name for cmd in commands[: index + 1]
+        ]
+        if max_workers == 1:
+            assert len(ast.SPECIAL_ARGUMENTS) == index + 1
+
+    arg_file = tmp_path / "args.txt"
+    wrt.write_special_arguments(arg_file)
+    lines = arg_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4 * len(commands)
+    assert lines[:4] == [
+        "-" * 50,
+        "cmd0: grp0",
+        "initial_args : ['NPT', 'X']",
+        "py_arg_name : ['cmd0']",
+    ]
+
+    ast.SPECIAL_ARGUMENTS.clear()
+    wrt.write_special_arguments(arg_file)
+    assert not arg_file.exists()
+
+
 @pytest.fixture
 def package_path(cwd):
     return cwd / "package"
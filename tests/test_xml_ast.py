@@ -110,3 +110,69 @@ def test_element_text_content(Element_with_children):
 def test_element_raw(str_element_with_children, Element_with_children):
     raw = Element_with_children.raw
     assert raw == str_element_with_children
+
+
+@pytest.fixture
+def nested_element():
+    return ast.Element(
+        fromstring(
+            "<refentry><refnamediv><refname>K, <replaceable>NPT</replaceable></refname>"
+            "<refpurpose>Defines a keypoint.</refpurpose></refnamediv>"
+            "<para>First <command>K</command></para><para>Second</para></refentry>"
+        )
+    )
+
+
+def test_type_index(nested_element):
+    assert list(nested_element.type_index) == [ast.Refnamediv, ast.Paragraph]
+    assert len(nested_element.get_children_by_type(ast.Paragraph)) == 2
+    assert nested_element.get_children_by_type("Paragraph") == nested_element.find_all(
+        ast.Paragraph
+    )
+    assert ast.Replaceable in nested_element.subtree_types
+    assert ast.Title not in nested_element.subtree_types
+
+
+def test_type_index_after_content_change(nested_element):
+    assert nested_element.find(ast.Paragraph) is not None
+    assert ast.Command in nested_element.subtree_types
+    nested_element._content = [nested_element[0], "Text"]
+    assert nested_element.find(ast.Paragraph) is None
+    assert list(nested_element.type_index) == [ast.Refnamediv, str]
+    assert ast.Command not in nested_element.subtree_types
+    assert ast.Replaceable in nested_element.subtree_types
+
+
+def test_find_by_type(nested_element):
+    assert isinstance(nested_element.find(ast.Refnamediv), ast.Refnamediv)
+    assert nested_element.find(ast.Replaceable) is None
+    assert str(nested_element.rec_find(ast.Replaceable)) == "NPT"
+    assert nested_element.rec_find("Title") is None
+    assert len(nested_element.find_all(ast.Command, recursive=True)) == 1
+
+
+def test_element_slots(nested_element):
+    with pytest.raises(AttributeError):
+        nested_element.extra_attribute = True
+
+
+def test_detach_element():
+    xref = ast.parse_element(fromstring('<xref linkend="Hlp_K" other="0">K</xref>'))
+    xref.detach()
+    assert xref.is_detached
+    assert xref.get("linkend") == "Hlp_K"
+    assert xref.get("other") is None
+    assert xref.tag == "xref"
+    assert str(xref) == "Hlp_K"
+
+
+def test_lazy_children(nested_element):
+    assert not nested_element.is_materialized
+    assert ast.Command in nested_element.subtree_types
+    assert not nested_element.is_materialized
+    refnamediv = nested_element.find(ast.Refnamediv)
+    assert nested_element.is_materialized
+    assert not refnamediv.is_materialized
+    assert nested_element.rec_find(ast.Replaceable) is not None
+    assert refnamediv.is_materialized
+    assert not nested_element[1].is_materialized